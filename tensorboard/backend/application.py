@@ -23,6 +23,7 @@ from __future__ import division
 from __future__ import print_function
 
 import contextlib
+import functools
 import json
 import os
 import re
@@ -37,6 +38,7 @@ from werkzeug import wrappers
 
 from tensorboard import db
 from tensorboard.backend import http_util
+from tensorboard.backend import response_cache
 from tensorboard.backend.event_processing import plugin_event_accumulator as event_accumulator  # pylint: disable=line-too-long
 from tensorboard.backend.event_processing import plugin_event_multiplexer as event_multiplexer  # pylint: disable=line-too-long
 from tensorboard.plugins import base_plugin
@@ -77,7 +79,10 @@ def standard_tensorboard_wsgi(
     plugins,
     db_uri="",
     assets_zip_provider=None,
-    path_prefix=""):
+    path_prefix="",
+    max_reload_threads=1,
+    logdir_quiet_period=None,
+    event_index_dir=None):
   """Construct a TensorBoardWSGIApp with standard plugins and multiplexer.
 
   Args:
@@ -90,6 +95,10 @@ def standard_tensorboard_wsgi(
     db_uri: A String containing the URI of the SQL database for persisting
         data, or empty for memory-only mode.
     assets_zip_provider: Delegates to TBContext or uses default if None.
+    max_reload_threads: The maximum number of runs to reload in parallel.
+    logdir_quiet_period: Seconds after which unchanged logdir subtrees are
+        scanned for new runs less often, or None to scan everything each time.
+    event_index_dir: Directory for persisted event file indexes, or None.
 
   Returns:
     The new TensorBoard WSGI application.
@@ -97,7 +106,10 @@ def standard_tensorboard_wsgi(
   multiplexer = event_multiplexer.EventMultiplexer(
       size_guidance=DEFAULT_SIZE_GUIDANCE,
       tensor_size_guidance=DEFAULT_TENSOR_SIZE_GUIDANCE,
-      purge_orphaned_data=purge_orphaned_data)
+      purge_orphaned_data=purge_orphaned_data,
+      max_reload_threads=max_reload_threads,
+      logdir_quiet_period=logdir_quiet_period,
+      event_index_dir=event_index_dir)
   db_module, db_connection_provider = get_database_info(db_uri)
   if db_connection_provider is not None:
     with contextlib.closing(db_connection_provider()) as db_conn:
@@ -140,18 +152,44 @@ def TensorBoardWSGIApp(logdir, plugins, multiplexer, reload_interval,
     start_reloading_multiplexer(multiplexer, path_to_run, reload_interval)
   else:
     reload_multiplexer(multiplexer, path_to_run)
-  return TensorBoardWSGI(plugins, path_prefix)
+  cache = response_cache.ResponseCache(
+      functools.partial(_request_generation, multiplexer))
+  return TensorBoardWSGI(plugins, path_prefix, cache)
+
+
+def _request_generation(multiplexer, request):
+  """Returns the generation of the runs that a request depends on.
+
+  Requests naming runs in `run` or `runs` arguments only depend on those
+  runs, so that data arriving for other runs does not invalidate their
+  cached responses. Requests naming no run, such as those for tags, depend
+  on all runs.
+
+  Args:
+    multiplexer: The `EventMultiplexer` whose runs are served.
+    request: A `werkzeug.wrappers.Request`.
+
+  Returns:
+    A hashable value for `response_cache.ResponseCache`.
+  """
+  generations = multiplexer.RunGenerations()
+  runs = request.args.getlist('run') + request.args.getlist('runs')
+  if not runs:
+    return frozenset(six.iteritems(generations))
+  return tuple((run, generations.get(run)) for run in sorted(set(runs)))
 
 
 class TensorBoardWSGI(object):
   """The TensorBoard WSGI app that delegates to a set of TBPlugin."""
 
-  def __init__(self, plugins, path_prefix=""):
+  def __init__(self, plugins, path_prefix="", cache=None):
     """Constructs TensorBoardWSGI instance.
 
     Args:
       plugins: A list of base_plugin.TBPlugin subclass instances.
       path_prefix: A prefix of the path when app isn't served from root.
+      cache: An optional response_cache.ResponseCache through which the
+          routes of plugins with `cache_responses` set are served.
 
     Returns:
       A WSGI application for the set of all TBPlugin instances.
@@ -210,6 +248,8 @@ class TensorBoardWSGI(object):
         else:
           path = self._path_prefix + DATA_PREFIX + PLUGIN_PREFIX + '/' + \
                     plugin.plugin_name + route
+        if cache is not None and plugin.cache_responses:
+          app = cache.wrap(app)
         self.data_applications[path] = app
 
   @wrappers.Request.application
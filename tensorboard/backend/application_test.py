@@ -227,6 +227,36 @@ class TensorboardServerUsingMetagraphOnlyTest(TensorboardServerTest):
   _only_use_meta_graph = True  # Server data contains only a MetaGraphDef
 
 
+class RequestGenerationTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(RequestGenerationTest, self).setUp()
+    self.generations = {'a': 1, 'b': 1}
+    self.multiplexer = tf.test.mock.Mock()
+    self.multiplexer.RunGenerations.side_effect = lambda: self.generations
+
+  def _generation(self, query_string):
+    request = wrappers.Request.from_values(query_string=query_string)
+    return application._request_generation(self.multiplexer, request)
+
+  def testOnlyRequestedRunsAreKeyed(self):
+    before = self._generation('run=a')
+    self.generations = {'a': 1, 'b': 2, 'c': 1}
+    self.assertEqual(before, self._generation('run=a'))
+    self.generations['a'] = 2
+    self.assertNotEqual(before, self._generation('run=a'))
+
+  def testMultipleRuns(self):
+    before = self._generation('runs=a&runs=b')
+    self.generations = {'a': 1, 'b': 2}
+    self.assertNotEqual(before, self._generation('runs=a&runs=b'))
+
+  def testRunlessRequestsDependOnAllRuns(self):
+    before = self._generation('tag=x')
+    self.generations = {'a': 1, 'b': 1, 'c': 1}
+    self.assertNotEqual(before, self._generation('tag=x'))
+
+
 class ParseEventFilesSpecTest(tf.test.TestCase):
 
   def testRunName(self):
@@ -0,0 +1,437 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Persisted record offset index for local event files.
+
+An `EventFileIndex` records the byte offset, step, wall time, kind and value
+tags of every record in an event file. It is stored in a sidecar file in a
+cache directory, so that a restarted process can tell what the records hold
+without parsing them. A `MappedRecordFile` reads records at known offsets
+through a memory map.
+
+The sidecar file is binary and append-only. It starts with a preamble
+identifying the event file, followed by chunks that each hold the records
+indexed since the previous save. Every chunk has a length and a CRC, so a
+torn write only loses the chunk being written.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import hashlib
+import io
+import mmap
+import os
+import struct
+import zlib
+
+import tensorflow as tf
+
+# Number of leading bytes of the event file that are stored in the index and
+# compared on load. If they differ, the file was replaced and the index is
+# discarded.
+_HEADER_BYTES = 64
+
+_MAGIC = b'TBEVIDX2'
+
+_RECORD_HEADER = struct.Struct('<QI')
+_RECORD_FOOTER_SIZE = 4
+
+# A length-prefixed string in the preamble or in a tag item.
+_LENGTH = struct.Struct('<I')
+# The payload length and CRC32 of a chunk.
+_CHUNK_HEADER = struct.Struct('<II')
+# offset, end_offset, step, wall_time, flags and number of tags of an entry.
+_ENTRY = struct.Struct('<QQqdBI')
+_TAG_ITEM = b'T'
+_ENTRY_ITEM = b'E'
+_NO_TAG = 0xffffffff
+
+# Bits of `IndexEntry.flags`.
+#
+# The record holds a summary.
+SUMMARY = 1
+# The record holds a summary with values that may set summary metadata.
+SUMMARY_METADATA = 2
+# The record holds a `SessionLog.START`.
+SESSION_START = 4
+# The record holds a file version, graph, meta graph or run metadata, which
+# cannot be described by an index entry.
+DATA = 8
+
+_DATA_FIELDS = frozenset(
+    ['file_version', 'graph_def', 'meta_graph_def', 'tagged_run_metadata'])
+# Value fields that are migrated to tensors with summary metadata. See
+# `data_compat.migrate_value`.
+_LEGACY_VALUE_FIELDS = frozenset(['simple_value', 'histo', 'image', 'audio'])
+
+# The index of one record:
+#   offset: The byte offset of the record in the event file.
+#   end_offset: The byte offset just past the record.
+#   step: The step of the event.
+#   wall_time: The wall time of the event.
+#   flags: A combination of `SUMMARY`, `SUMMARY_METADATA`, `SESSION_START` and
+#     `DATA`.
+#   tags: A tuple with one item per value of the event's summary, in order:
+#     the tag under which the value's tensor is stored (see `ValueTag`), or
+#     None if the value holds no data.
+IndexEntry = collections.namedtuple(
+    'IndexEntry', ['offset', 'end_offset', 'step', 'wall_time', 'flags',
+                   'tags'])
+
+
+def ValueTag(value):
+  """Returns the tag under which a `Summary.Value` is accumulated.
+
+  This is the tag of a tensor or legacy value, or the node name of a tensor
+  without a tag. Values without data have no tag, and None is returned.
+  """
+  kind = value.WhichOneof('value')
+  if kind == 'tensor':
+    return value.tag or value.node_name
+  if kind in _LEGACY_VALUE_FIELDS:
+    return value.tag
+  return None
+
+
+def _ReadHeader(path):
+  with io.open(path, 'rb') as f:
+    return f.read(_HEADER_BYTES)
+
+
+def _PackString(string):
+  data = tf.compat.as_bytes(string)
+  return _LENGTH.pack(len(data)) + data
+
+
+def _UnpackString(data, pos):
+  """Returns the bytes of the string at `pos` and the position after it."""
+  (length,) = _LENGTH.unpack_from(data, pos)
+  start = pos + _LENGTH.size
+  if start + length > len(data):
+    raise ValueError('Truncated string')
+  return (data[start:start + length], start + length)
+
+
+class EventFileIndex(object):
+  """An index of the records of one event file.
+
+  Fields:
+    entries: A list of `IndexEntry` tuples, in file order. Unless the index
+      was created with `keep_entries`, this only holds restored entries, and
+      callers may clear it.
+    end_offset: The byte offset just past the last indexed record.
+  """
+
+  def __init__(self, event_file_path, cache_dir, keep_entries=True):
+    """Creates an empty index for `event_file_path`.
+
+    Call `Restore` to load a previously saved index.
+
+    Args:
+      event_file_path: Path of a local event file.
+      cache_dir: Directory in which the sidecar index file is stored, or None
+        to keep the index in memory only.
+      keep_entries: Whether `Add` appends to `entries`. If False, added
+        entries are only buffered until they are saved.
+    """
+    self._event_file_path = os.path.abspath(event_file_path)
+    self._index_path = None
+    if cache_dir is not None:
+      digest = hashlib.sha1(
+          tf.compat.as_bytes(self._event_file_path)).hexdigest()
+      self._index_path = os.path.join(cache_dir, digest + '.index')
+    self._keep_entries = keep_entries
+    self._header = b''
+    # The tags seen so far, and their positions in that list.
+    self._tags = []
+    self._tag_ids = {}
+    # Interned `IndexEntry.tags` tuples, which mostly repeat.
+    self._tag_tuples = {}
+    # Entries and tags that are not in the sidecar file yet.
+    self._unsaved = []
+    self._num_saved_tags = 0
+    # The length of the valid part of the sidecar file, or None if it must be
+    # written from scratch.
+    self._index_size = None
+    self._save_failed = False
+    self.entries = []
+    self.end_offset = 0
+
+  def Restore(self):
+    """Loads the sidecar index, if it exists and is still valid.
+
+    Chunks are read up to the first one that is truncated or corrupt. The
+    index is invalid if the event file no longer `Matches` it.
+
+    Returns:
+      Whether a valid index was loaded.
+    """
+    if self._index_path is None:
+      return False
+    try:
+      with io.open(self._index_path, 'rb') as f:
+        data = f.read()
+    except (IOError, OSError):
+      return False
+    try:
+      pos = self._ReadPreamble(data)
+    except (ValueError, struct.error):
+      return False
+    tags = []
+    entries = []
+    end_offset = 0
+    while pos + _CHUNK_HEADER.size <= len(data):
+      (length, crc) = _CHUNK_HEADER.unpack_from(data, pos)
+      start = pos + _CHUNK_HEADER.size
+      payload = data[start:start + length]
+      if (len(payload) < length or
+          zlib.crc32(payload) & 0xffffffff != crc):
+        break
+      chunk_tags = list(tags)
+      chunk_entries = []
+      try:
+        end_offset = self._ReadChunk(
+            payload, chunk_tags, chunk_entries, end_offset)
+      except (ValueError, IndexError, struct.error):
+        break
+      tags = chunk_tags
+      entries.extend(chunk_entries)
+      pos = start + length
+    self.entries = entries
+    self.end_offset = entries[-1].end_offset if entries else 0
+    if not self.Matches():
+      tf.logging.info('Discarding stale event file index for %s',
+                      self._event_file_path)
+      self.entries = []
+      self.end_offset = 0
+      self._header = b''
+      return False
+    self._tags = tags
+    self._tag_ids = dict((tag, i) for (i, tag) in enumerate(tags))
+    self._num_saved_tags = len(tags)
+    self._index_size = pos
+    return True
+
+  def Matches(self):
+    """Returns whether the event file still holds the indexed records.
+
+    The file must not be shorter than the indexed range, and must start with
+    the bytes that were indexed.
+    """
+    try:
+      size = os.path.getsize(self._event_file_path)
+      header = _ReadHeader(self._event_file_path)
+    except (IOError, OSError):
+      return False
+    return (size >= self.end_offset and
+            header[:len(self._header)] == self._header)
+
+  def Add(self, offset, end_offset, event):
+    """Appends the record at `offset` holding `event` to the index.
+
+    Args:
+      offset: The byte offset of the record in the event file.
+      end_offset: The byte offset just past the record.
+      event: The parsed `tf.Event` stored in the record.
+    """
+    if offset < self.end_offset:
+      return
+    kind = event.WhichOneof('what')
+    flags = 0
+    tags = ()
+    if kind == 'summary':
+      flags = SUMMARY
+      tags = []
+      for value in event.summary.value:
+        tag = ValueTag(value)
+        if tag is not None and tag not in self._tag_ids:
+          self._tag_ids[tag] = len(self._tags)
+          self._tags.append(tag)
+        tags.append(tag)
+        if (value.HasField('metadata') or
+            value.WhichOneof('value') in _LEGACY_VALUE_FIELDS):
+          flags |= SUMMARY_METADATA
+      tags = tuple(tags)
+      tags = self._tag_tuples.setdefault(tags, tags)
+    elif kind == 'session_log':
+      if event.session_log.status == tf.SessionLog.START:
+        flags = SESSION_START
+    elif kind in _DATA_FIELDS:
+      flags = DATA
+    entry = IndexEntry(offset, end_offset, event.step, event.wall_time, flags,
+                       tags)
+    if self._keep_entries:
+      self.entries.append(entry)
+    if self._index_path is not None and not self._save_failed:
+      self._unsaved.append(entry)
+    self.end_offset = end_offset
+    if len(self._header) < min(_HEADER_BYTES, end_offset):
+      try:
+        self._header = _ReadHeader(self._event_file_path)[:end_offset]
+      except (IOError, OSError):
+        pass
+
+  def Save(self):
+    """Appends the entries added since the last save to the sidecar file.
+
+    The sidecar file is written from scratch if there is no valid one. If
+    writing fails, the index is not saved any more.
+
+    Raises:
+      IOError: If the sidecar file could not be written.
+      OSError: Likewise.
+    """
+    if self._save_failed or not self._unsaved:
+      return
+    chunk = self._Chunk()
+    try:
+      if self._index_size is None:
+        directory = os.path.dirname(self._index_path)
+        if not os.path.isdir(directory):
+          os.makedirs(directory)
+        preamble = (_MAGIC + _PackString(self._event_file_path) +
+                    _PackString(self._header))
+        temp_path = '%s.tmp.%d' % (self._index_path, os.getpid())
+        with io.open(temp_path, 'wb') as f:
+          f.write(preamble + chunk)
+        os.rename(temp_path, self._index_path)
+        self._index_size = len(preamble) + len(chunk)
+      else:
+        with io.open(self._index_path, 'r+b') as f:
+          # Drop whatever follows the valid part, e.g. a torn chunk.
+          f.seek(self._index_size)
+          f.truncate()
+          f.write(chunk)
+        self._index_size += len(chunk)
+    except (IOError, OSError):
+      self._save_failed = True
+      self._unsaved = []
+      raise
+    self._unsaved = []
+    self._num_saved_tags = len(self._tags)
+
+  def _Chunk(self):
+    """Encodes the unsaved tags and entries as a chunk."""
+    parts = []
+    for tag in self._tags[self._num_saved_tags:]:
+      parts.append(_TAG_ITEM)
+      parts.append(_PackString(tag))
+    for entry in self._unsaved:
+      parts.append(_ENTRY_ITEM)
+      parts.append(_ENTRY.pack(entry.offset, entry.end_offset, entry.step,
+                               entry.wall_time, entry.flags, len(entry.tags)))
+      parts.append(struct.pack(
+          '<%dI' % len(entry.tags),
+          *[_NO_TAG if tag is None else self._tag_ids[tag]
+            for tag in entry.tags]))
+    payload = b''.join(parts)
+    return (_CHUNK_HEADER.pack(len(payload), zlib.crc32(payload) & 0xffffffff)
+            + payload)
+
+  def _ReadPreamble(self, data):
+    """Checks the preamble, setting the header, and returns its length."""
+    if data[:len(_MAGIC)] != _MAGIC:
+      raise ValueError('Not an event file index')
+    (path, pos) = _UnpackString(data, len(_MAGIC))
+    if tf.compat.as_text(path) != self._event_file_path:
+      raise ValueError('Index of another file')
+    (self._header, pos) = _UnpackString(data, pos)
+    return pos
+
+  def _ReadChunk(self, payload, tags, entries, end_offset):
+    """Decodes a chunk, appending to `tags` and `entries`.
+
+    Returns:
+      The end offset of the last entry.
+
+    Raises:
+      ValueError: If the chunk is invalid, or does not continue at
+        `end_offset`.
+    """
+    pos = 0
+    while pos < len(payload):
+      item = payload[pos:pos + 1]
+      pos += 1
+      if item == _TAG_ITEM:
+        (tag, pos) = _UnpackString(payload, pos)
+        tags.append(tf.compat.as_text(tag))
+      elif item == _ENTRY_ITEM:
+        (offset, entry_end_offset, step, wall_time, flags,
+         num_tags) = _ENTRY.unpack_from(payload, pos)
+        pos += _ENTRY.size
+        tag_ids = struct.unpack_from('<%dI' % num_tags, payload, pos)
+        pos += 4 * num_tags
+        if offset != end_offset:
+          raise ValueError('Entry at %d does not follow %d' %
+                           (offset, end_offset))
+        entry_tags = tuple(None if tag_id == _NO_TAG else tags[tag_id]
+                           for tag_id in tag_ids)
+        entry_tags = self._tag_tuples.setdefault(entry_tags, entry_tags)
+        entries.append(IndexEntry(offset, entry_end_offset, step, wall_time,
+                                  flags, entry_tags))
+        end_offset = entry_end_offset
+      else:
+        raise ValueError('Unknown item %r' % item)
+    return end_offset
+
+
+class MappedRecordFile(object):
+  """Reads TFRecord records at known offsets through a memory map.
+
+  The map is recreated when a read goes past the end of the mapped region,
+  so the file may keep growing while it is open.
+  """
+
+  def __init__(self, path):
+    self._file = io.open(path, 'rb')
+    self._map = None
+    self._size = 0
+
+  def ReadRecord(self, offset):
+    """Returns the data of the record at `offset`, without verifying CRCs.
+
+    Args:
+      offset: The byte offset of a record, as stored in an `IndexEntry`.
+
+    Raises:
+      IOError: If the record lies beyond the end of the file.
+    """
+    if not self._Ensure(offset + _RECORD_HEADER.size):
+      raise IOError('No record header at offset %d' % offset)
+    length, _ = _RECORD_HEADER.unpack_from(self._map, offset)
+    start = offset + _RECORD_HEADER.size
+    if not self._Ensure(start + length + _RECORD_FOOTER_SIZE):
+      raise IOError('Truncated record at offset %d' % offset)
+    return self._map[start:start + length]
+
+  def Close(self):
+    if self._map is not None:
+      self._map.close()
+      self._map = None
+    self._file.close()
+
+  def _Ensure(self, end):
+    if end <= self._size:
+      return True
+    size = os.fstat(self._file.fileno()).st_size
+    if size < end:
+      return False
+    if self._map is not None:
+      self._map.close()
+    self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+    self._size = size
+    return True
@@ -0,0 +1,163 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for event_file_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import event_file_index
+from tensorboard.backend.event_processing import event_file_loader
+
+
+class EventFileIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(EventFileIndexTest, self).setUp()
+    self._index_dir = tempfile.mkdtemp(dir=self.get_temp_dir())
+    self._path = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
+
+  def _WriteEvents(self, steps, mode='ab'):
+    writer = tf.python_io.TFRecordWriter(self._path + '.tmp')
+    for step in steps:
+      event = tf.Event(step=step, wall_time=1000.0 + step)
+      event.summary.value.add(tag='loss', simple_value=float(step))
+      writer.write(event.SerializeToString())
+    writer.close()
+    with open(self._path + '.tmp', 'rb') as f:
+      data = f.read()
+    os.remove(self._path + '.tmp')
+    with open(self._path, mode) as f:
+      f.write(data)
+
+  def _Loader(self):
+    return event_file_loader.EventFileLoader(
+        self._path, use_native_reader=True, index_dir=self._index_dir)
+
+  def _Restore(self):
+    index = event_file_index.EventFileIndex(self._path, self._index_dir)
+    return index.Restore(), index
+
+  def _IndexPath(self):
+    (name,) = os.listdir(self._index_dir)
+    return os.path.join(self._index_dir, name)
+
+  def testIndexIsBuiltWhileLoading(self):
+    self._WriteEvents([1, 2, 3])
+    self.assertEqual([1, 2, 3], [e.step for e in self._Loader().Load()])
+    restored, index = self._Restore()
+    self.assertTrue(restored)
+    entries = index.entries
+    self.assertEqual([1, 2, 3], [entry.step for entry in entries])
+    self.assertEqual([1001.0, 1002.0, 1003.0],
+                     [entry.wall_time for entry in entries])
+    self.assertEqual([('loss',)] * 3, [entry.tags for entry in entries])
+    self.assertEqual(
+        [event_file_index.SUMMARY | event_file_index.SUMMARY_METADATA] * 3,
+        [entry.flags for entry in entries])
+    self.assertEqual(0, entries[0].offset)
+    self.assertEqual(entries[0].end_offset, entries[1].offset)
+    records = event_file_index.MappedRecordFile(self._path)
+    self.assertEqual(2, tf.Event.FromString(
+        records.ReadRecord(entries[1].offset)).step)
+    records.Close()
+
+  def testRestartYieldsIndexedRecords(self):
+    self._WriteEvents([1, 2])
+    list(self._Loader().Load())
+    restored, index = self._Restore()
+    self.assertTrue(restored)
+    self.assertEqual(os.path.getsize(self._path), index.end_offset)
+
+    self._WriteEvents([3])
+    loader = self._Loader()
+    records = list(loader.Load())
+    self.assertEqual([1, 2], [r.entry.step for r in records[:2]])
+    self.assertEqual([1, 2], [r.Event().step for r in records[:2]])
+    self.assertIsInstance(records[2], tf.Event)
+    self.assertEqual(3, records[2].step)
+    self.assertEqual([], list(loader.Load()))
+    _, index = self._Restore()
+    self.assertEqual([1, 2, 3], [entry.step for entry in index.entries])
+
+  def testSavesOnlyAppend(self):
+    self._WriteEvents([1, 2])
+    loader = self._Loader()
+    list(loader.Load())
+    with open(self._IndexPath(), 'rb') as f:
+      saved = f.read()
+    self._WriteEvents([3])
+    list(loader.Load())
+    with open(self._IndexPath(), 'rb') as f:
+      self.assertTrue(f.read().startswith(saved))
+
+  def testTornChunkIsDropped(self):
+    self._WriteEvents([1, 2])
+    list(self._Loader().Load())
+    with open(self._IndexPath(), 'ab') as f:
+      f.write(b'\x40\x00\x00\x00torn')
+    restored, index = self._Restore()
+    self.assertTrue(restored)
+    self.assertEqual([1, 2], [entry.step for entry in index.entries])
+
+    self._WriteEvents([3])
+    list(self._Loader().Load())
+    _, index = self._Restore()
+    self.assertEqual([1, 2, 3], [entry.step for entry in index.entries])
+
+  def testEntryKinds(self):
+    writer = tf.python_io.TFRecordWriter(self._path)
+    for event in (tf.Event(file_version='brain.Event:2'),
+                  tf.Event(step=1, session_log=tf.SessionLog(
+                      status=tf.SessionLog.START)),
+                  tf.Event(step=2, summary=tf.Summary(value=[
+                      tf.Summary.Value(node_name='n',
+                                       tensor=tf.make_tensor_proto(1)),
+                      tf.Summary.Value(tag='empty')])),
+                  tf.Event(step=3, log_message=tf.LogMessage(message='hi'))):
+      writer.write(event.SerializeToString())
+    writer.close()
+    list(self._Loader().Load())
+    _, index = self._Restore()
+    self.assertEqual(
+        [event_file_index.DATA, event_file_index.SESSION_START,
+         event_file_index.SUMMARY, 0],
+        [entry.flags for entry in index.entries])
+    self.assertEqual(('n', None), index.entries[2].tags)
+
+  def testShrunkFileInvalidatesIndex(self):
+    self._WriteEvents([1, 2])
+    list(self._Loader().Load())
+    self._WriteEvents([1], mode='wb')
+    restored, _ = self._Restore()
+    self.assertFalse(restored)
+    self.assertEqual([1], [e.step for e in self._Loader().Load()])
+
+  def testChangedHeaderInvalidatesIndex(self):
+    self._WriteEvents([1])
+    list(self._Loader().Load())
+    self._WriteEvents([7, 8], mode='wb')
+    restored, _ = self._Restore()
+    self.assertFalse(restored)
+    self.assertEqual([7, 8], [e.step for e in self._Loader().Load()])
+
+
+if __name__ == '__main__':
+  tf.test.main()
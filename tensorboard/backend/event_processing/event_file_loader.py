@@ -18,24 +18,100 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
 import tensorflow as tf
 
+from tensorboard.backend.event_processing import event_file_index
+from tensorboard.backend.event_processing import tf_record
+
+
+class IndexedRecord(object):
+  """A record described by a restored `event_file_index.IndexEntry`.
+
+  The record is only parsed when `Event` is called.
+
+  Fields:
+    entry: The `event_file_index.IndexEntry` of the record.
+  """
+
+  __slots__ = ('entry', '_records')
+
+  def __init__(self, entry, records):
+    self.entry = entry
+    self._records = records
+
+  def Event(self):
+    """Reads and parses the event stored in the record.
+
+    Raises:
+      IOError: If the record is no longer in the file.
+
+    Returns:
+      A `tf.Event` proto.
+    """
+    event = tf.Event()
+    event.ParseFromString(self._records.ReadRecord(self.entry.offset))
+    return event
+
 
 class EventFileLoader(object):
   """An EventLoader is an iterator that yields Event protos."""
 
-  def __init__(self, file_path):
+  def __init__(self, file_path, use_native_reader=None, index_dir=None):
+    """Opens an event file for reading.
+
+    Args:
+      file_path: The path of the event file.
+      use_native_reader: Whether to read the file with the pure Python
+        `tf_record.TFRecordReader` instead of TensorFlow's PyRecordReader. If
+        None, the native reader is used for local files only.
+      index_dir: If set, a directory in which an `EventFileIndex` for this
+        file is persisted. Records covered by a previously saved index are
+        yielded as `IndexedRecord`s, without being read. Only used with the
+        native reader.
+
+    Raises:
+      ValueError: If `file_path` is None.
+      IOError: If the file could not be opened.
+    """
     if file_path is None:
       raise ValueError('A file path is required')
-    file_path = tf.resource_loader.readahead_file_path(file_path)
-    tf.logging.debug('Opening a record reader pointing at %s', file_path)
-    with tf.errors.raise_exception_on_not_ok_status() as status:
-      self._reader = tf.pywrap_tensorflow.PyRecordReader_New(
-          tf.compat.as_bytes(file_path), 0, tf.compat.as_bytes(''), status)
+    if use_native_reader is None:
+      use_native_reader = tf_record.is_local_path(file_path)
+    self._native_reader = None
+    self._reader = None
+    self._index = None
+    self._mapped_file = None
+    # The restored index entries that have not been yielded yet.
+    self._restored_entries = collections.deque()
+    if use_native_reader:
+      start_offset = 0
+      if index_dir:
+        self._index = event_file_index.EventFileIndex(
+            file_path, index_dir, keep_entries=False)
+        if self._index.Restore():
+          tf.logging.debug('Restored index of %d records for %s',
+                           len(self._index.entries), file_path)
+          self._mapped_file = event_file_index.MappedRecordFile(file_path)
+          self._restored_entries.extend(self._index.entries)
+          del self._index.entries[:]
+          start_offset = self._index.end_offset
+      tf.logging.debug('Opening a native record reader pointing at %s',
+                       file_path)
+      self._native_reader = tf_record.TFRecordReader(
+          file_path, start_offset, verify_crc=True)
+    else:
+      file_path = tf.resource_loader.readahead_file_path(file_path)
+      tf.logging.debug('Opening a record reader pointing at %s', file_path)
+      with tf.errors.raise_exception_on_not_ok_status() as status:
+        self._reader = tf.pywrap_tensorflow.PyRecordReader_New(
+            tf.compat.as_bytes(file_path), 0, tf.compat.as_bytes(''), status)
+      if not self._reader:
+        raise IOError(
+            'Failed to open a record reader pointing to %s' % file_path)
     # Store it for logging purposes.
     self._file_path = file_path
-    if not self._reader:
-      raise IOError('Failed to open a record reader pointing to %s' % file_path)
 
   def Load(self):
     """Loads all new values from disk.
@@ -45,21 +121,49 @@ class EventFileLoader(object):
 
     Yields:
       All values that were written to disk that have not been yielded yet.
+      Records covered by a restored index are yielded first, as
+      `IndexedRecord`s; the other ones are yielded as `tf.Event`s.
     """
+    while self._restored_entries:
+      yield IndexedRecord(self._restored_entries.popleft(), self._mapped_file)
+    # The map is closed once the last `IndexedRecord` is gone.
+    self._mapped_file = None
     while True:
-      try:
-        with tf.errors.raise_exception_on_not_ok_status() as status:
-          self._reader.GetNext(status)
-      except (tf.errors.DataLossError, tf.errors.OutOfRangeError):
-        # We ignore partial read exceptions, because a record may be truncated.
-        # PyRecordReader holds the offset prior to the failed read, so retrying
-        # will succeed.
+      offset = self._native_reader.offset() if self._native_reader else None
+      record = self._ReadRecord()
+      if record is None:
         break
       event = tf.Event()
-      event.ParseFromString(self._reader.record())
+      event.ParseFromString(record)
+      if self._index is not None:
+        self._index.Add(offset, self._native_reader.offset(), event)
       yield event
+    if self._index is not None:
+      try:
+        self._index.Save()
+      except (IOError, OSError) as e:
+        tf.logging.warning('Unable to save event file index for %s: %s',
+                           self._file_path, e)
     tf.logging.debug('No more events in %s', self._file_path)
 
+  def _ReadRecord(self):
+    """Returns the next record, or None if no complete record is available."""
+    if self._native_reader is not None:
+      try:
+        return self._native_reader.read_record()
+      except tf_record.DataLossError:
+        # Mirror PyRecordReader: the offset is left prior to the failed read.
+        return None
+    try:
+      with tf.errors.raise_exception_on_not_ok_status() as status:
+        self._reader.GetNext(status)
+    except (tf.errors.DataLossError, tf.errors.OutOfRangeError):
+      # We ignore partial read exceptions, because a record may be truncated.
+      # PyRecordReader holds the offset prior to the failed read, so retrying
+      # will succeed.
+      return None
+    return self._reader.record()
+
 
 def main(argv):
   if len(argv) != 2:
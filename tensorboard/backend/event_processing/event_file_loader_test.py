@@ -37,9 +37,12 @@ class EventFileLoaderTest(tf.test.TestCase):
     with open(filename, 'ab') as f:
       f.write(data)
 
+  USE_NATIVE_READER = False
+
   def _LoaderForTestFile(self, filename):
     return event_file_loader.EventFileLoader(
-        os.path.join(self.get_temp_dir(), filename))
+        os.path.join(self.get_temp_dir(), filename),
+        use_native_reader=self.USE_NATIVE_READER)
 
   def testEmptyEventFile(self):
     filename = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
@@ -88,6 +91,31 @@ class EventFileLoaderTest(tf.test.TestCase):
     loader = self._LoaderForTestFile(filename)
     self.assertEqual(len(list(loader.Load())), 2)
 
+  def testResumesAfterTruncatedWrite(self):
+    filename = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
+    record = EventFileLoaderTest.RECORD
+    self._WriteToFile(filename, record + record[:10])
+    loader = self._LoaderForTestFile(filename)
+    self.assertEqual(len(list(loader.Load())), 1)
+    self._WriteToFile(filename, record[10:])
+    self.assertEqual(len(list(loader.Load())), 1)
+
+  def testStopsAtCorruptedRecord(self):
+    filename = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
+    record = bytearray(EventFileLoaderTest.RECORD)
+    # Flip a byte of the wall time, leaving the length and its CRC intact.
+    record[15] ^= 0xFF
+    self._WriteToFile(filename, EventFileLoaderTest.RECORD + bytes(record))
+    loader = self._LoaderForTestFile(filename)
+    events = list(loader.Load())
+    self.assertEqual(1, len(events))
+    self.assertEqual(1440183447.0, events[0].wall_time)
+    self.assertEqual(0, len(list(loader.Load())))
+
+
+class NativeEventFileLoaderTest(EventFileLoaderTest):
+  USE_NATIVE_READER = True
+
 
 if __name__ == '__main__':
   tf.test.main()
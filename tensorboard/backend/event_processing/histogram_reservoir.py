@@ -0,0 +1,280 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A reservoir of decoded histograms and their compressed distributions."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.plugins.distribution import compressor
+
+DistributionSeries = collections.namedtuple(
+    'DistributionSeries', ['wall_times', 'steps', 'values'])
+
+HistogramSeries = collections.namedtuple(
+    'HistogramSeries', ['wall_times', 'steps', 'buckets'])
+
+
+def compress(tensor_proto):
+  """Returns the distribution of a histogram tensor as a float64 array.
+
+  Args:
+    tensor_proto: A `TensorProto` of shape `[k, 3]` holding the left edge,
+      right edge and count of each bucket, as written by the histograms plugin.
+
+  Returns:
+    An array holding the value at each of `compressor.NORMAL_HISTOGRAM_BPS`.
+  """
+  return compressor.compress_histograms(_decode(tensor_proto)[np.newaxis])[0]
+
+
+def _decode(tensor_proto):
+  return tf.make_ndarray(tensor_proto).astype(np.float64).reshape((-1, 3))
+
+
+def _compress_entries(entries):
+  """Sets the distributions of `_Entry`s, compressing them in batches.
+
+  Entries are batched by their number of buckets, so histograms written by
+  the histograms plugin are all compressed with a single call to
+  `compressor.compress_histograms`.
+  """
+  by_length = collections.defaultdict(list)
+  for entry in entries:
+    by_length[len(entry.Buckets())].append(entry)
+  for group in by_length.values():
+    values = compressor.compress_histograms(
+        np.stack([entry.Buckets() for entry in group]))
+    for (entry, row) in zip(group, values):
+      entry.distribution = row
+
+
+def _histogram_series(entries, wall_times, steps):
+  buckets = [entry.Buckets() for entry in entries]
+  if buckets and all(len(b) == len(buckets[0]) for b in buckets):
+    buckets = np.stack(buckets)
+  return HistogramSeries(wall_times=wall_times, steps=steps, buckets=buckets)
+
+
+class _Entry(object):
+  """A kept histogram, decoded and compressed on first use.
+
+  Most items added to a reservoir are soon replaced, so their tensors are
+  only decoded once they are read. The `distribution` of an entry is `None`
+  until it is set by `_compress_entries`. Callers must hold the mutex of the
+  `HistogramReservoir` holding the entry.
+  """
+
+  __slots__ = ('wall_time', 'step', 'distribution', '_tensor_proto',
+               '_buckets')
+
+  def __init__(self, wall_time, step, tensor_proto):
+    self.wall_time = wall_time
+    self.step = step
+    self.distribution = None
+    self._tensor_proto = tensor_proto
+    self._buckets = None
+
+  def Buckets(self):
+    """Returns the `[k, 3]` float64 array of buckets of the histogram."""
+    if self._buckets is None:
+      self._buckets = _decode(self._tensor_proto)
+      self._tensor_proto = None
+    return self._buckets
+
+  def TensorProto(self):
+    """Returns a `TensorProto` holding the buckets of the histogram."""
+    if self._tensor_proto is not None:
+      return self._tensor_proto
+    return tf.make_tensor_proto(self._buckets, dtype=tf.float64)
+
+
+class HistogramReservoir(object):
+  """A drop-in for a single-key `reservoir.Reservoir` of histograms.
+
+  Items are histogram `TensorEvent`s. The tensor of a kept item is decoded
+  into a float64 array of buckets the first time it is read, and its
+  distribution (see `compress`) is computed from them on first use; the
+  `TensorProto` itself is then dropped. `Histograms` and `Distributions`
+  serve these arrays directly, and `Items` rebuilds `TensorEvent`s on
+  demand. Sampling is delegated to a `reservoir.Reservoir`, so both keep
+  the same items with the same seed.
+  """
+
+  def __init__(self, size, tensor_event_factory, seed=0,
+               always_keep_last=True):
+    """Creates a new histogram reservoir.
+
+    Args:
+      size: The number of values to keep. If 0, all values will be kept.
+      tensor_event_factory: A function `(wall_time, step, tensor_proto)`
+        returning a `TensorEvent`, used by `Items`.
+      seed: The seed of the random number generator used when sampling.
+      always_keep_last: Whether to always keep the latest seen item in the
+        end of the reservoir.
+
+    Raises:
+      ValueError: If size is negative or not an integer.
+    """
+    self._reservoir = reservoir.Reservoir(size, seed, always_keep_last)
+    self.size = size
+    self.always_keep_last = always_keep_last
+    self._tensor_event_factory = tensor_event_factory
+    self._mutex = threading.Lock()
+    # The kept `_Entry`s with arrays of their wall times and steps, and the
+    # `HistogramSeries` and `DistributionSeries` of all of them, each built
+    # on first use after each change.
+    self._index = None
+    self._series = None
+    self._distributions = None
+
+  def Keys(self):
+    """Returns the keys with which items have been added."""
+    return self._reservoir.Keys()
+
+  def AddItem(self, key, item, f=lambda x: x):
+    """Adds a histogram `TensorEvent`, replacing an old item if necessary.
+
+    Args:
+      key: The key to store the item under.
+      item: A `TensorEvent` holding a histogram tensor.
+      f: An optional function to transform the item prior to addition.
+    """
+    def transform(item):
+      event = f(item)
+      return _Entry(event.wall_time, event.step, event.tensor_proto)
+    with self._mutex:
+      self._reservoir.AddItem(key, item, transform)
+      self._index = None
+      self._series = None
+      self._distributions = None
+
+  def Items(self, key):
+    """Returns the kept items as `TensorEvent`s.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+    """
+    with self._mutex:
+      return [self._ToTensorEvent(entry)
+              for entry in self._reservoir.Items(key)]
+
+  def Histograms(self, key, select=None):
+    """Returns a `HistogramSeries` of the kept items.
+
+    If all returned histograms have the same number of buckets `k`, as is
+    the case for summaries written by the histograms plugin, the `buckets`
+    field is a float64 array of shape `[len(steps), k, 3]`. Otherwise, it is
+    a list of float64 arrays of shape `[k_i, 3]`. Either way, `buckets[i]`
+    holds the `(left edge, right edge, count)` rows of the `i`th histogram.
+
+    Args:
+      key: The key of the items.
+      select: An optional function taking the int64 array of the steps of
+        all kept items and returning the indices of the items to return.
+        Only the selected histograms are decoded. By default, all items are
+        returned.
+
+    Returns:
+      A `HistogramSeries` of the selected items. Without `select`, it is
+      cached until the reservoir changes. Either way, it must not be
+      modified.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+    """
+    with self._mutex:
+      (entries, wall_times, steps) = self._Index(key)
+      if select is not None:
+        indices = np.asarray(select(steps), dtype=np.int64)
+        return _histogram_series(
+            [entries[i] for i in indices], wall_times[indices], steps[indices])
+      if self._series is None:
+        self._series = _histogram_series(entries, wall_times, steps)
+      return self._series
+
+  def Distributions(self, key):
+    """Returns a `DistributionSeries` of the kept items.
+
+    The `values` field is a float64 array of shape
+    `[len(steps), len(compressor.NORMAL_HISTOGRAM_BPS)]`. Only the entries
+    not compressed by an earlier call are compressed, in one batch.
+
+    The result is cached until the reservoir changes and must not be
+    modified.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+    """
+    with self._mutex:
+      if self._distributions is None:
+        (entries, wall_times, steps) = self._Index(key)
+        _compress_entries([entry for entry in entries
+                           if entry.distribution is None])
+        values = np.empty(
+            (len(entries), len(compressor.NORMAL_HISTOGRAM_BPS)),
+            dtype=np.float64)
+        for (i, entry) in enumerate(entries):
+          values[i] = entry.distribution
+        self._distributions = DistributionSeries(
+            wall_times=wall_times, steps=steps, values=values)
+      return self._distributions
+
+  def SamplingState(self, key):
+    """See `reservoir.Reservoir.SamplingState`."""
+    return self._reservoir.SamplingState(key)
+
+  def SetSamplingState(self, key, state):
+    """See `reservoir.Reservoir.SetSamplingState`."""
+    self._reservoir.SetSamplingState(key, state)
+
+  def FilterItems(self, filterFn, key=None):
+    """Filters items, keeping those for which `filterFn` returns True.
+
+    Args:
+      filterFn: A function of a `TensorEvent` returning whether to keep it.
+      key: An optional key to filter.
+
+    Returns:
+      The number of items removed.
+    """
+    with self._mutex:
+      self._index = None
+      self._series = None
+      self._distributions = None
+      return self._reservoir.FilterItems(
+          lambda entry: filterFn(self._ToTensorEvent(entry)), key)
+
+  def _Index(self, key):
+    if self._index is None:
+      entries = self._reservoir.Items(key)
+      self._index = (
+          entries,
+          np.array([entry.wall_time for entry in entries], dtype=np.float64),
+          np.array([entry.step for entry in entries], dtype=np.int64))
+    return self._index
+
+  def _ToTensorEvent(self, entry):
+    return self._tensor_event_factory(
+        wall_time=entry.wall_time,
+        step=entry.step,
+        tensor_proto=entry.TensorProto())
@@ -0,0 +1,173 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for histogram_reservoir."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import numpy as np
+from six.moves import xrange  # pylint: disable=redefined-builtin
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import histogram_reservoir
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.plugins.distribution import compressor
+
+_TensorEvent = collections.namedtuple(
+    '_TensorEvent', ['wall_time', 'step', 'tensor_proto'])
+
+_KEY = '.'
+
+
+def _Buckets(step):
+  return [[0.0, 1.0, 1.0 + step], [1.0, 2.0, 3.0], [2.0, 4.0, 2.0 * step]]
+
+
+def _Event(step):
+  return _TensorEvent(wall_time=100.0 + step, step=step,
+                      tensor_proto=tf.make_tensor_proto(_Buckets(step),
+                                                        dtype=tf.float64))
+
+
+class HistogramReservoirTest(tf.test.TestCase):
+
+  def testMatchesReservoirSampling(self):
+    histograms = histogram_reservoir.HistogramReservoir(10, _TensorEvent)
+    expected = reservoir.Reservoir(10)
+    for step in xrange(1000):
+      histograms.AddItem(_KEY, _Event(step))
+      expected.AddItem(_KEY, step)
+    steps = expected.Items(_KEY)
+    self.assertEqual(steps, [e.step for e in histograms.Items(_KEY)])
+    series = histograms.Distributions(_KEY)
+    self.assertEqual(steps, series.steps.tolist())
+    self.assertAllClose([100.0 + s for s in steps], series.wall_times)
+
+  def testDistributionsMatchCompressor(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    for step in xrange(5):
+      histograms.AddItem(_KEY, _Event(step))
+    series = histograms.Distributions(_KEY)
+    self.assertEqual((5, len(compressor.NORMAL_HISTOGRAM_BPS)),
+                     series.values.shape)
+    self.assertEqual(np.float64, series.values.dtype)
+    for step in xrange(5):
+      expected = compressor.compress_histogram(_Buckets(step))
+      self.assertAllClose([value for (_, value) in expected],
+                          series.values[step])
+
+  def testHistogramsAreStacked(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    for step in xrange(4):
+      histograms.AddItem(_KEY, _Event(step))
+    series = histograms.Histograms(_KEY)
+    self.assertEqual((4, 3, 3), series.buckets.shape)
+    self.assertAllEqual(_Buckets(2), series.buckets[2])
+    self.assertEqual([0, 1, 2, 3], series.steps.tolist())
+    self.assertIs(series, histograms.Histograms(_KEY))
+    histograms.AddItem(_KEY, _Event(4))
+    self.assertEqual(5, len(histograms.Histograms(_KEY).steps))
+
+  def testRaggedHistogramsAreListed(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    histograms.AddItem(_KEY, _Event(0))
+    histograms.AddItem(_KEY, _TensorEvent(
+        wall_time=1.0, step=1,
+        tensor_proto=tf.make_tensor_proto([[0.0, 1.0, 2.0]],
+                                          dtype=tf.float64)))
+    buckets = histograms.Histograms(_KEY).buckets
+    self.assertEqual([(3, 3), (1, 3)], [b.shape for b in buckets])
+
+  def testItemsRebuildTensorEvents(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    histograms.AddItem(_KEY, _Event(1))
+    [item] = histograms.Items(_KEY)
+    self.assertEqual((101.0, 1), (item.wall_time, item.step))
+    self.assertAllEqual(_Buckets(1), tf.make_ndarray(item.tensor_proto))
+    histograms.Histograms(_KEY)
+    [item] = histograms.Items(_KEY)
+    self.assertAllEqual(_Buckets(1), tf.make_ndarray(item.tensor_proto))
+
+  def testOnlyReadItemsAreDecoded(self):
+    histograms = histogram_reservoir.HistogramReservoir(10, _TensorEvent)
+    with tf.test.mock.patch.object(
+        histogram_reservoir, '_decode',
+        wraps=histogram_reservoir._decode) as decode:
+      for step in xrange(1000):
+        histograms.AddItem(_KEY, _Event(step))
+      self.assertEqual(0, decode.call_count)
+      histograms.Distributions(_KEY)
+      histograms.Histograms(_KEY)
+      histograms.Distributions(_KEY)
+      self.assertEqual(10, decode.call_count)
+
+  def testDistributionsAreCachedAndCompressedInBatches(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    for step in xrange(4):
+      histograms.AddItem(_KEY, _Event(step))
+    with tf.test.mock.patch.object(
+        compressor, 'compress_histograms',
+        wraps=compressor.compress_histograms) as compress_histograms:
+      series = histograms.Distributions(_KEY)
+      self.assertIs(series, histograms.Distributions(_KEY))
+      self.assertEqual(1, compress_histograms.call_count)
+      self.assertEqual((4, 3, 3), compress_histograms.call_args[0][0].shape)
+      histograms.AddItem(_KEY, _Event(4))
+      self.assertEqual(5, len(histograms.Distributions(_KEY).steps))
+      self.assertEqual(2, compress_histograms.call_count)
+      self.assertEqual((1, 3, 3), compress_histograms.call_args[0][0].shape)
+
+  def testOnlySelectedHistogramsAreDecoded(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    for step in xrange(100):
+      histograms.AddItem(_KEY, _Event(step))
+    with tf.test.mock.patch.object(
+        histogram_reservoir, '_decode',
+        wraps=histogram_reservoir._decode) as decode:
+      series = histograms.Histograms(
+          _KEY, select=lambda steps: [0, len(steps) // 2, len(steps) - 1])
+      self.assertEqual(3, decode.call_count)
+    self.assertEqual([0, 50, 99], series.steps.tolist())
+    self.assertAllClose([100.0, 150.0, 199.0], series.wall_times)
+    self.assertEqual((3, 3, 3), series.buckets.shape)
+    self.assertAllEqual(_Buckets(50), series.buckets[1])
+
+  def testEmptyHistogram(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    histograms.AddItem(_KEY, _TensorEvent(
+        wall_time=1.0, step=0,
+        tensor_proto=tf.make_tensor_proto(np.zeros((0, 3)), dtype=tf.float64)))
+    self.assertAllClose(np.zeros((1, len(compressor.NORMAL_HISTOGRAM_BPS))),
+                        histograms.Distributions(_KEY).values)
+
+  def testFilterItemsSeesTensorEvents(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    for step in xrange(10):
+      histograms.AddItem(_KEY, _Event(step))
+    self.assertEqual(5, histograms.FilterItems(lambda e: e.step < 5))
+    self.assertEqual([0, 1, 2, 3, 4],
+                     histograms.Distributions(_KEY).steps.tolist())
+
+  def testMissingKeyRaises(self):
+    histograms = histogram_reservoir.HistogramReservoir(0, _TensorEvent)
+    with self.assertRaises(KeyError):
+      histograms.Distributions(_KEY)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,180 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Contains the implementation for the LogdirIndex class."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import time
+
+import tensorflow as tf
+
+# If a directory was modified less than this many seconds before we listed it,
+# the listing may have raced with a write that did not bump the (possibly
+# coarse-grained) mtime. Such listings are never trusted on the next refresh.
+_RACY_MTIME_WINDOW_SECS = 2
+
+
+class _DirectoryEntry(object):
+  """Cached listing of a single directory."""
+
+  __slots__ = ('mtime', 'racy', 'has_matching_files', 'subdirs',
+               'last_change', 'subtree_last_change', 'last_check')
+
+  def __init__(self):
+    self.mtime = None
+    self.racy = True
+    self.has_matching_files = False
+    self.subdirs = []
+    self.last_change = None
+    self.subtree_last_change = None
+    self.last_check = None
+
+
+class LogdirIndex(object):
+  """Incrementally discovers the directories beneath a logdir.
+
+  Walking a large logdir with `tf.gfile.Walk` lists every directory and stats
+  every entry, even when nothing has changed. A `LogdirIndex` remembers the
+  listing of each directory together with the directory's mtime, and only
+  lists a directory again when its mtime changes. Directories whose mtime
+  cannot be determined (e.g. on object stores) are listed on every refresh.
+
+  Optionally, subtrees that have not changed for `quiet_period` seconds are
+  only checked every `quiet_rescan_interval` seconds. New runs created deep
+  inside such a subtree may therefore take up to `quiet_rescan_interval`
+  seconds to be discovered.
+  """
+
+  def __init__(self,
+               top,
+               file_filter=lambda x: True,
+               quiet_period=None,
+               quiet_rescan_interval=60,
+               clock=time.time):
+    """Constructs a new LogdirIndex.
+
+    Args:
+      top: The root directory to index.
+      file_filter: A predicate on file paths. `Subdirectories` returns the
+        directories that directly contain at least one matching file.
+      quiet_period: The number of seconds after which an unchanged subtree is
+        considered quiet and is checked less often. If None, every directory
+        is checked on each refresh.
+      quiet_rescan_interval: How often (in seconds) quiet subtrees are checked.
+      clock: A function returning the current time in seconds.
+    """
+    self._top = top
+    self._file_filter = file_filter
+    self._quiet_period = quiet_period
+    self._quiet_rescan_interval = quiet_rescan_interval
+    self._clock = clock
+    self._entries = {}
+
+  def Subdirectories(self):
+    """Refreshes the index and returns directories with matching files.
+
+    If `top` does not exist, this returns an empty list.
+
+    Returns:
+      A sorted list of absolute directory paths.
+    """
+    self._Refresh(self._top, self._clock())
+    return sorted(path for path, entry in self._entries.items()
+                  if entry.has_matching_files)
+
+  def _Refresh(self, path, now):
+    """Refreshes the subtree rooted at `path`.
+
+    Args:
+      path: The directory to refresh.
+      now: The current time according to `self._clock`.
+
+    Returns:
+      The time of the most recent change observed in the subtree, or None if
+      the directory no longer exists.
+    """
+    entry = self._entries.get(path)
+    if entry is not None and self._IsQuiet(entry, now):
+      return entry.subtree_last_change
+
+    mtime = _GetMtime(path)
+    if (entry is None or entry.racy or mtime is None or
+        mtime != entry.mtime):
+      listed_at = time.time()
+      try:
+        names = tf.gfile.ListDirectory(path)
+      except tf.errors.NotFoundError:
+        self._Prune(path)
+        return None
+      subdirs = []
+      has_matching_files = False
+      for name in names:
+        child = os.path.join(path, tf.compat.as_str_any(name).rstrip('/'))
+        if tf.gfile.IsDirectory(child):
+          subdirs.append(child)
+        elif not has_matching_files and self._file_filter(child):
+          has_matching_files = True
+      if entry is None:
+        entry = _DirectoryEntry()
+        self._entries[path] = entry
+      for removed in set(entry.subdirs) - set(subdirs):
+        self._Prune(removed)
+      if (entry.last_change is None or
+          entry.has_matching_files != has_matching_files or
+          entry.subdirs != subdirs):
+        entry.last_change = now
+      entry.mtime = mtime
+      entry.racy = (mtime is None or
+                    listed_at - mtime / 1e9 < _RACY_MTIME_WINDOW_SECS)
+      entry.has_matching_files = has_matching_files
+      entry.subdirs = subdirs
+
+    subtree_last_change = entry.last_change
+    for subdir in list(entry.subdirs):
+      child_last_change = self._Refresh(subdir, now)
+      if child_last_change is None:
+        # The subdirectory vanished between listing it and descending into it.
+        entry.subdirs.remove(subdir)
+        entry.last_change = subtree_last_change = now
+      else:
+        subtree_last_change = max(subtree_last_change, child_last_change)
+    entry.subtree_last_change = subtree_last_change
+    entry.last_check = now
+    return subtree_last_change
+
+  def _IsQuiet(self, entry, now):
+    if self._quiet_period is None:
+      return False
+    return (now - entry.subtree_last_change >= self._quiet_period and
+            now - entry.last_check < self._quiet_rescan_interval)
+
+  def _Prune(self, path):
+    """Removes `path` and everything beneath it from the index."""
+    entry = self._entries.pop(path, None)
+    if entry is not None:
+      for subdir in entry.subdirs:
+        self._Prune(subdir)
+
+
+def _GetMtime(path):
+  """Returns the mtime of `path` in nanoseconds, or None if unavailable."""
+  try:
+    mtime = tf.gfile.Stat(path).mtime_nanos
+  except tf.errors.OpError:
+    return None
+  return mtime or None
@@ -0,0 +1,131 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for logdir_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import time
+
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import logdir_index
+
+
+class _FakeClock(object):
+
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+class LogdirIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(LogdirIndexTest, self).setUp()
+    self.stubs = tf.test.StubOutForTesting()
+    self._top = os.path.join(self.get_temp_dir(), 'logdir_index_test')
+    if os.path.exists(self._top):
+      shutil.rmtree(self._top)
+    os.makedirs(self._top)
+    self._clock = _FakeClock()
+    self._list_calls = []
+    original = tf.gfile.ListDirectory
+
+    def _CountingListDirectory(path):
+      self._list_calls.append(path)
+      return original(path)
+
+    self.stubs.Set(tf.gfile, 'ListDirectory', _CountingListDirectory)
+
+  def tearDown(self):
+    self.stubs.CleanUp()
+
+  def _Index(self, **kwargs):
+    return logdir_index.LogdirIndex(
+        self._top,
+        file_filter=lambda path: 'tfevents' in os.path.basename(path),
+        clock=self._clock,
+        **kwargs)
+
+  def _AddEvents(self, *parts):
+    directory = os.path.join(self._top, *parts)
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    with open(os.path.join(directory, 'events.out.tfevents.1'), 'w'):
+      pass
+    return directory
+
+  def _AgeDirectories(self):
+    """Moves all mtimes into the past so listings are not considered racy."""
+    past = time.time() - 3600
+    for dir_path, _, _ in os.walk(self._top):
+      os.utime(dir_path, (past, past))
+
+  def testMissingDirectory(self):
+    shutil.rmtree(self._top)
+    self.assertEqual([], self._Index().Subdirectories())
+
+  def testFindsNestedRuns(self):
+    run1 = self._AddEvents('run1')
+    run2 = self._AddEvents('a', 'b', 'run2')
+    os.makedirs(os.path.join(self._top, 'empty'))
+    self.assertEqual(sorted([run1, run2]), self._Index().Subdirectories())
+
+  def testUnchangedDirectoriesAreNotListedAgain(self):
+    run1 = self._AddEvents('run1')
+    self._AgeDirectories()
+    index = self._Index()
+    self.assertEqual([run1], index.Subdirectories())
+    self._list_calls = []
+    self.assertEqual([run1], index.Subdirectories())
+    self.assertEqual([], self._list_calls)
+
+  def testPicksUpNewAndDeletedRuns(self):
+    run1 = self._AddEvents('run1')
+    self._AgeDirectories()
+    index = self._Index()
+    self.assertEqual([run1], index.Subdirectories())
+
+    run2 = self._AddEvents('run2')
+    self.assertEqual(sorted([run1, run2]), index.Subdirectories())
+
+    shutil.rmtree(run1)
+    self.assertEqual([run2], index.Subdirectories())
+
+  def testQuietSubtreesAreCheckedLessOften(self):
+    run1 = self._AddEvents('run1')
+    index = self._Index(quiet_period=30, quiet_rescan_interval=60)
+    self.assertEqual([run1], index.Subdirectories())
+
+    self._clock.now += 40
+    self.assertEqual([run1], index.Subdirectories())
+    run2 = self._AddEvents('run2')
+    self._list_calls = []
+    self._clock.now += 10
+    self.assertEqual([run1], index.Subdirectories())
+    self.assertEqual([], self._list_calls)
+
+    self._clock.now += 60
+    self.assertEqual(sorted([run1, run2]), index.Subdirectories())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -18,16 +18,25 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import functools
+import itertools
 import os
 import threading
 
+import numpy as np
 import tensorflow as tf
 
 from tensorboard import data_compat
 from tensorboard.backend.event_processing import directory_watcher
+from tensorboard.backend.event_processing import event_file_index
 from tensorboard.backend.event_processing import event_file_loader
+from tensorboard.backend.event_processing import histogram_reservoir
 from tensorboard.backend.event_processing import plugin_asset_util
 from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_reservoir
+from tensorboard.plugins.distribution import compressor
+from tensorboard.plugins.histogram import metadata as histogram_metadata
+from tensorboard.plugins.scalar import metadata as scalar_metadata
 
 namedtuple = collections.namedtuple
 
@@ -55,6 +64,10 @@ STORE_EVERYTHING_SIZE_GUIDANCE = {
 
 _TENSOR_RESERVOIR_KEY = "."  # arbitrary
 
+# Generations are drawn from a single process-wide sequence, so that a run
+# whose accumulator is replaced never repeats an earlier generation.
+_generations = itertools.count(1)
+
 
 def IsTensorFlowEventsFile(path):
   """Check the path name to see if it is probably a TF Events file.
@@ -104,7 +117,10 @@ class EventAccumulator(object):
         tf events file. The accumulator will load events from this path.
     tensors_by_tag: A dictionary mapping each tag name to a
       reservoir.Reservoir of tensor summaries. Each such reservoir will
-      only use a single key, given by `_TENSOR_RESERVOIR_KEY`.
+      only use a single key, given by `_TENSOR_RESERVOIR_KEY`. Tags owned by
+      the scalars plugin use a columnar `scalar_reservoir.ScalarReservoir`
+      instead, and tags owned by the histograms plugin use a
+      `histogram_reservoir.HistogramReservoir`.
 
   @@Tensors
   """
@@ -113,7 +129,8 @@ class EventAccumulator(object):
                path,
                size_guidance=None,
                tensor_size_guidance=None,
-               purge_orphaned_data=True):
+               purge_orphaned_data=True,
+               event_index_dir=None):
     """Construct the `EventAccumulator`.
 
     Args:
@@ -133,6 +150,9 @@ class EventAccumulator(object):
         `size_guidance[event_accumulator.TENSORS]`. Defaults to `{}`.
       purge_orphaned_data: Whether to discard any events that were "orphaned" by
         a TensorFlow restart.
+      event_index_dir: If set, a directory in which record offset indexes of
+        local event files are persisted. After a restart, only the indexed
+        events whose data is kept are parsed. See `event_file_index`.
     """
     size_guidance = dict(size_guidance or DEFAULT_SIZE_GUIDANCE)
     sizes = {}
@@ -161,10 +181,15 @@ class EventAccumulator(object):
     # first event encountered per tag, so we must store that first instance of
     # content for each tag.
     self._plugin_to_tag_to_content = collections.defaultdict(dict)
+    # The tags of `summary_metadata`, in the order they were first seen. This
+    # list is only ever appended to, so that indexes of the tags (see
+    # `tag_index.TagIndex`) can catch up by reading its tail.
+    self._summary_metadata_tags = []
 
     self._generator_mutex = threading.Lock()
     self.path = path
-    self._generator = _GeneratorFromPath(path)
+    self._generator = _GeneratorFromPath(path, event_index_dir)
+    self._generation = next(_generations)
 
     self.purge_orphaned_data = purge_orphaned_data
 
@@ -175,6 +200,8 @@ class EventAccumulator(object):
     # The attributes that get built up by the accumulator
     self.accumulated_attrs = ()
     self._tensor_summaries = {}
+    # An `_IndexedReplay` of the restored records loaded so far, if any.
+    self._replay = None
 
   def Reload(self):
     """Loads all events added since the last call to `Reload`.
@@ -185,10 +212,24 @@ class EventAccumulator(object):
       The `EventAccumulator`.
     """
     with self._generator_mutex:
-      for event in self._generator.Load():
-        self._ProcessEvent(event)
+      processed = False
+      for record in self._generator.Load():
+        self._ProcessRecord(record)
+        processed = True
+      self._FinishReplay()
+      if processed:
+        self._generation = next(_generations)
     return self
 
+  def Generation(self):
+    """Returns a number that changes whenever the accumulated data changes.
+
+    The generation is updated after a `Reload` that processed new events has
+    finished, so a value read before reading any data is at most stale, never
+    ahead of the data. Generations are unique across all accumulators.
+    """
+    return self._generation
+
   def PluginAssets(self, plugin_name):
     """Return a list of all plugin assets for the given plugin.
 
@@ -235,8 +276,9 @@ class EventAccumulator(object):
       return self._first_event_timestamp
     with self._generator_mutex:
       try:
-        event = next(self._generator.Load())
-        self._ProcessEvent(event)
+        record = next(self._generator.Load())
+        self._ProcessRecord(record)
+        self._FinishReplay()
         return self._first_event_timestamp
 
       except StopIteration:
@@ -274,6 +316,44 @@ class EventAccumulator(object):
     """
     return self.summary_metadata[tag]
 
+  def SummaryMetadataTags(self, start=0):
+    """Returns the tags that have summary metadata, in order of appearance.
+
+    Tags are only ever added to the end of this sequence, so a caller that
+    has seen the first `start` tags can ask for the new ones only.
+
+    Args:
+      start: The number of tags to skip.
+
+    Returns:
+      A list of tags.
+    """
+    return self._summary_metadata_tags[start:]
+
+  def _ProcessRecord(self, record):
+    """Processes an event or an `event_file_loader.IndexedRecord`.
+
+    Restored records that arrive before any tensor has been loaded are
+    replayed by an `_IndexedReplay`, which only parses the records whose data
+    is kept. Other restored records are parsed and processed like events.
+    """
+    if isinstance(record, event_file_loader.IndexedRecord):
+      if self._replay is None and not self.tensors_by_tag:
+        self._replay = _IndexedReplay(self)
+      if self._replay is not None:
+        self._replay.Add(record)
+        return
+      record = record.Event()
+    self._FinishReplay()
+    self._ProcessEvent(record)
+
+  def _FinishReplay(self):
+    """Loads the data kept by the pending `_IndexedReplay`, if any."""
+    if self._replay is not None:
+      replay = self._replay
+      self._replay = None
+      replay.Finish()
+
   def _ProcessEvent(self, event):
     """Called whenever an event is loaded."""
     if self._first_event_timestamp is None:
@@ -333,25 +413,7 @@ class EventAccumulator(object):
     elif event.HasField('summary'):
       for value in event.summary.value:
         value = data_compat.migrate_value(value)
-
-        if value.HasField('metadata'):
-          tag = value.tag
-          # We only store the first instance of the metadata. This check
-          # is important: the `FileWriter` does strip metadata from all
-          # values except the first one per each tag, but a new
-          # `FileWriter` is created every time a training job stops and
-          # restarts. Hence, we must also ignore non-initial metadata in
-          # this logic.
-          if tag not in self.summary_metadata:
-            self.summary_metadata[tag] = value.metadata
-            plugin_data = value.metadata.plugin_data
-            if plugin_data.plugin_name:
-              self._plugin_to_tag_to_content[plugin_data.plugin_name][tag] = (
-                  plugin_data.content)
-            else:
-              tf.logging.warn(
-                  ('This summary with tag %r is oddly not associated with a '
-                   'plugin.'), tag)
+        self._ProcessSummaryMetadata(value)
 
         for summary_type, summary_func in SUMMARY_TYPES.items():
           if value.HasField(summary_type):
@@ -363,6 +425,28 @@ class EventAccumulator(object):
               tag = value.node_name
             getattr(self, summary_func)(tag, event.wall_time, event.step, datum)
 
+  def _ProcessSummaryMetadata(self, value):
+    """Stores the metadata of a migrated summary value, if it is the first."""
+    if value.HasField('metadata'):
+      tag = value.tag
+      # We only store the first instance of the metadata. This check
+      # is important: the `FileWriter` does strip metadata from all
+      # values except the first one per each tag, but a new
+      # `FileWriter` is created every time a training job stops and
+      # restarts. Hence, we must also ignore non-initial metadata in
+      # this logic.
+      if tag not in self.summary_metadata:
+        self.summary_metadata[tag] = value.metadata
+        self._summary_metadata_tags.append(tag)
+        plugin_data = value.metadata.plugin_data
+        if plugin_data.plugin_name:
+          self._plugin_to_tag_to_content[plugin_data.plugin_name][tag] = (
+              plugin_data.content)
+        else:
+          tf.logging.warn(
+              ('This summary with tag %r is oddly not associated with a '
+               'plugin.'), tag)
+
   def Tags(self):
     """Return all tags found in the value stream.
 
@@ -396,6 +480,23 @@ class EventAccumulator(object):
       return graph
     raise ValueError('There is no graph in this EventAccumulator')
 
+  def SerializedGraph(self):
+    """Return the serialized graph definition, if there is one.
+
+    Unlike `Graph`, this does not parse the graph. The same bytes object is
+    returned until a new graph is loaded, so callers may use its identity to
+    tell whether the graph has changed.
+
+    Raises:
+      ValueError: If there is no graph for this run.
+
+    Returns:
+      The `graph_def` proto, serialized as a bytestring.
+    """
+    if self._graph is None:
+      raise ValueError('There is no graph in this EventAccumulator')
+    return self._graph
+
   def MetaGraph(self):
     """Return the metagraph definition, if there is one.
 
@@ -444,6 +545,97 @@ class EventAccumulator(object):
     """
     return self.tensors_by_tag[tag].Items(_TENSOR_RESERVOIR_KEY)
 
+  def ScalarSeries(self, tag):
+    """Given a scalar summary tag, return its points as parallel arrays.
+
+    Args:
+      tag: A string tag associated with the events.
+
+    Raises:
+      KeyError: If the tag is not found.
+
+    Returns:
+      A `scalar_reservoir.ScalarSeries` of float64 wall times, int64 steps and
+      float64 values.
+    """
+    tensors = self.tensors_by_tag[tag]
+    if isinstance(tensors, scalar_reservoir.ScalarReservoir):
+      return tensors.Series(_TENSOR_RESERVOIR_KEY)
+    tensor_events = tensors.Items(_TENSOR_RESERVOIR_KEY)
+    return scalar_reservoir.ScalarSeries(
+        wall_times=np.array([e.wall_time for e in tensor_events],
+                            dtype=np.float64),
+        steps=np.array([e.step for e in tensor_events], dtype=np.int64),
+        values=np.array([tf.make_ndarray(e.tensor_proto).item()
+                         for e in tensor_events], dtype=np.float64))
+
+  def Histograms(self, tag, select=None):
+    """Given a histogram summary tag, return its decoded histograms.
+
+    Each histogram is decoded the first time it is read, and its buckets are
+    then memoized, so this only decodes histograms not read before.
+
+    Args:
+      tag: A string tag associated with the events.
+      select: An optional function taking the int64 array of steps of all
+        histograms and returning the indices of those to return. Only the
+        selected histograms are decoded.
+
+    Raises:
+      KeyError: If the tag is not found.
+
+    Returns:
+      A `histogram_reservoir.HistogramSeries`. See
+      `HistogramReservoir.Histograms` for the layout of its buckets.
+    """
+    tensors = self.tensors_by_tag[tag]
+    if isinstance(tensors, histogram_reservoir.HistogramReservoir):
+      return tensors.Histograms(_TENSOR_RESERVOIR_KEY, select)
+    tensor_events = tensors.Items(_TENSOR_RESERVOIR_KEY)
+    steps = np.array([e.step for e in tensor_events], dtype=np.int64)
+    if select is not None:
+      indices = np.asarray(select(steps), dtype=np.int64)
+      tensor_events = [tensor_events[i] for i in indices]
+      steps = steps[indices]
+    return histogram_reservoir.HistogramSeries(
+        wall_times=np.array([e.wall_time for e in tensor_events],
+                            dtype=np.float64),
+        steps=steps,
+        buckets=[tf.make_ndarray(e.tensor_proto) for e in tensor_events])
+
+  def Distributions(self, tag):
+    """Given a histogram summary tag, return its compressed distributions.
+
+    Each histogram is decoded and compressed the first time its distribution
+    is read, and the result is then memoized, so this only compresses
+    histograms not read before.
+
+    Args:
+      tag: A string tag associated with the events.
+
+    Raises:
+      KeyError: If the tag is not found.
+
+    Returns:
+      A `histogram_reservoir.DistributionSeries`, whose values hold one row
+      per step with the value at each of the basis points in
+      `compressor.NORMAL_HISTOGRAM_BPS`.
+    """
+    tensors = self.tensors_by_tag[tag]
+    if isinstance(tensors, histogram_reservoir.HistogramReservoir):
+      return tensors.Distributions(_TENSOR_RESERVOIR_KEY)
+    tensor_events = tensors.Items(_TENSOR_RESERVOIR_KEY)
+    values = np.empty(
+        (len(tensor_events), len(compressor.NORMAL_HISTOGRAM_BPS)),
+        dtype=np.float64)
+    for (i, e) in enumerate(tensor_events):
+      values[i] = histogram_reservoir.compress(e.tensor_proto)
+    return histogram_reservoir.DistributionSeries(
+        wall_times=np.array([e.wall_time for e in tensor_events],
+                            dtype=np.float64),
+        steps=np.array([e.step for e in tensor_events], dtype=np.int64),
+        values=values)
+
   def _MaybePurgeOrphanedData(self, event):
     """Maybe purge orphaned data due to a TensorFlow crash.
 
@@ -509,10 +701,31 @@ class EventAccumulator(object):
     tv = TensorEvent(wall_time=wall_time, step=step, tensor_proto=tensor)
     with self._tensors_by_tag_lock:
       if tag not in self.tensors_by_tag:
-        reservoir_size = self._GetTensorReservoirSize(tag)
-        self.tensors_by_tag[tag] = reservoir.Reservoir(reservoir_size)
+        self.tensors_by_tag[tag] = self._NewTensorReservoir(tag)
     self.tensors_by_tag[tag].AddItem(_TENSOR_RESERVOIR_KEY, tv)
 
+  def _NewTensorReservoir(self, tag):
+    """Returns an empty reservoir for the tensors of `tag`."""
+    reservoir_size = self._GetTensorReservoirSize(tag)
+    if self._IsScalarTag(tag):
+      return scalar_reservoir.ScalarReservoir(reservoir_size, TensorEvent)
+    elif self._IsHistogramTag(tag):
+      return histogram_reservoir.HistogramReservoir(reservoir_size, TensorEvent)
+    else:
+      return reservoir.Reservoir(reservoir_size)
+
+  def _IsScalarTag(self, tag):
+    return self._TagPluginName(tag) == scalar_metadata.PLUGIN_NAME
+
+  def _IsHistogramTag(self, tag):
+    return self._TagPluginName(tag) == histogram_metadata.PLUGIN_NAME
+
+  def _TagPluginName(self, tag):
+    summary_metadata = self.summary_metadata.get(tag)
+    if summary_metadata is None:
+      return None
+    return summary_metadata.plugin_data.plugin_name
+
   def _GetTensorReservoirSize(self, tag):
     default = self._size_guidance[TENSORS]
     summary_metadata = self.summary_metadata.get(tag)
@@ -565,6 +778,83 @@ class EventAccumulator(object):
       tf.logging.warn(purge_msg)
 
 
+class _IndexedReplay(object):
+  """Replays restored records, parsing only those whose data is kept.
+
+  Restored records carry an `event_file_index.IndexEntry`, which tells the
+  step, wall time and kind of the event, and the tag of each summary value.
+  That is enough to process most events without parsing them: the values of
+  each tag are sampled by a stand-in `reservoir.Reservoir` of the same size
+  and seed as the accumulator's, whose items only point at their records.
+  `Finish` then parses the records of the surviving items, adds them to new
+  reservoirs, and carries the sampling state over, so that the accumulator
+  ends up exactly as if every event had been processed.
+
+  Records that the index cannot describe, such as graphs and file versions,
+  and summaries that may set the first metadata of a tag, are parsed and
+  processed right away. Purges do not touch the tensor reservoirs (see
+  `accumulated_attrs`), so the stand-ins need not be purged either.
+  """
+
+  # pylint: disable=protected-access
+
+  def __init__(self, accumulator):
+    self._accumulator = accumulator
+    # Map from tag to a pair of a new reservoir for its tensors and the
+    # stand-in reservoir, whose items are `(IndexedRecord, value index)`.
+    self._reservoirs = collections.OrderedDict()
+
+  def Add(self, record):
+    """Processes an `event_file_loader.IndexedRecord`."""
+    accumulator = self._accumulator
+    entry = record.entry
+    if entry.flags & event_file_index.DATA:
+      accumulator._ProcessEvent(record.Event())
+      return
+    # The first event timestamp and purge checks only look at these fields.
+    stub = tf.Event(step=entry.step, wall_time=entry.wall_time)
+    if entry.flags & event_file_index.SESSION_START:
+      stub.session_log.status = tf.SessionLog.START
+    elif entry.flags & event_file_index.SUMMARY:
+      stub.summary.SetInParent()
+    accumulator._ProcessEvent(stub)
+    if not entry.flags & event_file_index.SUMMARY:
+      return
+    if (entry.flags & event_file_index.SUMMARY_METADATA and
+        any(tag is not None and tag not in accumulator.summary_metadata
+            for tag in entry.tags)):
+      for value in record.Event().summary.value:
+        accumulator._ProcessSummaryMetadata(data_compat.migrate_value(value))
+    for (i, tag) in enumerate(entry.tags):
+      if tag is None:
+        continue
+      if tag not in self._reservoirs:
+        self._reservoirs[tag] = (
+            accumulator._NewTensorReservoir(tag),
+            reservoir.Reservoir(accumulator._GetTensorReservoirSize(tag)))
+      self._reservoirs[tag][1].AddItem(_TENSOR_RESERVOIR_KEY, (record, i))
+
+  def Finish(self):
+    """Adds the kept tensors to the accumulator."""
+    events = {}
+    for (tag, (tensors, stand_in)) in self._reservoirs.items():
+      for (record, i) in stand_in.Items(_TENSOR_RESERVOIR_KEY):
+        event = events.get(record)
+        if event is None:
+          event = events[record] = record.Event()
+        value = data_compat.migrate_value(event.summary.value[i])
+        tensors.AddItem(
+            _TENSOR_RESERVOIR_KEY,
+            TensorEvent(wall_time=event.wall_time, step=event.step,
+                        tensor_proto=value.tensor))
+      tensors.SetSamplingState(
+          _TENSOR_RESERVOIR_KEY, stand_in.SamplingState(_TENSOR_RESERVOIR_KEY))
+      with self._accumulator._tensors_by_tag_lock:
+        self._accumulator.tensors_by_tag[tag] = tensors
+    tf.logging.debug('Replayed restored records of %s, parsing %d of them',
+                     self._accumulator.path, len(events))
+
+
 def _GetPurgeMessage(most_recent_step, most_recent_wall_time, event_step,
                      event_wall_time):
   """Return the string message associated with TensorBoard purges."""
@@ -576,15 +866,17 @@ def _GetPurgeMessage(most_recent_step, most_recent_wall_time, event_step,
                   event_wall_time)
 
 
-def _GeneratorFromPath(path):
+def _GeneratorFromPath(path, event_index_dir=None):
   """Create an event generator for file or directory at given path string."""
   if not path:
     raise ValueError('path must be a valid string')
+  loader_factory = functools.partial(
+      event_file_loader.EventFileLoader, index_dir=event_index_dir)
   if IsTensorFlowEventsFile(path):
-    return event_file_loader.EventFileLoader(path)
+    return loader_factory(path)
   else:
     return directory_watcher.DirectoryWatcher(
-        path, event_file_loader.EventFileLoader, IsTensorFlowEventsFile)
+        path, loader_factory, IsTensorFlowEventsFile)
 
 
 def _ParseFileVersion(file_version):
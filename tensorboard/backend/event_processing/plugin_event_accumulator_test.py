@@ -27,6 +27,7 @@ import tensorflow as tf
 from tensorboard.plugins.audio import summary as audio_summary
 from tensorboard.plugins.image import summary as image_summary
 from tensorboard.plugins.scalar import summary as scalar_summary
+from tensorboard.backend.event_processing import event_file_loader
 from tensorboard.backend.event_processing import plugin_event_accumulator as ea
 
 
@@ -120,7 +121,7 @@ class MockingEventAccumulatorTest(EventAccumulatorTest):
     self._real_generator = ea._GeneratorFromPath
 
     def _FakeAccumulatorConstructor(generator, *args, **kwargs):
-      ea._GeneratorFromPath = lambda x: generator
+      ea._GeneratorFromPath = lambda x, event_index_dir=None: generator
       return self._real_constructor(generator, *args, **kwargs)
 
     ea.EventAccumulator = _FakeAccumulatorConstructor
@@ -149,6 +150,21 @@ class MockingEventAccumulatorTest(EventAccumulatorTest):
         ea.TENSORS: ['s1', 's2'],
     })
 
+  def testGenerationChangesOnlyWhenEventsAreProcessed(self):
+    gen = _EventGenerator(self)
+    acc = ea.EventAccumulator(gen)
+    other = ea.EventAccumulator(_EventGenerator(self))
+    self.assertNotEqual(acc.Generation(), other.Generation())
+    generation = acc.Generation()
+    acc.Reload()
+    self.assertEqual(generation, acc.Generation())
+    gen.AddScalarTensor('s1', wall_time=1, step=10, value=50)
+    acc.Reload()
+    self.assertNotEqual(generation, acc.Generation())
+    generation = acc.Generation()
+    acc.Reload()
+    self.assertEqual(generation, acc.Generation())
+
   def testKeyError(self):
     """KeyError should be raised when accessing non-existing keys."""
     gen = _EventGenerator(self)
@@ -361,6 +377,15 @@ class MockingEventAccumulatorTest(EventAccumulatorTest):
         ea.META_GRAPH: False,
     })
 
+    series = accumulator.ScalarSeries(u'xent/scalar_summary')
+    self.assertEqual(list(range(10)), series.steps.tolist())
+    self.assertAllClose([1.0 / (i + 1.0) for i in xrange(10)], series.values)
+    tensor_events = accumulator.Tensors(u'xent/scalar_summary')
+    self.assertEqual(list(range(10)), [e.step for e in tensor_events])
+    self.assertAllClose(
+        series.values,
+        [tf.make_ndarray(e.tensor_proto).item() for e in tensor_events])
+
   def testNewStyleAudioSummary(self):
     """Verify processing of tensorboard.plugins.audio.summary."""
     event_sink = _EventGenerator(self, zero_out_timestamps=True)
@@ -605,6 +630,10 @@ class RealisticEventAccumulatorTest(EventAccumulatorTest):
       self.assertEqual(i * i, tf.make_ndarray(sq_events[i].tensor_proto).item())
     self.assertProtoEquals(graph.as_graph_def(add_shapes=True), acc.Graph())
     self.assertProtoEquals(meta_graph_def, acc.MetaGraph())
+    self.assertIs(acc.SerializedGraph(), acc.SerializedGraph())
+    self.assertProtoEquals(
+        graph.as_graph_def(add_shapes=True),
+        tf.GraphDef.FromString(acc.SerializedGraph()))
 
   def testGraphFromMetaGraphBecomesAvailable(self):
     """Test accumulator by writing values and then reading them."""
@@ -687,6 +716,8 @@ class RealisticEventAccumulatorTest(EventAccumulatorTest):
 
     self.assertProtoEquals(summary_metadata_1,
                            acc.SummaryMetadata('you_are_it'))
+    self.assertEqual(['you_are_it'], acc.SummaryMetadataTags())
+    self.assertEqual([], acc.SummaryMetadataTags(1))
 
   def testPluginTagToContent_PluginsCannotJumpOnTheBandwagon(self):
     # If there are multiple `SummaryMetadata` for a given tag, and the
@@ -714,5 +745,56 @@ class RealisticEventAccumulatorTest(EventAccumulatorTest):
     with six.assertRaisesRegex(self, KeyError, 'plug'):
       acc.PluginTagToContent('plug')
 
+
+class EventIndexRestoreTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(EventIndexRestoreTest, self).setUp()
+    self.logdir = os.path.join(self.get_temp_dir(), 'run')
+    self.index_dir = os.path.join(self.get_temp_dir(), 'index')
+    self.writer = tf.summary.FileWriter(self.logdir)
+
+  def _Write(self, steps):
+    for step in steps:
+      self.writer.add_summary(scalar_summary.pb('loss', step * 0.5), step)
+      summary = tf.Summary()
+      summary.value.add(tag='id', simple_value=step)
+      self.writer.add_summary(summary, step)
+    self.writer.flush()
+
+  def _Accumulator(self):
+    return ea.EventAccumulator(
+        self.logdir, size_guidance={ea.TENSORS: 10},
+        event_index_dir=self.index_dir)
+
+  def assertSameSeries(self, expected, actual):
+    for tag in ('loss/scalar_summary', 'id'):
+      for (x, y) in zip(expected.ScalarSeries(tag), actual.ScalarSeries(tag)):
+        self.assertAllEqual(x, y)
+
+  def testRestartOnlyParsesKeptEvents(self):
+    self._Write(xrange(100))
+    fresh = self._Accumulator().Reload()
+
+    real_event = event_file_loader.IndexedRecord.Event
+    with tf.test.mock.patch.object(
+        event_file_loader.IndexedRecord, 'Event', autospec=True,
+        side_effect=real_event) as parse:
+      restored = self._Accumulator().Reload()
+    # The file version, the first summaries with metadata, and at most ten
+    # kept summaries of each tag are parsed, out of 201 records.
+    self.assertLessEqual(parse.call_count, 23)
+    self.assertSameSeries(fresh, restored)
+    self.assertEqual(fresh.FirstEventTimestamp(),
+                     restored.FirstEventTimestamp())
+    self.assertEqual(fresh.most_recent_step, restored.most_recent_step)
+
+    # Sampling carries on exactly as if every event had been processed.
+    self._Write(xrange(100, 300))
+    fresh.Reload()
+    restored.Reload()
+    self.assertSameSeries(fresh, restored)
+
+
 if __name__ == '__main__':
   tf.test.main()
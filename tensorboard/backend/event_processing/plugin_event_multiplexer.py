@@ -20,13 +20,17 @@ from __future__ import print_function
 
 import os
 import threading
+import time
 
 import six
+from six.moves import queue
 import tensorflow as tf
 
 from tensorboard.backend.event_processing import directory_watcher
+from tensorboard.backend.event_processing import logdir_index
 from tensorboard.backend.event_processing import plugin_event_accumulator as event_accumulator  # pylint: disable=line-too-long
 from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.backend.event_processing import tag_index
 
 
 class EventMultiplexer(object):
@@ -71,7 +75,11 @@ class EventMultiplexer(object):
                run_path_map=None,
                size_guidance=None,
                tensor_size_guidance=None,
-               purge_orphaned_data=True):
+               purge_orphaned_data=True,
+               max_reload_threads=1,
+               logdir_quiet_period=None,
+               logdir_quiet_rescan_interval=60,
+               event_index_dir=None):
     """Constructor for the `EventMultiplexer`.
 
     Args:
@@ -86,7 +94,25 @@ class EventMultiplexer(object):
         `event_accumulator.EventAccumulator` for details.
       purge_orphaned_data: Whether to discard any events that were "orphaned" by
         a TensorFlow restart.
+      max_reload_threads: The maximum number of runs to reload in parallel
+        during `Reload`. A value of 1 reloads runs sequentially on the calling
+        thread.
+      logdir_quiet_period: The number of seconds after which a subtree of a
+        directory passed to `AddRunsFromDirectory` that has not changed is
+        checked for new runs less often. If None, the whole tree is checked on
+        every call. See `logdir_index.LogdirIndex`.
+      logdir_quiet_rescan_interval: How often (in seconds) quiet subtrees are
+        checked for new runs.
+      event_index_dir: If set, a directory in which record offset indexes of
+        local event files are persisted across restarts. See
+        `event_accumulator.EventAccumulator`.
+
+    Raises:
+      ValueError: If `max_reload_threads` is less than 1.
     """
+    if max_reload_threads < 1:
+      raise ValueError('max_reload_threads must be positive, got %r' %
+                       max_reload_threads)
     tf.logging.info('Event Multiplexer initializing.')
     self._accumulators_mutex = threading.Lock()
     self._accumulators = {}
@@ -96,6 +122,13 @@ class EventMultiplexer(object):
                            event_accumulator.DEFAULT_SIZE_GUIDANCE)
     self._tensor_size_guidance = tensor_size_guidance
     self.purge_orphaned_data = purge_orphaned_data
+    self._max_reload_threads = max_reload_threads
+    self._logdir_quiet_period = logdir_quiet_period
+    self._logdir_quiet_rescan_interval = logdir_quiet_rescan_interval
+    # Maps each path passed to AddRunsFromDirectory to its LogdirIndex.
+    self._logdir_indexes = {}
+    self._event_index_dir = event_index_dir
+    self._tag_index = tag_index.TagIndex()
     if run_path_map is not None:
       tf.logging.info('Event Multplexer doing initialization load for %s',
                       run_path_map)
@@ -136,7 +169,8 @@ class EventMultiplexer(object):
             path,
             size_guidance=self._size_guidance,
             tensor_size_guidance=self._tensor_size_guidance,
-            purge_orphaned_data=self.purge_orphaned_data)
+            purge_orphaned_data=self.purge_orphaned_data,
+            event_index_dir=self._event_index_dir)
         self._accumulators[name] = accumulator
         self._paths[name] = path
     if accumulator:
@@ -157,6 +191,10 @@ class EventMultiplexer(object):
 
     If the `EventMultiplexer` is already loaded this will cause
     the newly created accumulators to `Reload()`.
+
+    Directory listings are cached between calls for the same path, and only
+    directories whose mtime changed are listed again.
+
     Args:
       path: A string path to a directory to load runs from.
       name: Optionally, what name to apply to the runs. If name is provided
@@ -172,7 +210,7 @@ class EventMultiplexer(object):
       The `EventMultiplexer`.
     """
     tf.logging.info('Starting AddRunsFromDirectory: %s', path)
-    for subdir in GetLogdirSubdirectories(path):
+    for subdir in self._GetLogdirIndex(path).Subdirectories():
       tf.logging.info('Adding events from directory %s', subdir)
       rpath = os.path.relpath(subdir, path)
       subname = os.path.join(name, rpath) if name else rpath
@@ -180,8 +218,40 @@ class EventMultiplexer(object):
     tf.logging.info('Done with AddRunsFromDirectory: %s', path)
     return self
 
+  def _GetLogdirIndex(self, path):
+    """Returns the `LogdirIndex` for `path`, creating it if necessary.
+
+    Args:
+      path: A string path to a directory.
+
+    Raises:
+      ValueError: If the path exists and isn't a directory.
+
+    Returns:
+      A `logdir_index.LogdirIndex`.
+    """
+    if tf.gfile.Exists(path) and not tf.gfile.IsDirectory(path):
+      raise ValueError('AddRunsFromDirectory: path exists and is not a '
+                       'directory, %s' % path)
+    index = self._logdir_indexes.get(path)
+    if index is None:
+      index = logdir_index.LogdirIndex(
+          path,
+          file_filter=event_accumulator.IsTensorFlowEventsFile,
+          quiet_period=self._logdir_quiet_period,
+          quiet_rescan_interval=self._logdir_quiet_rescan_interval)
+      self._logdir_indexes[path] = index
+    return index
+
   def Reload(self):
-    """Call `Reload` on every `EventAccumulator`."""
+    """Call `Reload` on every `EventAccumulator`.
+
+    If the multiplexer was constructed with `max_reload_threads` greater than
+    1, the accumulators are reloaded by a bounded pool of worker threads.
+    Loading is dominated by I/O, so this shortens the wall-clock time of a
+    reload cycle when there are many runs. Either way, an error reloading a
+    run is logged, and the other runs are still reloaded.
+    """
     tf.logging.info('Beginning EventMultiplexer.Reload()')
     self._reload_called = True
     # Build a list so we're safe even if the list of accumulators is modified
@@ -190,18 +260,60 @@ class EventMultiplexer(object):
       items = list(self._accumulators.items())
 
     names_to_delete = set()
-    for name, accumulator in items:
+    names_to_delete_mutex = threading.Lock()
+
+    def _ReloadAccumulator(name, accumulator):
+      start = time.time()
       try:
         accumulator.Reload()
       except (OSError, IOError) as e:
         tf.logging.error("Unable to reload accumulator '%s': %s", name, e)
       except directory_watcher.DirectoryDeletedError:
-        names_to_delete.add(name)
+        with names_to_delete_mutex:
+          names_to_delete.add(name)
+      except Exception:  # pylint: disable=broad-except
+        # A run that fails to load must not keep the other runs, or later
+        # reload cycles, from loading, with or without worker threads.
+        tf.logging.error("Unexpected error reloading accumulator '%s'",
+                         name, exc_info=True)
+      finally:
+        tf.logging.debug("Reloaded accumulator '%s' in %0.3f secs", name,
+                         time.time() - start)
+
+    num_threads = min(self._max_reload_threads, len(items))
+    if num_threads <= 1:
+      for name, accumulator in items:
+        _ReloadAccumulator(name, accumulator)
+    else:
+      items_queue = queue.Queue()
+      for item in items:
+        items_queue.put(item)
+
+      def _Worker():
+        while True:
+          try:
+            name, accumulator = items_queue.get_nowait()
+          except queue.Empty:
+            return
+          _ReloadAccumulator(name, accumulator)
+
+      threads = [
+          threading.Thread(target=_Worker, name='Reloader-%d' % i)
+          for i in range(num_threads)
+      ]
+      for thread in threads:
+        thread.daemon = True
+        thread.start()
+      for thread in threads:
+        thread.join()
 
     with self._accumulators_mutex:
       for name in names_to_delete:
         tf.logging.warning("Deleting accumulator '%s'", name)
         del self._accumulators[name]
+      run_to_accumulator = dict(self._accumulators)
+    # Index new tags now, so that requests find the index up to date.
+    self._tag_index.Update(run_to_accumulator)
     tf.logging.info('Finished with EventMultiplexer.Reload()')
     return self
 
@@ -291,6 +403,24 @@ class EventMultiplexer(object):
     accumulator = self.GetAccumulator(run)
     return accumulator.Graph()
 
+  def SerializedGraph(self, run):
+    """Retrieve the serialized graph associated with the provided run.
+
+    See `EventAccumulator.SerializedGraph`.
+
+    Args:
+      run: A string name of a run to load the graph for.
+
+    Raises:
+      KeyError: If the run is not found.
+      ValueError: If the run does not have an associated graph.
+
+    Returns:
+      The `GraphDef` protobuf, serialized as a bytestring.
+    """
+    accumulator = self.GetAccumulator(run)
+    return accumulator.SerializedGraph()
+
   def MetaGraph(self, run):
     """Retrieve the metagraph associated with the provided run.
 
@@ -358,6 +488,59 @@ class EventMultiplexer(object):
     accumulator = self.GetAccumulator(run)
     return accumulator.Tensors(tag)
 
+  def ScalarSeries(self, run, tag):
+    """Retrieve the points of a scalar summary as parallel arrays.
+
+    Args:
+      run: A string name of the run for which values are retrieved.
+      tag: A string name of the tag for which values are retrieved.
+
+    Raises:
+      KeyError: If the run is not found, or the tag is not available for
+        the given run.
+
+    Returns:
+      A `scalar_reservoir.ScalarSeries` of wall times, steps and values.
+    """
+    accumulator = self.GetAccumulator(run)
+    return accumulator.ScalarSeries(tag)
+
+  def Histograms(self, run, tag, select=None):
+    """Retrieve the decoded histograms of a histogram summary.
+
+    Args:
+      run: A string name of the run for which values are retrieved.
+      tag: A string name of the tag for which values are retrieved.
+      select: An optional function choosing which histograms to decode. See
+        `EventAccumulator.Histograms`.
+
+    Raises:
+      KeyError: If the run is not found, or the tag is not available for
+        the given run.
+
+    Returns:
+      A `histogram_reservoir.HistogramSeries`.
+    """
+    accumulator = self.GetAccumulator(run)
+    return accumulator.Histograms(tag, select)
+
+  def Distributions(self, run, tag):
+    """Retrieve the compressed distributions of a histogram summary.
+
+    Args:
+      run: A string name of the run for which values are retrieved.
+      tag: A string name of the tag for which values are retrieved.
+
+    Raises:
+      KeyError: If the run is not found, or the tag is not available for
+        the given run.
+
+    Returns:
+      A `histogram_reservoir.DistributionSeries`.
+    """
+    accumulator = self.GetAccumulator(run)
+    return accumulator.Distributions(tag)
+
   def PluginRunToTagToContent(self, plugin_name):
     """Returns a 2-layer dictionary of the form {run: {tag: content}}.
 
@@ -370,17 +553,60 @@ class EventMultiplexer(object):
     Returns:
       A dictionary of the form {run: {tag: content}}.
     """
+    with self._accumulators_mutex:
+      # Unlike `Runs`, this does not list the tags of every run.
+      items = list(six.iteritems(self._accumulators))
     mapping = {}
-    for run in self.Runs():
+    for (run, accumulator) in items:
       try:
-        tag_to_content = self.GetAccumulator(run).PluginTagToContent(
-            plugin_name)
+        tag_to_content = accumulator.PluginTagToContent(plugin_name)
       except KeyError:
         # This run lacks content for the plugin. Try the next run.
         continue
       mapping[run] = tag_to_content
     return mapping
 
+  def PluginRunToTagToMetadata(self, plugin_name):
+    """Returns the summary metadata of the tags of a plugin, for every run.
+
+    This is backed by an index that is brought up to date on each call by
+    reading only the tags that appeared since the previous call. See
+    `tag_index.TagIndex`.
+
+    Args:
+      plugin_name: The name of the plugin for which to fetch metadata.
+
+    Returns:
+      A dict of the form `{run: {tag: summary_metadata}}` with an entry for
+      every run, which is empty if the run has no tags for the plugin.
+    """
+    with self._accumulators_mutex:
+      run_to_accumulator = dict(self._accumulators)
+    self._tag_index.Update(run_to_accumulator)
+    return self._tag_index.PluginRunToTagToMetadata(plugin_name)
+
+  def PluginRunToTagToRendered(self, plugin_name, render_fn):
+    """Returns the tags of a plugin for every run, rendered by `render_fn`.
+
+    Like `PluginRunToTagToMetadata`, but each `SummaryMetadata` is passed
+    through `render_fn`, and the result is cached until the plugin gets new
+    tags or runs are added or removed. See
+    `tag_index.TagIndex.PluginRunToTagToRendered`.
+
+    Args:
+      plugin_name: The name of the plugin for which to fetch tags.
+      render_fn: A function from a `SummaryMetadata` to a value. A plugin
+        must always pass an equal function.
+
+    Returns:
+      A dict of the form `{run: {tag: render_fn(summary_metadata)}}` with an
+      entry for every run. It must not be modified.
+    """
+    with self._accumulators_mutex:
+      run_to_accumulator = dict(self._accumulators)
+    self._tag_index.Update(run_to_accumulator)
+    return self._tag_index.PluginRunToTagToRendered(plugin_name, render_fn)
+
   def SummaryMetadata(self, run, tag):
     """Return the summary metadata for the given tag on the given run.
 
@@ -418,6 +644,21 @@ class EventMultiplexer(object):
     """Returns a dict mapping run names to event file paths."""
     return self._paths
 
+  def RunGenerations(self):
+    """Returns a dict mapping run names to accumulator generations.
+
+    The dict changes whenever a run is added or removed, or a run's data
+    changes. See `EventAccumulator.Generation`.
+    """
+    with self._accumulators_mutex:
+      items = list(six.iteritems(self._accumulators))
+    return {run_name: accumulator.Generation()
+            for run_name, accumulator in items}
+
+  def EventIndexDir(self):
+    """Returns the directory of persisted event file indexes, or None."""
+    return self._event_index_dir
+
   def GetAccumulator(self, run):
     """Returns EventAccumulator for a given run.
 
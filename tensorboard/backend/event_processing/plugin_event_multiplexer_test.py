@@ -82,6 +82,10 @@ class _FakeAccumulator(object):
             ) in self._plugin_to_tag_to_content[plugin_name].items()
     }
 
+  def SummaryMetadataTags(self, start=0):
+    del start  # Unused.
+    return []
+
   def Reload(self):
     self.reload_called = True
 
@@ -89,8 +93,10 @@ class _FakeAccumulator(object):
 def _GetFakeAccumulator(path,
                         size_guidance=None,
                         tensor_size_guidance=None,
-                        purge_orphaned_data=None):
+                        purge_orphaned_data=None,
+                        event_index_dir=None):
   del size_guidance, tensor_size_guidance, purge_orphaned_data  # Unused.
+  del event_index_dir  # Unused.
   return _FakeAccumulator(path)
 
 
@@ -126,6 +132,34 @@ class EventMultiplexerTest(tf.test.TestCase):
     self.assertTrue(x.GetAccumulator('run1').reload_called)
     self.assertTrue(x.GetAccumulator('run2').reload_called)
 
+  def testParallelReload(self):
+    """All EventAccumulators should Reload when using a thread pool."""
+    run_path_map = {'run%d' % i: 'path%d' % i for i in range(10)}
+    x = event_multiplexer.EventMultiplexer(run_path_map, max_reload_threads=4)
+    x.Reload()
+    for run in run_path_map:
+      self.assertTrue(x.GetAccumulator(run).reload_called)
+
+  def testReloadSurvivesUnexpectedErrors(self):
+    """A failing accumulator does not stop the other reloads in any mode."""
+    run_path_map = {'run%d' % i: 'path%d' % i for i in range(10)}
+    for max_reload_threads in (1, 2):
+      x = event_multiplexer.EventMultiplexer(
+          run_path_map, max_reload_threads=max_reload_threads)
+      for run in ('run0', 'run1'):
+        accumulator = x.GetAccumulator(run)
+        accumulator.Reload = lambda: 1 / 0
+      with tf.test.mock.patch.object(tf.logging, 'error') as log_error:
+        x.Reload()
+      self.assertEqual(2, log_error.call_count)
+      for run in run_path_map:
+        if run not in ('run0', 'run1'):
+          self.assertTrue(x.GetAccumulator(run).reload_called)
+
+  def testInvalidMaxReloadThreads(self):
+    with self.assertRaises(ValueError):
+      event_multiplexer.EventMultiplexer(max_reload_threads=0)
+
   def testPluginRunToTagToContent(self):
     """Tests the method that produces the run to tag to content mapping."""
     x = event_multiplexer.EventMultiplexer({'run1': 'path1', 'run2': 'path2'})
@@ -140,6 +174,11 @@ class EventMultiplexerTest(tf.test.TestCase):
         }
     }, x.PluginRunToTagToContent('baz_plugin'))
 
+  def testPluginRunToTagToMetadataListsEveryRun(self):
+    x = event_multiplexer.EventMultiplexer({'run1': 'path1', 'run2': 'path2'})
+    self.assertDictEqual({'run1': {}, 'run2': {}},
+                         x.PluginRunToTagToMetadata('baz_plugin'))
+
   def testExceptions(self):
     """KeyError should be raised when accessing non-existing keys."""
     x = event_multiplexer.EventMultiplexer({'run1': 'path1', 'run2': 'path2'})
@@ -320,6 +359,20 @@ class EventMultiplexerWithRealAccumulatorTest(tf.test.TestCase):
     x.Reload()
     self.assertNotIn('run2', x.Runs().keys())
 
+  def testDeletingDirectoryRemovesRunWithParallelReload(self):
+    x = event_multiplexer.EventMultiplexer(max_reload_threads=2)
+    tmpdir = self.get_temp_dir()
+    join = os.path.join
+    run_dirs = [join(tmpdir, 'parallel_run%d' % i) for i in range(3)]
+    for i, dirname in enumerate(run_dirs):
+      _AddEvents(dirname)
+      x.AddRun(dirname, 'run%d' % i)
+    x.Reload()
+
+    shutil.rmtree(run_dirs[1])
+    x.Reload()
+    self.assertItemsEqual(['run0', 'run2'], x.Runs().keys())
+
 
 if __name__ == '__main__':
   tf.test.main()
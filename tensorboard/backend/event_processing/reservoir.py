@@ -137,6 +137,39 @@ class Reservoir(object):
       bucket = self._buckets[key]
     bucket.AddItem(item, f)
 
+  def SamplingState(self, key):
+    """Returns the state that decides which future items of a key are kept.
+
+    Args:
+      key: The key of the bucket.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+
+    Returns:
+      An opaque value to pass to `SetSamplingState`.
+    """
+    with self._mutex:
+      if key not in self._buckets:
+        raise KeyError('Key %s was not found in Reservoir' % key)
+      bucket = self._buckets[key]
+    return bucket.SamplingState()
+
+  def SetSamplingState(self, key, state):
+    """Makes sampling of a key continue as in another reservoir.
+
+    After this, the bucket keeps the same future items as the bucket whose
+    `SamplingState` was taken would, provided both hold as many items and
+    have the same size.
+
+    Args:
+      key: The key of the bucket.
+      state: A value returned by `SamplingState`.
+    """
+    with self._mutex:
+      bucket = self._buckets[key]
+    bucket.SetSamplingState(state)
+
   def FilterItems(self, filterFn, key=None):
     """Filter items within a Reservoir, using a filtering function.
 
@@ -223,6 +256,18 @@ class _ReservoirBucket(object):
           self.items[-1] = f(item)
       self._num_items_seen += 1
 
+  def SamplingState(self):
+    """Returns the number of items seen and the state of the generator."""
+    with self._mutex:
+      return (self._num_items_seen, self._random.getstate())
+
+  def SetSamplingState(self, state):
+    """Restores a state returned by `SamplingState`."""
+    (num_items_seen, random_state) = state
+    with self._mutex:
+      self._num_items_seen = num_items_seen
+      self._random.setstate(random_state)
+
   def FilterItems(self, filterFn):
     """Filter items in a ReservoirBucket, using a filtering function.
 
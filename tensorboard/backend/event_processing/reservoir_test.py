@@ -92,6 +92,20 @@ class ReservoirTest(tf.test.TestCase):
       r2.AddItem('key', i)
     self.assertNotEqual(r1.Items(key), r2.Items(key))
 
+  def testSetSamplingState(self):
+    """Tests that a reservoir can take over the sampling of another."""
+    r1 = reservoir.Reservoir(10)
+    r2 = reservoir.Reservoir(10)
+    for i in xrange(100):
+      r1.AddItem('key', i)
+    for item in r1.Items('key'):
+      r2.AddItem('key', item)
+    r2.SetSamplingState('key', r1.SamplingState('key'))
+    for i in xrange(100, 200):
+      r1.AddItem('key', i)
+      r2.AddItem('key', i)
+    self.assertEqual(r1.Items('key'), r2.Items('key'))
+
   def testFilterItemsByKey(self):
     r = reservoir.Reservoir(100, seed=0)
     for i in xrange(10):
@@ -0,0 +1,203 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A reservoir that stores scalar tensor events in parallel arrays."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import random
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+ScalarSeries = collections.namedtuple(
+    'ScalarSeries', ['wall_times', 'steps', 'values'])
+
+_INITIAL_CAPACITY = 16
+
+
+class ScalarReservoir(object):
+  """A columnar drop-in for a single-key `reservoir.Reservoir` of scalars.
+
+  Items are `TensorEvent`s whose tensors hold a single number. Rather than
+  keeping each `TensorProto`, the wall time, step and value of each kept item
+  are stored in float64, int64 and float64 arrays respectively, for 24 bytes
+  per point. Sampling decisions are made exactly as in `reservoir.Reservoir`
+  with the same seed, so both keep the same points.
+
+  `Items` rebuilds `TensorEvent`s on demand; `Series` returns the arrays
+  directly and should be preferred.
+  """
+
+  def __init__(self, size, tensor_event_factory, seed=0,
+               always_keep_last=True):
+    """Creates a new scalar reservoir.
+
+    Args:
+      size: The number of values to keep. If 0, all values will be kept.
+      tensor_event_factory: A function `(wall_time, step, tensor_proto)`
+        returning a `TensorEvent`, used by `Items`.
+      seed: The seed of the random number generator used when sampling.
+      always_keep_last: Whether to always keep the latest seen item in the
+        end of the reservoir.
+
+    Raises:
+      ValueError: If size is negative or not an integer.
+    """
+    if size < 0 or size != round(size):
+      raise ValueError('size must be nonegative integer, was %s' % size)
+    self.size = size
+    self.always_keep_last = always_keep_last
+    self._tensor_event_factory = tensor_event_factory
+    self._random = random.Random(seed)
+    self._mutex = threading.Lock()
+    capacity = size or _INITIAL_CAPACITY
+    self._wall_times = np.empty(capacity, dtype=np.float64)
+    self._steps = np.empty(capacity, dtype=np.int64)
+    self._values = np.empty(capacity, dtype=np.float64)
+    self._length = 0
+    self._num_items_seen = 0
+    self._dtype = None
+    self._key = None
+
+  def Keys(self):
+    """Returns the keys with which items have been added."""
+    with self._mutex:
+      return [] if self._key is None else [self._key]
+
+  def AddItem(self, key, item, f=lambda x: x):
+    """Adds a scalar `TensorEvent`, replacing an old item if necessary.
+
+    Args:
+      key: The key to store the item under. Only a single key is supported.
+      item: A `TensorEvent` whose tensor has exactly one element.
+      f: An optional function to transform the item prior to addition.
+
+    Raises:
+      ValueError: If a second key is used.
+    """
+    with self._mutex:
+      if self._key is None:
+        self._key = key
+      elif key != self._key:
+        raise ValueError('ScalarReservoir only supports a single key')
+      if self._length < self.size or self.size == 0:
+        index = self._length
+        self._length += 1
+      else:
+        r = self._random.randint(0, self._num_items_seen)
+        if r < self.size:
+          # Drop the item at r, shifting the later ones down by one.
+          last = self._length - 1
+          for array in (self._wall_times, self._steps, self._values):
+            array[r:last] = array[r + 1:self._length]
+          index = last
+        elif self.always_keep_last:
+          index = self._length - 1
+        else:
+          index = None
+      if index is not None:
+        self._Set(index, f(item))
+      self._num_items_seen += 1
+
+  def Items(self, key):
+    """Returns the kept items as `TensorEvent`s.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+    """
+    series = self.Series(key)
+    dtype = self._dtype or tf.float32
+    return [
+        self._tensor_event_factory(
+            wall_time=float(wall_time),
+            step=int(step),
+            tensor_proto=tf.make_tensor_proto(value, dtype=dtype))
+        for (wall_time, step, value) in zip(series.wall_times.tolist(),
+                                            series.steps.tolist(),
+                                            series.values.tolist())
+    ]
+
+  def Series(self, key):
+    """Returns a `ScalarSeries` with copies of the kept points.
+
+    Raises:
+      KeyError: If the key is not found in the reservoir.
+    """
+    with self._mutex:
+      if key != self._key or self._key is None:
+        raise KeyError('Key %s was not found in Reservoir' % key)
+      n = self._length
+      return ScalarSeries(wall_times=self._wall_times[:n].copy(),
+                          steps=self._steps[:n].copy(),
+                          values=self._values[:n].copy())
+
+  def SamplingState(self, key):
+    """See `reservoir.Reservoir.SamplingState`."""
+    with self._mutex:
+      if key != self._key or self._key is None:
+        raise KeyError('Key %s was not found in Reservoir' % key)
+      return (self._num_items_seen, self._random.getstate())
+
+  def SetSamplingState(self, key, state):
+    """See `reservoir.Reservoir.SetSamplingState`."""
+    (num_items_seen, random_state) = state
+    with self._mutex:
+      if self._key is None:
+        self._key = key
+      elif key != self._key:
+        raise ValueError('ScalarReservoir only supports a single key')
+      self._num_items_seen = num_items_seen
+      self._random.setstate(random_state)
+
+  def FilterItems(self, filterFn, key=None):
+    """Filters items, keeping those for which `filterFn` returns True.
+
+    Args:
+      filterFn: A function of a `TensorEvent` returning whether to keep it.
+      key: An optional key to filter.
+
+    Returns:
+      The number of items removed.
+    """
+    if self._key is None or (key and key != self._key):
+      return 0
+    keep = np.array([bool(filterFn(item)) for item in self.Items(self._key)],
+                    dtype=bool)
+    with self._mutex:
+      size_before = self._length
+      kept = int(keep.sum())
+      for array in (self._wall_times, self._steps, self._values):
+        array[:kept] = array[:size_before][keep]
+      self._length = kept
+      prop_remaining = kept / float(size_before) if size_before > 0 else 0
+      self._num_items_seen = int(round(self._num_items_seen * prop_remaining))
+      return size_before - kept
+
+  def _Set(self, index, item):
+    """Stores `item` at `index`, growing the arrays if necessary."""
+    if index >= len(self._values):
+      capacity = 2 * len(self._values)
+      self._wall_times = np.resize(self._wall_times, capacity)
+      self._steps = np.resize(self._steps, capacity)
+      self._values = np.resize(self._values, capacity)
+    if self._dtype is None:
+      self._dtype = tf.as_dtype(item.tensor_proto.dtype)
+    self._wall_times[index] = item.wall_time
+    self._steps[index] = item.step
+    self._values[index] = tf.make_ndarray(item.tensor_proto).item()
@@ -0,0 +1,99 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for scalar_reservoir."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import numpy as np
+from six.moves import xrange  # pylint: disable=redefined-builtin
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_reservoir
+
+_TensorEvent = collections.namedtuple(
+    '_TensorEvent', ['wall_time', 'step', 'tensor_proto'])
+
+_KEY = '.'
+
+
+def _Event(step):
+  return _TensorEvent(wall_time=100.0 + step, step=step,
+                      tensor_proto=tf.make_tensor_proto(step * 0.5,
+                                                        dtype=tf.float32))
+
+
+class ScalarReservoirTest(tf.test.TestCase):
+
+  def _AssertSameAsReservoir(self, size, num_items, always_keep_last=True):
+    columnar = scalar_reservoir.ScalarReservoir(
+        size, _TensorEvent, always_keep_last=always_keep_last)
+    expected = reservoir.Reservoir(size, always_keep_last=always_keep_last)
+    for step in xrange(num_items):
+      columnar.AddItem(_KEY, _Event(step))
+      expected.AddItem(_KEY, step)
+    series = columnar.Series(_KEY)
+    steps = expected.Items(_KEY)
+    self.assertEqual(steps, series.steps.tolist())
+    self.assertAllClose([100.0 + s for s in steps], series.wall_times)
+    self.assertAllClose([s * 0.5 for s in steps], series.values)
+    self.assertEqual(np.float64, series.values.dtype)
+    self.assertEqual(np.int64, series.steps.dtype)
+
+  def testMatchesReservoirWhenNotFull(self):
+    self._AssertSameAsReservoir(size=100, num_items=50)
+
+  def testMatchesReservoirSampling(self):
+    self._AssertSameAsReservoir(size=10, num_items=1000)
+
+  def testMatchesReservoirWithoutKeepLast(self):
+    self._AssertSameAsReservoir(size=10, num_items=1000,
+                                always_keep_last=False)
+
+  def testUnboundedSizeGrows(self):
+    self._AssertSameAsReservoir(size=0, num_items=1000)
+
+  def testItemsRebuildTensorEvents(self):
+    columnar = scalar_reservoir.ScalarReservoir(0, _TensorEvent)
+    for step in xrange(3):
+      columnar.AddItem(_KEY, _Event(step))
+    items = columnar.Items(_KEY)
+    self.assertEqual([0, 1, 2], [item.step for item in items])
+    self.assertEqual([tf.float32.as_datatype_enum] * 3,
+                     [item.tensor_proto.dtype for item in items])
+    self.assertAllClose([0.0, 0.5, 1.0],
+                        [tf.make_ndarray(item.tensor_proto).item()
+                         for item in items])
+
+  def testFilterItems(self):
+    columnar = scalar_reservoir.ScalarReservoir(0, _TensorEvent)
+    for step in xrange(10):
+      columnar.AddItem(_KEY, _Event(step))
+    self.assertEqual(6, columnar.FilterItems(lambda item: item.step < 4))
+    self.assertEqual([0, 1, 2, 3], columnar.Series(_KEY).steps.tolist())
+
+  def testMissingKey(self):
+    columnar = scalar_reservoir.ScalarReservoir(10, _TensorEvent)
+    self.assertEqual([], columnar.Keys())
+    with self.assertRaises(KeyError):
+      columnar.Series(_KEY)
+
+
+if __name__ == '__main__':
+  tf.test.main()
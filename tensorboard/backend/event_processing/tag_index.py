@@ -0,0 +1,137 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""An incrementally updated index of tags by plugin and run."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import six
+
+
+class TagIndex(object):
+  """Indexes the summary metadata of a set of accumulators by plugin.
+
+  `Update` visits each run once, and reads only the tags that appeared since
+  the previous update (see `EventAccumulator.SummaryMetadataTags`), so
+  keeping the index current costs O(runs + new tags) rather than
+  O(all tags). `PluginRunToTagToRendered` caches the tag listing of each
+  plugin until `Update` changes it.
+
+  This class is thread-safe.
+  """
+
+  def __init__(self):
+    self._mutex = threading.Lock()
+    # Map from run to a [accumulator, number of tags indexed] pair.
+    self._runs = {}
+    # Map from plugin name to run to tag to `SummaryMetadata`.
+    self._plugin_to_run_to_tags = {}
+    # Map from plugin name to the `(render_fn, {run: {tag: rendered}})` last
+    # built by `PluginRunToTagToRendered`. A plugin's entry is dropped when
+    # it has new tags, and all are dropped when runs are added or removed.
+    self._rendered = {}
+    # Incremented whenever entries of `_rendered` are dropped.
+    self._rendered_epoch = 0
+
+  def Update(self, run_to_accumulator):
+    """Indexes the new runs and tags of the given accumulators.
+
+    Runs that are missing from `run_to_accumulator`, or whose accumulator has
+    been replaced, are dropped from the index.
+
+    Args:
+      run_to_accumulator: A dict mapping run names to `EventAccumulator`s.
+    """
+    with self._mutex:
+      for run in list(self._runs):
+        if run_to_accumulator.get(run) is not self._runs[run][0]:
+          self._RemoveRun(run)
+      for (run, accumulator) in six.iteritems(run_to_accumulator):
+        if run not in self._runs:
+          self._runs[run] = [accumulator, 0]
+          self._DropRendered()
+        entry = self._runs[run]
+        tags = accumulator.SummaryMetadataTags(entry[1])
+        for tag in tags:
+          summary_metadata = accumulator.SummaryMetadata(tag)
+          plugin_name = summary_metadata.plugin_data.plugin_name
+          if plugin_name:
+            run_to_tags = self._plugin_to_run_to_tags.setdefault(
+                plugin_name, {})
+            run_to_tags.setdefault(run, {})[tag] = summary_metadata
+            self._DropRendered(plugin_name)
+        entry[1] += len(tags)
+
+  def PluginRunToTagToMetadata(self, plugin_name):
+    """Returns the indexed tags of a plugin.
+
+    Returns:
+      A dict `{run: {tag: summary_metadata}}` with an entry for every
+      indexed run, which is empty if the run has no tags for the plugin. The
+      dict is a copy, which callers may modify.
+    """
+    with self._mutex:
+      run_to_tags = self._plugin_to_run_to_tags.get(plugin_name, {})
+      return {run: dict(run_to_tags.get(run, ())) for run in self._runs}
+
+  def PluginRunToTagToRendered(self, plugin_name, render_fn):
+    """Returns the indexed tags of a plugin, each passed through `render_fn`.
+
+    The result is cached until `Update` indexes new tags for the plugin, or
+    adds or removes runs, so that listing the tags of a plugin does not
+    visit them all on every call. A plugin must always pass an equal
+    `render_fn`.
+
+    Args:
+      plugin_name: The name of the plugin.
+      render_fn: A function from a `SummaryMetadata` to a value.
+
+    Returns:
+      A dict `{run: {tag: render_fn(summary_metadata)}}` with an entry for
+      every indexed run, like `PluginRunToTagToMetadata`. It is shared
+      between callers and must not be modified.
+    """
+    with self._mutex:
+      cached = self._rendered.get(plugin_name)
+      if cached is not None and cached[0] == render_fn:
+        return cached[1]
+      epoch = self._rendered_epoch
+      run_to_tags = self._plugin_to_run_to_tags.get(plugin_name, {})
+      mapping = {run: dict(run_to_tags.get(run, ())) for run in self._runs}
+    # Render without holding the mutex, as `render_fn` may be slow.
+    result = {run: {tag: render_fn(summary_metadata)
+                    for (tag, summary_metadata) in six.iteritems(tags)}
+              for (run, tags) in six.iteritems(mapping)}
+    with self._mutex:
+      if self._rendered_epoch == epoch:
+        self._rendered[plugin_name] = (render_fn, result)
+    return result
+
+  def _DropRendered(self, plugin_name=None):
+    """Drops the cached tag listing of a plugin, or of all plugins."""
+    if plugin_name is None:
+      self._rendered.clear()
+    else:
+      self._rendered.pop(plugin_name, None)
+    self._rendered_epoch += 1
+
+  def _RemoveRun(self, run):
+    del self._runs[run]
+    self._DropRendered()
+    for run_to_tags in six.itervalues(self._plugin_to_run_to_tags):
+      run_to_tags.pop(run, None)
@@ -0,0 +1,133 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tag_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import tag_index
+
+
+class _FakeAccumulator(object):
+
+  def __init__(self):
+    self.summary_metadata = {}
+    self.tags = []
+    self.lookups = 0
+
+  def Add(self, tag, plugin_name):
+    self.summary_metadata[tag] = tf.SummaryMetadata(
+        display_name=tag.upper(),
+        plugin_data=tf.SummaryMetadata.PluginData(plugin_name=plugin_name))
+    self.tags.append(tag)
+
+  def SummaryMetadataTags(self, start=0):
+    return self.tags[start:]
+
+  def SummaryMetadata(self, tag):
+    self.lookups += 1
+    return self.summary_metadata[tag]
+
+
+class TagIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(TagIndexTest, self).setUp()
+    self.index = tag_index.TagIndex()
+    self.run1 = _FakeAccumulator()
+    self.run1.Add('loss', 'scalars')
+    self.run1.Add('weights', 'histograms')
+    self.run2 = _FakeAccumulator()
+
+  def testIndexesTagsByPlugin(self):
+    self.index.Update({'run1': self.run1, 'run2': self.run2})
+    mapping = self.index.PluginRunToTagToMetadata('scalars')
+    self.assertEqual(['run1', 'run2'], sorted(mapping))
+    self.assertEqual(['loss'], list(mapping['run1']))
+    self.assertEqual('LOSS', mapping['run1']['loss'].display_name)
+    self.assertEqual({}, mapping['run2'])
+    self.assertEqual({'run1': {}, 'run2': {}},
+                     self.index.PluginRunToTagToMetadata('images'))
+
+  def testOnlyNewTagsAreRead(self):
+    runs = {'run1': self.run1, 'run2': self.run2}
+    self.index.Update(runs)
+    self.assertEqual(2, self.run1.lookups)
+    self.index.Update(runs)
+    self.assertEqual(2, self.run1.lookups)
+    self.run1.Add('accuracy', 'scalars')
+    self.index.Update(runs)
+    self.assertEqual(3, self.run1.lookups)
+    self.assertItemsEqual(
+        ['loss', 'accuracy'],
+        self.index.PluginRunToTagToMetadata('scalars')['run1'])
+
+  def testRemovedAndReplacedRunsAreDropped(self):
+    self.index.Update({'run1': self.run1, 'run2': self.run2})
+    self.index.Update({'run2': self.run2})
+    self.assertEqual({'run2': {}},
+                     self.index.PluginRunToTagToMetadata('scalars'))
+    replacement = _FakeAccumulator()
+    replacement.Add('other', 'scalars')
+    self.index.Update({'run2': replacement})
+    self.assertEqual(['other'],
+                     list(self.index.PluginRunToTagToMetadata('scalars')
+                          ['run2']))
+
+  def testResultIsACopy(self):
+    self.index.Update({'run1': self.run1})
+    self.index.PluginRunToTagToMetadata('scalars')['run1'].clear()
+    self.assertEqual(1,
+                     len(self.index.PluginRunToTagToMetadata('scalars')
+                         ['run1']))
+
+  def testRenderedTagsAreCachedUntilTheyChange(self):
+    rendered = []
+
+    def render(summary_metadata):
+      rendered.append(summary_metadata.display_name)
+      return summary_metadata.display_name
+
+    runs = {'run1': self.run1, 'run2': self.run2}
+    self.index.Update(runs)
+    listing = self.index.PluginRunToTagToRendered('scalars', render)
+    self.assertEqual({'run1': {'loss': 'LOSS'}, 'run2': {}}, listing)
+    self.index.Update(runs)
+    self.assertIs(listing,
+                  self.index.PluginRunToTagToRendered('scalars', render))
+    self.assertEqual(['LOSS'], rendered)
+
+    # New tags of another plugin keep the listing.
+    self.run2.Add('bias', 'histograms')
+    self.index.Update(runs)
+    self.assertIs(listing,
+                  self.index.PluginRunToTagToRendered('scalars', render))
+
+    self.run2.Add('accuracy', 'scalars')
+    self.index.Update(runs)
+    self.assertEqual({'run1': {'loss': 'LOSS'},
+                      'run2': {'accuracy': 'ACCURACY'}},
+                     self.index.PluginRunToTagToRendered('scalars', render))
+
+    self.index.Update({'run2': self.run2})
+    self.assertEqual({'run2': {'accuracy': 'ACCURACY'}},
+                     self.index.PluginRunToTagToRendered('scalars', render))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,187 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Pure Python reader for local TFRecord files.
+
+This module does not depend on TensorFlow. Each record in a TFRecord file is
+framed as follows:
+
+    uint64 length
+    uint32 masked_crc32c(length)
+    byte   data[length]
+    uint32 masked_crc32c(data)
+
+All integers are little endian.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import re
+import struct
+
+_HEADER = struct.Struct('<QI')
+_FOOTER = struct.Struct('<I')
+
+# Matches paths like gs://bucket/path, which must be read through TensorFlow.
+_URI_RE = re.compile(r'^[a-zA-Z][0-9a-zA-Z.]*://')
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def _make_crc32c_table():
+  table = []
+  for i in range(256):
+    crc = i
+    for _ in range(8):
+      if crc & 1:
+        crc = (crc >> 1) ^ 0x82F63B78
+      else:
+        crc >>= 1
+    table.append(crc)
+  return table
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def crc32c(data):
+  """Computes the CRC32C (Castagnoli) checksum of a byte string."""
+  table = _CRC32C_TABLE
+  crc = 0xFFFFFFFF
+  for byte in bytearray(data):
+    crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+  return crc ^ 0xFFFFFFFF
+
+
+def masked_crc32c(data):
+  """Computes the masked CRC32C checksum used by the TFRecord format."""
+  crc = crc32c(data)
+  return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+def is_local_path(path):
+  """Returns whether `path` can be read without going through TensorFlow."""
+  if isinstance(path, bytes):
+    path = path.decode('utf-8')
+  return _URI_RE.match(path) is None
+
+
+class DataLossError(IOError):
+  """Raised when a corrupted record is encountered."""
+
+
+class TFRecordReader(object):
+  """Reads records from a local TFRecord file using large buffered reads.
+
+  Like TensorFlow's PyRecordReader, a record that has only been partially
+  written is not consumed: `read_record` returns None and leaves the offset
+  at the start of that record, so calling it again after the writer has
+  appended more data will return the complete record.
+  """
+
+  def __init__(self, path, start_offset=0, verify_crc=False,
+               buffer_size=DEFAULT_BUFFER_SIZE):
+    """Opens a TFRecord file for reading.
+
+    Args:
+      path: Path of a file on the local file system.
+      start_offset: Byte offset of the first record to read.
+      verify_crc: Whether to verify the checksum of each record's data. The
+        checksum of each record's length is always verified.
+      buffer_size: The minimum number of bytes to read from the file at once.
+
+    Raises:
+      IOError: If the file could not be opened.
+    """
+    self._path = path
+    self._verify_crc = verify_crc
+    self._buffer_size = buffer_size
+    self._file = io.open(path, 'rb', buffering=0)
+    self._file.seek(start_offset)
+    # Offset in the file of the next record, which is the first byte of
+    # self._buffer[self._position:].
+    self._offset = start_offset
+    self._buffer = b''
+    self._position = 0
+
+  def offset(self):
+    """Returns the byte offset just past the last record read."""
+    return self._offset
+
+  def read_record(self):
+    """Reads the next record.
+
+    Returns:
+      The record's data as a byte string, or None if no complete record is
+      available yet.
+
+    Raises:
+      DataLossError: If the record is corrupted.
+      IOError: If the reader has been closed.
+    """
+    if self._file is None:
+      raise IOError('TFRecordReader for %s is closed' % self._path)
+    if not self._fill(_HEADER.size):
+      return None
+    length, length_crc = _HEADER.unpack_from(self._buffer, self._position)
+    length_bytes = self._buffer[self._position:self._position + 8]
+    if masked_crc32c(length_bytes) != length_crc:
+      raise DataLossError('Corrupted record length at offset %d in %s' %
+                          (self._offset, self._path))
+    record_size = _HEADER.size + length + _FOOTER.size
+    if not self._fill(record_size):
+      return None
+    start = self._position + _HEADER.size
+    data = self._buffer[start:start + length]
+    if self._verify_crc:
+      data_crc, = _FOOTER.unpack_from(self._buffer, start + length)
+      if masked_crc32c(data) != data_crc:
+        raise DataLossError('Corrupted record data at offset %d in %s' %
+                            (self._offset, self._path))
+    self._position += record_size
+    self._offset += record_size
+    return data
+
+  def close(self):
+    """Closes the underlying file. Further reads are not permitted."""
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+      self._buffer = b''
+      self._position = 0
+
+  def _fill(self, size):
+    """Ensures that at least `size` unconsumed bytes are buffered.
+
+    Args:
+      size: The number of bytes needed.
+
+    Returns:
+      Whether enough bytes are available.
+    """
+    available = len(self._buffer) - self._position
+    if available >= size:
+      return True
+    chunks = [self._buffer[self._position:]]
+    while available < size:
+      chunk = self._file.read(max(self._buffer_size, size - available))
+      if not chunk:
+        break
+      chunks.append(chunk)
+      available += len(chunk)
+    self._buffer = b''.join(chunks)
+    self._position = 0
+    return available >= size
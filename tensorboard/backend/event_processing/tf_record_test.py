@@ -0,0 +1,112 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tf_record."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import tf_record
+
+
+class TFRecordReaderTest(tf.test.TestCase):
+
+  def _WriteRecords(self, records):
+    path = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
+    with tf.python_io.TFRecordWriter(path) as writer:
+      for record in records:
+        writer.write(record)
+    return path
+
+  def _ReadAll(self, reader):
+    records = []
+    while True:
+      record = reader.read_record()
+      if record is None:
+        return records
+      records.append(record)
+
+  def testCrc32c(self):
+    # Test vector from RFC 3720, section B.4.
+    self.assertEqual(0x8A9136AA, tf_record.crc32c(b'\x00' * 32))
+    self.assertEqual(0xE3069283, tf_record.crc32c(b'123456789'))
+
+  def testMatchesTensorFlowReader(self):
+    records = [b'', b'foo', b'x' * 100000, b'bar']
+    path = self._WriteRecords(records)
+    expected = list(tf.python_io.tf_record_iterator(path))
+    for verify_crc in (False, True):
+      reader = tf_record.TFRecordReader(path, verify_crc=verify_crc,
+                                        buffer_size=7)
+      self.assertEqual(expected, self._ReadAll(reader))
+      self.assertEqual(os.path.getsize(path), reader.offset())
+      reader.close()
+
+  def testTruncatedRecordIsResumed(self):
+    path = self._WriteRecords([b'foo', b'bar'])
+    with open(path, 'rb') as f:
+      data = f.read()
+    with open(path, 'wb') as f:
+      f.write(data[:-5])
+    reader = tf_record.TFRecordReader(path)
+    self.assertEqual([b'foo'], self._ReadAll(reader))
+    offset = reader.offset()
+    self.assertIsNone(reader.read_record())
+    self.assertEqual(offset, reader.offset())
+    with open(path, 'ab') as f:
+      f.write(data[-5:])
+    self.assertEqual([b'bar'], self._ReadAll(reader))
+
+  def testStartOffset(self):
+    path = self._WriteRecords([b'foo', b'bar'])
+    reader = tf_record.TFRecordReader(path)
+    reader.read_record()
+    reader = tf_record.TFRecordReader(path, start_offset=reader.offset())
+    self.assertEqual([b'bar'], self._ReadAll(reader))
+
+  def testCorruptLengthRaises(self):
+    path = tempfile.NamedTemporaryFile(dir=self.get_temp_dir()).name
+    with open(path, 'wb') as f:
+      f.write(b'abcd' * 4)
+    reader = tf_record.TFRecordReader(path)
+    with self.assertRaises(tf_record.DataLossError):
+      reader.read_record()
+
+  def testCorruptDataRaisesOnlyWhenVerifying(self):
+    path = self._WriteRecords([b'foo'])
+    with open(path, 'rb') as f:
+      data = bytearray(f.read())
+    data[12] ^= 0xFF
+    with open(path, 'wb') as f:
+      f.write(data)
+    self.assertEqual(1, len(self._ReadAll(tf_record.TFRecordReader(path))))
+    reader = tf_record.TFRecordReader(path, verify_crc=True)
+    with self.assertRaises(tf_record.DataLossError):
+      reader.read_record()
+
+  def testIsLocalPath(self):
+    self.assertTrue(tf_record.is_local_path('/tmp/foo'))
+    self.assertTrue(tf_record.is_local_path(b'relative/foo'))
+    self.assertFalse(tf_record.is_local_path('gs://bucket/foo'))
+    self.assertFalse(tf_record.is_local_path('hdfs://namenode/foo'))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -24,6 +24,7 @@ import json
 import re
 import time
 import wsgiref.handlers
+import zlib
 
 import six
 import tensorflow as tf
@@ -58,6 +59,9 @@ _JSON_MIMETYPES = set([
     'application/json+protobuf',
 ])
 
+# Streamed responses are coalesced into writes of at least this many bytes.
+_STREAM_CHUNK_BYTES = 64 * 1024
+
 
 def Respond(request,
             content,
@@ -65,7 +69,8 @@ def Respond(request,
             code=200,
             expires=0,
             content_encoding=None,
-            encoding='utf-8'):
+            encoding='utf-8',
+            content_length=None):
   """Construct a werkzeug Response.
 
   Responses are transmitted to the browser with compression if: a) the browser
@@ -73,6 +78,18 @@ def Respond(request,
   the content isn't already compressed, as indicated by the content_encoding
   parameter.
 
+  Binary content, i.e. content that is neither textual nor already encoded,
+  is sent with `Accept-Ranges: bytes`. A successful request for it with a
+  single byte range in its `Range` header gets a 206 response holding just
+  that range, streamed in chunks, so that clients like `<audio>` elements can
+  seek without downloading everything. An unsatisfiable range gets a 416
+  response.
+
+  Content may also be an iterable of chunks, which is streamed. Its length
+  is then unknown, unless it is binary content whose length is passed as
+  content_length, in which case it is sent as `Content-Length` and ranges
+  are honored as above.
+
   Browser and proxy caching is completely disabled by default. If the expires
   parameter is greater than zero then the response will be able to be cached by
   the browser for that many seconds; however, proxies are still forbidden from
@@ -101,6 +118,8 @@ def Respond(request,
     expires: Second duration for browser caching.
     content_encoding: Encoding if content is already encoded, e.g. 'gzip'.
     encoding: Input charset if content parameter has byte strings.
+    content_length: The number of bytes in streamed binary content, if known.
+      Ignored for other content.
 
   Returns:
     A werkzeug Response object (a WSGI application).
@@ -110,6 +129,10 @@ def Respond(request,
   charset_match = _EXTRACT_CHARSET_PATTERN.search(content_type)
   charset = charset_match.group(1) if charset_match else encoding
   textual = charset_match or mimetype in _TEXTUAL_MIMETYPES
+  if _is_stream(content):
+    return _RespondStreaming(request, content, content_type, code, expires,
+                             content_encoding, encoding, charset, textual,
+                             charset_match, content_length)
   if (mimetype in _JSON_MIMETYPES and
       isinstance(content, (dict, list, set, tuple))):
     content = json.dumps(json_util.Cleanse(content, encoding),
@@ -127,20 +150,169 @@ def Respond(request,
     f.close()
     content = out.getvalue()
     content_encoding = 'gzip'
+  headers = []
+  if code == 200 and not textual and not content_encoding:
+    headers.append(('Accept-Ranges', 'bytes'))
+    length = len(content)
+    try:
+      byte_range = _requested_range(request, length)
+    except _RangeNotSatisfiable:
+      headers.append(('Content-Range', 'bytes */%d' % length))
+      headers.extend(_caching_headers(expires))
+      return wrappers.Response(
+          response='', status=416, headers=headers, content_type=content_type)
+    if byte_range is not None:
+      (start, stop) = byte_range
+      headers.append(('Content-Range',
+                      'bytes %d-%d/%d' % (start, stop - 1, length)))
+      headers.append(('Content-Length', str(stop - start)))
+      headers.extend(_caching_headers(expires))
+      body = [] if request.method == 'HEAD' else _slice_chunks(content, start,
+                                                               stop)
+      return wrappers.Response(
+          response=body, status=206, headers=headers,
+          content_type=content_type, direct_passthrough=True)
   if request.method == 'HEAD':
     content = ''
-  headers = []
 
   headers.append(('Content-Length', str(len(content))))
   if content_encoding:
     headers.append(('Content-Encoding', content_encoding))
-  if expires > 0:
-    e = wsgiref.handlers.format_date_time(time.time() + float(expires))
-    headers.append(('Expires', e))
-    headers.append(('Cache-Control', 'private, max-age=%d' % expires))
-  else:
-    headers.append(('Expires', '0'))
-    headers.append(('Cache-Control', 'no-cache, must-revalidate'))
+  headers.extend(_caching_headers(expires))
 
   return wrappers.Response(
       response=content, status=code, headers=headers, content_type=content_type)
+
+
+def _RespondStreaming(request, chunks, content_type, code, expires,
+                      content_encoding, encoding, charset, textual,
+                      charset_match, content_length):
+  """Constructs a streamed werkzeug Response. See `Respond`."""
+  mimetype = _EXTRACT_MIMETYPE_PATTERN.search(content_type).group(0)
+  if textual and not charset_match and mimetype not in _JSON_MIMETYPES:
+    content_type += '; charset=' + charset
+  body = _coalesce_chunks(chunks, encoding, charset)
+  if (not content_encoding and textual and
+      _ALLOWS_GZIP_PATTERN.search(request.headers.get('Accept-Encoding', ''))):
+    body = _gzip_chunks(body)
+    content_encoding = 'gzip'
+  headers = []
+  if content_length is not None and not textual and not content_encoding:
+    if code == 200:
+      headers.append(('Accept-Ranges', 'bytes'))
+      try:
+        byte_range = _requested_range(request, content_length)
+      except _RangeNotSatisfiable:
+        headers.append(('Content-Range', 'bytes */%d' % content_length))
+        headers.extend(_caching_headers(expires))
+        return wrappers.Response(
+            response='', status=416, headers=headers,
+            content_type=content_type)
+      if byte_range is not None:
+        (start, stop) = byte_range
+        headers.append(('Content-Range', 'bytes %d-%d/%d' %
+                        (start, stop - 1, content_length)))
+        content_length = stop - start
+        code = 206
+        body = _slice_stream(body, start, stop)
+    headers.append(('Content-Length', str(content_length)))
+  if request.method == 'HEAD':
+    body = []
+  if content_encoding:
+    headers.append(('Content-Encoding', content_encoding))
+  headers.extend(_caching_headers(expires))
+  return wrappers.Response(
+      response=body, status=code, headers=headers, content_type=content_type,
+      direct_passthrough=True)
+
+
+def _is_stream(content):
+  return (not isinstance(content, (six.binary_type, six.text_type, dict, list,
+                                   set, tuple)) and
+          hasattr(content, '__iter__'))
+
+
+def _coalesce_chunks(chunks, encoding, charset):
+  """Encodes string chunks as bytes and merges them into larger writes."""
+  pending = []
+  pending_bytes = 0
+  for chunk in chunks:
+    if charset != encoding and isinstance(chunk, six.binary_type):
+      chunk = tf.compat.as_text(chunk, encoding)
+    chunk = tf.compat.as_bytes(chunk, charset)
+    pending.append(chunk)
+    pending_bytes += len(chunk)
+    if pending_bytes >= _STREAM_CHUNK_BYTES:
+      yield b''.join(pending)
+      pending = []
+      pending_bytes = 0
+  if pending:
+    yield b''.join(pending)
+
+
+def _gzip_chunks(chunks):
+  """Gzips a stream of byte chunks incrementally."""
+  compressor = zlib.compressobj(3, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+  for chunk in chunks:
+    compressed = compressor.compress(chunk)
+    if compressed:
+      yield compressed
+  yield compressor.flush()
+
+
+class _RangeNotSatisfiable(Exception):
+  pass
+
+
+def _requested_range(request, length):
+  """Returns the byte range requested for content of the given length.
+
+  Only a single range in bytes is honored. Requests with several ranges, a
+  malformed `Range` header or an `If-Range` precondition get all content.
+
+  Returns:
+    A `(start, stop)` pair, or None to send all content.
+
+  Raises:
+    _RangeNotSatisfiable: If the range lies outside of the content.
+  """
+  if 'If-Range' in request.headers:
+    return None
+  requested = request.range
+  if (requested is None or requested.units != 'bytes' or
+      len(requested.ranges) != 1):
+    return None
+  byte_range = requested.range_for_length(length)
+  if byte_range is None:
+    raise _RangeNotSatisfiable()
+  return byte_range
+
+
+def _slice_chunks(content, start, stop):
+  """Yields `content[start:stop]` in chunks, without copying it whole."""
+  view = memoryview(content)
+  for offset in six.moves.xrange(start, stop, _STREAM_CHUNK_BYTES):
+    yield view[offset:min(stop, offset + _STREAM_CHUNK_BYTES)].tobytes()
+
+
+def _slice_stream(chunks, start, stop):
+  """Yields the bytes from `start` to `stop` of a stream of byte chunks."""
+  offset = 0
+  for chunk in chunks:
+    end = offset + len(chunk)
+    if end > start:
+      yield chunk[max(0, start - offset):stop - offset]
+    if end >= stop:
+      return
+    offset = end
+
+
+def _caching_headers(expires):
+  """Returns the Expires and Cache-Control headers. See `Respond`."""
+  if expires > 0:
+    e = wsgiref.handlers.format_date_time(time.time() + float(expires))
+    return [('Expires', e),
+            ('Cache-Control', 'private, max-age=%d' % expires)]
+  else:
+    return [('Expires', '0'),
+            ('Cache-Control', 'no-cache, must-revalidate')]
@@ -146,6 +146,95 @@ class RespondTest(tf.test.TestCase):
     r = http_util.Respond(q, '<b>hello world</b>', 'text/html', expires=60)
     self.assertEqual(r.headers.get('Cache-Control'), 'private, max-age=60')
 
+  def testGenerator_isStreamed(self):
+    q = wrappers.Request(wtest.EnvironBuilder().get_environ())
+    r = http_util.Respond(q, (s for s in ['[1', ', 2', '爱]']),
+                          'application/json')
+    self.assertIsNone(r.headers.get('Content-Length'))
+    self.assertEqual(b''.join(r.response), '[1, 2, 爱]'.encode('utf-8'))
+
+  def testGenerator_acceptGzip_compressesIncrementally(self):
+    e = wtest.EnvironBuilder(headers={'Accept-Encoding': 'gzip'}).get_environ()
+    q = wrappers.Request(e)
+    chunks = ['line %d\n' % i for i in range(100000)]
+    r = http_util.Respond(q, iter(chunks), 'text/plain')
+    self.assertEqual(r.headers.get('Content-Encoding'), 'gzip')
+    self.assertEqual(r.headers.get('Content-Type'), 'text/plain; charset=utf-8')
+    body = list(r.response)
+    self.assertGreater(len(body), 1)
+    self.assertEqual(_gunzip(b''.join(body)), ''.join(chunks).encode('utf-8'))
+
+  def testGenerator_headRequest_doesNotWrite(self):
+    q = wrappers.Request(wtest.EnvironBuilder(method='HEAD').get_environ())
+    r = http_util.Respond(q, iter(['hello']), 'text/plain')
+    self.assertEqual(b''.join(r.response), b'')
+
+  def testGenerator_withContentLength_sendsIt(self):
+    q = wrappers.Request(wtest.EnvironBuilder().get_environ())
+    r = http_util.Respond(q, iter([b'abc', b'def']), 'application/octet-stream',
+                          content_length=6)
+    self.assertEqual(r.status_code, 200)
+    self.assertEqual(r.headers.get('Content-Length'), '6')
+    self.assertEqual(r.headers.get('Accept-Ranges'), 'bytes')
+    self.assertEqual(b''.join(r.response), b'abcdef')
+
+  def testGenerator_withContentLength_servesRanges(self):
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=2-4'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, iter([b'ab', b'cd', b'ef']),
+                          'application/octet-stream', content_length=6)
+    self.assertEqual(r.status_code, 206)
+    self.assertEqual(r.headers.get('Content-Range'), 'bytes 2-4/6')
+    self.assertEqual(r.headers.get('Content-Length'), '3')
+    self.assertEqual(b''.join(r.response), b'cde')
+
+  def testBinary_acceptsRanges(self):
+    q = wrappers.Request(wtest.EnvironBuilder().get_environ())
+    r = http_util.Respond(q, b'\x00\x01\x02', 'audio/wav')
+    self.assertEqual(r.status_code, 200)
+    self.assertEqual(r.headers.get('Accept-Ranges'), 'bytes')
+    q = wrappers.Request(wtest.EnvironBuilder().get_environ())
+    r = http_util.Respond(q, 'hello', 'text/plain')
+    self.assertIsNone(r.headers.get('Accept-Ranges'))
+
+  def testRange_servesPartialContent(self):
+    content = bytes(bytearray(range(256))) * 1024
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=1000-199999'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, content, 'audio/wav')
+    self.assertEqual(r.status_code, 206)
+    self.assertEqual(r.headers.get('Content-Range'), 'bytes 1000-199999/262144')
+    self.assertEqual(r.headers.get('Content-Length'), '199000')
+    body = list(r.response)
+    self.assertGreater(len(body), 1)
+    self.assertEqual(b''.join(body), content[1000:200000])
+
+  def testRange_suffix(self):
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=-2'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, b'abcdef', 'application/octet-stream')
+    self.assertEqual(r.status_code, 206)
+    self.assertEqual(b''.join(r.response), b'ef')
+
+  def testRange_unsatisfiable(self):
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=10-20'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, b'abcdef', 'application/octet-stream')
+    self.assertEqual(r.status_code, 416)
+    self.assertEqual(r.headers.get('Content-Range'), 'bytes */6')
+
+  def testRange_isIgnoredForTextAndMultipleRanges(self):
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=0-1'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, 'hello', 'text/plain')
+    self.assertEqual(r.status_code, 200)
+    self.assertEqual(r.response, [b'hello'])
+    e = wtest.EnvironBuilder(headers={'Range': 'bytes=0-1,3-4'})
+    q = wrappers.Request(e.get_environ())
+    r = http_util.Respond(q, b'abcdef', 'application/octet-stream')
+    self.assertEqual(r.status_code, 200)
+    self.assertEqual(r.response, [b'abcdef'])
+
 
 def _gunzip(bs):
   return gzip.GzipFile('', 'rb', 9, six.BytesIO(bs)).read()
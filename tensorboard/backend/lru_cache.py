@@ -0,0 +1,97 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A thread-safe least-recently-used cache bounded by the size of its values."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import threading
+
+
+class LRUCache(object):
+  """A thread-safe LRU cache whose values have a total size limit.
+
+  The size of each value is given by `size_fn`, which defaults to `len`, so
+  that a cache of bytestrings is bounded by the number of bytes it holds.
+  When a `put` makes the total exceed `max_size`, the least recently used
+  entries are evicted. A value larger than `max_size` is never stored.
+  """
+
+  def __init__(self, max_size, size_fn=len):
+    """Creates an empty cache.
+
+    Args:
+      max_size: The maximum total size of the cached values.
+      size_fn: A function from a value to its non-negative size.
+
+    Raises:
+      ValueError: If `max_size` is negative.
+    """
+    if max_size < 0:
+      raise ValueError('max_size must be non-negative: %r' % max_size)
+    self._max_size = max_size
+    self._size_fn = size_fn
+    self._entries = collections.OrderedDict()  # key -> (value, size)
+    self._size = 0
+    self._mutex = threading.Lock()
+
+  @property
+  def size(self):
+    """The total size of the cached values."""
+    return self._size
+
+  def __len__(self):
+    return len(self._entries)
+
+  def __contains__(self, key):
+    with self._mutex:
+      return key in self._entries
+
+  def get(self, key, default=None):
+    """Returns the value cached for `key`, or `default` if there is none."""
+    with self._mutex:
+      entry = self._entries.pop(key, None)
+      if entry is None:
+        return default
+      self._entries[key] = entry
+      return entry[0]
+
+  def put(self, key, value):
+    """Caches `value` under `key`, evicting old entries as needed.
+
+    Returns:
+      `value`, so that calls can be chained.
+    """
+    size = self._size_fn(value)
+    with self._mutex:
+      old = self._entries.pop(key, None)
+      if old is not None:
+        self._size -= old[1]
+      if size > self._max_size:
+        return value
+      self._entries[key] = (value, size)
+      self._size += size
+      while self._size > self._max_size:
+        (_, (_, evicted_size)) = self._entries.popitem(last=False)
+        self._size -= evicted_size
+    return value
+
+  def clear(self):
+    """Removes all entries."""
+    with self._mutex:
+      self._entries.clear()
+      self._size = 0
@@ -0,0 +1,80 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for lru_cache."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+
+from tensorboard.backend import lru_cache
+
+
+class LRUCacheTest(tf.test.TestCase):
+
+  def testGetAndPut(self):
+    cache = lru_cache.LRUCache(10)
+    self.assertIsNone(cache.get('a'))
+    self.assertEqual('x', cache.get('a', 'x'))
+    self.assertEqual(b'abc', cache.put('a', b'abc'))
+    self.assertEqual(b'abc', cache.get('a'))
+    self.assertIn('a', cache)
+    self.assertEqual(3, cache.size)
+
+  def testLeastRecentlyUsedIsEvicted(self):
+    cache = lru_cache.LRUCache(10)
+    cache.put('a', b'aaaa')
+    cache.put('b', b'bbbb')
+    cache.get('a')
+    cache.put('c', b'cccc')
+    self.assertEqual(['a', 'c'], sorted(k for k in 'abc' if k in cache))
+    self.assertEqual(8, cache.size)
+
+  def testReplacingAValueUpdatesTheSize(self):
+    cache = lru_cache.LRUCache(10)
+    cache.put('a', b'aaaa')
+    cache.put('a', b'aa')
+    self.assertEqual(2, cache.size)
+    self.assertEqual(1, len(cache))
+
+  def testOversizedValuesAreNotStored(self):
+    cache = lru_cache.LRUCache(3)
+    cache.put('a', b'aa')
+    self.assertEqual(b'toolong', cache.put('a', b'toolong'))
+    self.assertNotIn('a', cache)
+    self.assertEqual(0, cache.size)
+
+  def testCustomSizeFunction(self):
+    cache = lru_cache.LRUCache(2, size_fn=lambda value: 1)
+    for key in 'abc':
+      cache.put(key, object())
+    self.assertEqual(2, len(cache))
+    self.assertNotIn('a', cache)
+
+  def testClear(self):
+    cache = lru_cache.LRUCache(10)
+    cache.put('a', b'a')
+    cache.clear()
+    self.assertEqual(0, len(cache))
+    self.assertEqual(0, cache.size)
+
+  def testNegativeSizeIsRejected(self):
+    with self.assertRaises(ValueError):
+      lru_cache.LRUCache(-1)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,167 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Caches complete HTTP responses until the data they depend on changes."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import hashlib
+import itertools
+
+from werkzeug import http
+from werkzeug import wrappers
+
+from tensorboard.backend import lru_cache
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_Entry = collections.namedtuple('_Entry', ['status', 'headers', 'body', 'etag'])
+
+# Headers sent along with a 304 response, if the cached response had them.
+_NOT_MODIFIED_HEADERS = frozenset(['cache-control', 'expires', 'vary'])
+
+# Mime types, besides text/*, of responses that may be cached.
+_TEXT_MIMETYPES = frozenset(['application/json', 'application/javascript'])
+
+
+class ResponseCache(object):
+  """A byte-bounded LRU cache of the responses of WSGI applications.
+
+  Responses are keyed by the request path, query string and Accept-Encoding
+  header, along with a generation returned by `generation_fn` for the
+  request. The generation must change whenever the data that the response is
+  computed from changes, so that stale entries are never served.
+
+  Every cached response carries an `ETag` derived from its body. A request
+  whose `If-None-Match` header matches gets an empty 304 response.
+
+  Only successful GET requests without a `Range` header, whose responses
+  are textual (e.g. JSON) and at most `max_entry_bytes` long, are cached.
+  Other responses are streamed through as they are produced; binary ones,
+  such as images and audio, are left to the caches of their plugins.
+  """
+
+  def __init__(self, generation_fn, max_bytes=DEFAULT_MAX_BYTES,
+               max_entry_bytes=None):
+    """Creates an empty cache.
+
+    Args:
+      generation_fn: A function of a `werkzeug.wrappers.Request` returning a
+        hashable value that changes whenever a cached response to the
+        request may have become stale.
+      max_bytes: The maximum total size of the cached bodies.
+      max_entry_bytes: The maximum size of a cached body. Defaults to a
+        sixteenth of `max_bytes`. Larger bodies are streamed uncached.
+    """
+    self._generation_fn = generation_fn
+    if max_entry_bytes is None:
+      max_entry_bytes = max_bytes // 16
+    self._max_entry_bytes = max_entry_bytes
+    self._entries = lru_cache.LRUCache(
+        max_bytes, size_fn=lambda entry: len(entry.body))
+
+  def wrap(self, app):
+    """Returns a WSGI application serving `app` through this cache."""
+    def cached_app(environ, start_response):
+      return self._serve(app, environ, start_response)
+    return cached_app
+
+  def _serve(self, app, environ, start_response):
+    request = wrappers.Request(environ)
+    if request.method != 'GET' or 'Range' in request.headers:
+      return app(environ, start_response)
+    key = (request.path, request.query_string,
+           request.headers.get('Accept-Encoding', ''),
+           self._generation_fn(request))
+    entry = self._entries.get(key)
+    if entry is None:
+      (entry, stream) = self._compute(app, environ, start_response)
+      if entry is None:
+        return stream
+      self._entries.put(key, entry)
+    if request.if_none_match.contains(entry.etag):
+      headers = [(name, value) for (name, value) in entry.headers
+                 if name.lower() in _NOT_MODIFIED_HEADERS]
+      headers.append(('ETag', http.quote_etag(entry.etag)))
+      start_response('304 Not Modified', headers)
+      return []
+    start_response(entry.status,
+                   entry.headers + [('ETag', http.quote_etag(entry.etag))])
+    return [entry.body]
+
+  def _compute(self, app, environ, start_response):
+    """Runs `app`, buffering its response if it can be cached.
+
+    Returns:
+      A pair of an `_Entry` for the response and None, if it can be cached.
+      Otherwise, None and the WSGI iterable to return, which streams the
+      response after `start_response` has been called.
+    """
+    captured = {}
+    def capture(status, headers, exc_info=None):
+      del exc_info  # Unused.
+      captured['status'] = status
+      captured['headers'] = list(headers)
+    iterable = app(environ, capture)
+    iterator = iter(iterable)
+    chunks = []
+    size = 0
+    if 'status' not in captured:
+      # The application may only start its response when first iterated.
+      chunks.extend(itertools.islice(iterator, 1))
+    status = captured['status']
+    headers = captured['headers']
+    if _is_cacheable(status, headers):
+      size = sum(len(chunk) for chunk in chunks)
+      for chunk in iterator:
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > self._max_entry_bytes:
+          break
+    if not _is_cacheable(status, headers) or size > self._max_entry_bytes:
+      start_response(status, headers)
+      if not chunks:
+        return (None, iterable)
+      return (None, _stream(chunks, iterator, iterable))
+    if hasattr(iterable, 'close'):
+      iterable.close()
+    body = b''.join(chunks)
+    return (_Entry(status, headers, body, hashlib.sha1(body).hexdigest()),
+            None)
+
+
+def _is_cacheable(status, headers):
+  """Returns whether a response is successful and textual."""
+  if not status.startswith('200 '):
+    return False
+  for (name, value) in headers:
+    if name.lower() == 'content-type':
+      mimetype = value.split(';')[0].strip().lower()
+      return mimetype.startswith('text/') or mimetype in _TEXT_MIMETYPES
+  return False
+
+
+def _stream(chunks, iterator, iterable):
+  """Yields `chunks` and then the rest of `iterator`, closing `iterable`."""
+  try:
+    for chunk in chunks:
+      yield chunk
+    for chunk in iterator:
+      yield chunk
+  finally:
+    if hasattr(iterable, 'close'):
+      iterable.close()
@@ -0,0 +1,129 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for response_cache."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+from werkzeug import test as werkzeug_test
+from werkzeug import wrappers
+
+from tensorboard.backend import http_util
+from tensorboard.backend import response_cache
+
+
+class ResponseCacheTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(ResponseCacheTest, self).setUp()
+    self.generation = 0
+    self.calls = 0
+    self.cache = response_cache.ResponseCache(
+        lambda request: (self.generation, request.args.get('run')),
+        max_bytes=100, max_entry_bytes=50)
+    self.server = werkzeug_test.Client(self.cache.wrap(self._app),
+                                       wrappers.BaseResponse)
+
+  @wrappers.Request.application
+  def _app(self, request):
+    self.calls += 1
+    if request.args.get('missing'):
+      return http_util.Respond(request, 'nope', 'text/plain', code=404)
+    if request.args.get('image'):
+      return http_util.Respond(request, b'\x89PNG', 'image/png')
+    if request.args.get('large'):
+      return wrappers.Response([b'x' * 20] * 3, content_type='text/plain')
+    body = 'gen %d: %s' % (self.generation, request.args.get('x', ''))
+    return http_util.Respond(request, body, 'text/plain')
+
+  def testRepeatedRequestIsServedFromCache(self):
+    first = self.server.get('/data?x=1')
+    second = self.server.get('/data?x=1')
+    self.assertEqual(1, self.calls)
+    self.assertEqual(b'gen 0: 1', second.get_data())
+    self.assertEqual(first.headers.get('ETag'), second.headers.get('ETag'))
+    self.assertEqual('text/plain; charset=utf-8',
+                     second.headers.get('Content-Type'))
+    self.server.get('/data?x=2')
+    self.assertEqual(2, self.calls)
+
+  def testNewGenerationRecomputes(self):
+    self.server.get('/data')
+    self.generation = 1
+    response = self.server.get('/data')
+    self.assertEqual(2, self.calls)
+    self.assertEqual(b'gen 1: ', response.get_data())
+
+  def testMatchingETagGetsNotModified(self):
+    etag = self.server.get('/data').headers.get('ETag')
+    response = self.server.get('/data', headers={'If-None-Match': etag})
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(b'', response.get_data())
+    self.assertEqual(etag, response.headers.get('ETag'))
+    response = self.server.get('/data', headers={'If-None-Match': '"other"'})
+    self.assertEqual(200, response.status_code)
+
+  def testErrorsAreNotCached(self):
+    self.assertEqual(404, self.server.get('/data?missing=1').status_code)
+    response = self.server.get('/data?missing=1')
+    self.assertEqual(404, response.status_code)
+    self.assertIsNone(response.headers.get('ETag'))
+    self.assertEqual(2, self.calls)
+
+  def testGenerationIsComputedForEachRequest(self):
+    self.server.get('/data?run=a')
+    self.server.get('/data?run=a')
+    self.assertEqual(1, self.calls)
+    self.server.get('/data?run=b')
+    self.assertEqual(2, self.calls)
+
+  def testBinaryResponsesAreNotCached(self):
+    self.server.get('/data?image=1')
+    response = self.server.get('/data?image=1')
+    self.assertEqual(b'\x89PNG', response.get_data())
+    self.assertIsNone(response.headers.get('ETag'))
+    self.assertEqual(2, self.calls)
+
+  def testLargeResponsesAreStreamedUncached(self):
+    self.server.get('/data?large=1')
+    response = self.server.get('/data?large=1')
+    self.assertEqual(b'x' * 60, response.get_data())
+    self.assertIsNone(response.headers.get('ETag'))
+    self.assertEqual(2, self.calls)
+
+  def testRangeRequestsAreNotCached(self):
+    self.server.get('/data', headers={'Range': 'bytes=0-3'})
+    self.server.get('/data', headers={'Range': 'bytes=0-3'})
+    self.assertEqual(2, self.calls)
+
+  def testAcceptEncodingIsPartOfKey(self):
+    self.server.get('/data')
+    response = self.server.get('/data', headers={'Accept-Encoding': 'gzip'})
+    self.assertEqual(2, self.calls)
+    self.assertEqual('gzip', response.headers.get('Content-Encoding'))
+
+  def testLeastRecentlyUsedEntriesAreEvicted(self):
+    for i in range(20):
+      self.server.get('/data?x=%d' % i)
+    self.server.get('/data?x=19')
+    self.assertEqual(20, self.calls)
+    self.server.get('/data?x=0')
+    self.assertEqual(21, self.calls)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,98 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for the histogram compressor of the distributions plugin.
+
+Compares `compressor.compress_histogram`, called once per step, with
+`compressor.compress_histograms`, called once for all steps, on 10,000 steps
+of 30-bucket histograms (the default bucket count of the histogram summary
+op). The outputs of both methods are checked to be identical.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+
+from six.moves import xrange  # pylint: disable=redefined-builtin
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard.plugins.distribution import compressor
+
+
+def _histograms(steps, buckets):
+  """Generate `steps` random histograms of `buckets` buckets each."""
+  edges = np.sort(np.random.normal(size=[steps, buckets + 1]), axis=1)
+  counts = np.random.randint(0, 100, size=[steps, buckets]).astype(np.float64)
+  return np.stack([edges[:, :-1], edges[:, 1:], counts], axis=2)
+
+
+def _compress_each(histograms):
+  return np.array([[value for (_, value) in
+                    compressor.compress_histogram(histogram)]
+                   for histogram in histograms])
+
+
+def bench(f, histograms):
+  """Apply `f` to `histograms`, returning the result and elapsed seconds."""
+  start_time = datetime.datetime.now()
+  result = f(histograms)
+  end_time = datetime.datetime.now()
+  return (result, (end_time - start_time).total_seconds())
+
+
+def _format_line(headers, fields):
+  """Format a line of a table. See `encode_png_benchmark._format_line`."""
+  assert len(fields) == len(headers), (fields, headers)
+  fields = ["%2.4f" % field if isinstance(field, float) else str(field)
+            for field in fields]
+  return '  '.join(field + ' ' * max(0, len(header) - len(field))
+                   if i == 0 else
+                   ' ' * max(0, len(header) - len(field)) + field
+                   for (i, (header, field)) in enumerate(zip(headers, fields)))
+
+
+def main(unused_argv):
+  tf.logging.set_verbosity(tf.logging.INFO)
+  np.random.seed(0)
+  (steps, buckets) = (10000, 30)
+  histograms = _histograms(steps, buckets)
+
+  tf.logging.info("Warming up...")
+  _compress_each(histograms[:100])
+  compressor.compress_histograms(histograms[:100])
+
+  tf.logging.info("Running...")
+  headers = ('METHOD', 'STEPS', 'BUCKETS', 'TOTAL_TIME', 'SPEEDUP')
+  tf.logging.info(_format_line(headers, headers))
+  methods = (('single', _compress_each),
+             ('batch', compressor.compress_histograms))
+  results = {}
+  for (name, f) in methods:
+    # best-of-three timing
+    runs = [bench(f, histograms) for _ in xrange(3)]
+    results[name] = (runs[0][0], min(seconds for (_, seconds) in runs))
+    speedup = results['single'][1] / results[name][1]
+    fields = (name, steps, buckets, results[name][1], speedup)
+    tf.logging.info(_format_line(headers, fields))
+
+  if not np.array_equal(results['single'][0], results['batch'][0]):
+    tf.logging.error("Batch and single compression disagree!")
+
+
+if __name__ == '__main__':
+  tf.app.run()
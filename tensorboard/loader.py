@@ -38,6 +38,7 @@ import tensorflow as tf
 
 from tensorboard import db
 from tensorboard import util
+from tensorboard.backend.event_processing import tf_record
 
 
 class Record(collections.namedtuple('Record', ('record', 'offset'))):
@@ -56,7 +57,11 @@ class Record(collections.namedtuple('Record', ('record', 'offset'))):
 @util.closeable
 @six.python_2_unicode_compatible
 class RecordReader(object):
-  """Pythonic veneer around PyRecordReader."""
+  """Pythonic veneer around PyRecordReader.
+
+  Local files are read with the pure Python `tf_record.TFRecordReader`, which
+  avoids one TensorFlow call per record. Other paths go through TensorFlow.
+  """
 
   def __init__(self, path, start_offset=0):
     """Creates new instance.
@@ -73,6 +78,7 @@ class RecordReader(object):
     self._offset = start_offset
     self._size = -1
     self._reader = None  # type: tf.pywrap_tensorflow.PyRecordReader
+    self._native_reader = None  # type: tf_record.TFRecordReader
     self._is_closed = False
     self._lock = threading.Lock()
 
@@ -112,8 +118,21 @@ class RecordReader(object):
     """
     if self._is_closed:
       raise IOError('%s is closed' % self)
-    if self._reader is None:
-      self._reader = self._open()
+    if self._reader is None and self._native_reader is None:
+      if tf_record.is_local_path(self.path):
+        self._native_reader = tf_record.TFRecordReader(
+            self.path, self._offset, verify_crc=True)
+      else:
+        self._reader = self._open()
+    if self._native_reader is not None:
+      try:
+        record = self._native_reader.read_record()
+      except tf_record.DataLossError as e:
+        raise tf.errors.DataLossError(None, None, str(e))
+      if record is None:
+        return None
+      self._offset = self._native_reader.offset()
+      return Record(record, self._offset)
     try:
       with tf.errors.raise_exception_on_not_ok_status() as status:
         self._reader.GetNext(status)
@@ -134,8 +153,11 @@ class RecordReader(object):
       return
     if self._reader is not None:
       self._reader.Close()
+    if self._native_reader is not None:
+      self._native_reader.close()
     self._is_closed = True
     self._reader = None
+    self._native_reader = None
 
   def _open(self):
     with tf.errors.raise_exception_on_not_ok_status() as status:
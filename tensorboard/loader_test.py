@@ -114,6 +114,21 @@ class RecordReaderTest(LoaderTestCase):
       with self.assertRaises(tf.errors.DataLossError):
         self.assertEqual(b'foo', reader.get_next_record())
 
+  def testCorruptRecordData_raisesDataLossError(self):
+    path = self._save_records('foobar.records', ['foo', 'bar'])
+    with open(path, 'r+b') as f:
+      # The data of the second record follows the 19 bytes of the first and
+      # its own 12-byte header.
+      f.seek(31)
+      f.write(b'c')
+    records = []
+    with self.RecordReader(path) as reader:
+      with self.assertRaises(tf.errors.DataLossError):
+        for _ in range(2):
+          records.append(reader.get_next_record().record)
+    # A buffered reader may raise before returning the records it read.
+    self.assertIn(records, ([], [b'foo']))
+
   def testFileShrunk_raisesIoError(self):
     path = self._save_records('foobar.records', ['foo'])
     with self.RecordReader(path) as reader:
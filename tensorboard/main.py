@@ -76,6 +76,24 @@ tf.flags.DEFINE_integer('reload_interval', 5,
                         'How often the backend should load '
                         'more data.')
 
+tf.flags.DEFINE_integer(
+    'max_reload_threads', 1,
+    'The maximum number of runs to reload in parallel on each reload cycle. '
+    'Increasing this can speed up loading logdirs with many runs, especially '
+    'on network filesystems.')
+
+tf.flags.DEFINE_integer(
+    'logdir_quiet_period', 0,
+    'If positive, subdirectories of the logdir that have not changed for this '
+    'many seconds are only scanned for new runs about once a minute. 0 scans '
+    'the whole logdir for new runs on every reload.')
+
+tf.flags.DEFINE_string(
+    'event_index_dir', '',
+    'If set, a directory in which TensorBoard persists an index of the records '
+    'in each local event file, so that restarts only need to parse the '
+    'events that are kept in memory.')
+
 tf.flags.DEFINE_string('db', "", """\
 [Experimental] Sets SQL database URI.
 
@@ -156,7 +174,11 @@ def create_tb_app(plugins, assets_zip_provider=None):
       purge_orphaned_data=FLAGS.purge_orphaned_data,
       reload_interval=FLAGS.reload_interval,
       plugins=plugins,
-      path_prefix=FLAGS.path_prefix)
+      path_prefix=FLAGS.path_prefix,
+      max_reload_threads=FLAGS.max_reload_threads,
+      logdir_quiet_period=FLAGS.logdir_quiet_period or None,
+      event_index_dir=(os.path.expanduser(FLAGS.event_index_dir)
+                       if FLAGS.event_index_dir else None))
 
 
 def make_simple_server(tb_app, host=None, port=None, path_prefix=None):
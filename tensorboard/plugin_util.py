@@ -24,6 +24,8 @@ import bleach
 import markdown
 import six
 
+from tensorboard.backend import lru_cache
+
 
 _ALLOWED_ATTRIBUTES = {
     'a': ['href', 'title'],
@@ -58,6 +60,16 @@ _ALLOWED_TAGS = [
     'th',
 ]
 
+# The maximum total length, in characters, of the Markdown sources and
+# rendered HTML kept by `summary_description_to_safe_html`.
+_DESCRIPTION_CACHE_CHARS = 4 * 1024 * 1024
+
+# Pairs of Markdown source and rendered HTML, keyed by source. Plugins render
+# the same tag descriptions on every request, and often for every run.
+_description_cache = lru_cache.LRUCache(
+    _DESCRIPTION_CACHE_CHARS,
+    size_fn=lambda entry: len(entry[0]) + len(entry[1]))
+
 
 def markdown_to_safe_html(markdown_string):
   """Convert Markdown to HTML that's safe to splice into the DOM.
@@ -78,3 +90,26 @@ def markdown_to_safe_html(markdown_string):
   string_sanitized = bleach.clean(
       string_html, tags=_ALLOWED_TAGS, attributes=_ALLOWED_ATTRIBUTES)
   return string_sanitized
+
+
+def summary_description_to_safe_html(description):
+  """Like `markdown_to_safe_html`, but memoized for summary descriptions.
+
+  Use this for the `summary_description` of tags, which are short and
+  rendered again on every request; other Markdown would only evict them.
+
+  Arguments:
+    description: A Unicode string or UTF-8--encoded bytestring containing
+      Markdown source.
+
+  Returns:
+    A string containing safe HTML.
+  """
+  if isinstance(description, six.binary_type):
+    description = description.decode('utf-8')
+  cached = _description_cache.get(description)
+  if cached is not None:
+    return cached[1]
+  html = markdown_to_safe_html(description)
+  _description_cache.put(description, (description, html))
+  return html
@@ -109,5 +109,32 @@ class MarkdownToSafeHTMLTest(tf.test.TestCase):
                u'<blockquote>\n<p>Look\u2014some UTF-8!</p>\n</blockquote>')
 
 
+class SummaryDescriptionToSafeHTMLTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(SummaryDescriptionToSafeHTMLTest, self).setUp()
+    plugin_util._description_cache.clear()
+
+  def test_renders_like_markdown_to_safe_html(self):
+    s = u'# _Hello_ <blink>world</blink>'.encode('utf-8')
+    self.assertEqual(plugin_util.markdown_to_safe_html(s),
+                     plugin_util.summary_description_to_safe_html(s))
+
+  def test_descriptions_are_rendered_once(self):
+    with tf.test.mock.patch.object(
+        plugin_util, 'markdown_to_safe_html',
+        wraps=plugin_util.markdown_to_safe_html) as render:
+      for _ in range(3):
+        self.assertEqual(
+            u'<p><em>loss</em></p>',
+            plugin_util.summary_description_to_safe_html(u'_loss_'))
+      self.assertEqual(1, render.call_count)
+
+  def test_cache_counts_sources_and_html(self):
+    plugin_util.summary_description_to_safe_html(u'_loss_')
+    self.assertEqual(len(u'_loss_') + len(u'<p><em>loss</em></p>'),
+                     plugin_util._description_cache.size)
+
+
 if __name__ == '__main__':
   tf.test.main()
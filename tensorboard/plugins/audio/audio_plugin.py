@@ -27,6 +27,7 @@ import tensorflow as tf
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
 from tensorboard.plugins import base_plugin
+from tensorboard.plugins import sample_index
 from tensorboard.plugins.audio import metadata
 
 _DEFAULT_MIME_TYPE = 'application/octet-stream'
@@ -39,6 +40,7 @@ class AudioPlugin(base_plugin.TBPlugin):
   """Audio Plugin for TensorBoard."""
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates AudioPlugin via TensorBoard core.
@@ -47,6 +49,9 @@ class AudioPlugin(base_plugin.TBPlugin):
       context: A base_plugin.TBContext instance.
     """
     self._multiplexer = context.multiplexer
+    self._sample_index = sample_index.SampleIndex(
+        self._multiplexer,
+        lambda event: self._number_of_samples(event.tensor_proto))
 
   def get_plugin_apps(self):
     return {
@@ -96,9 +101,10 @@ class AudioPlugin(base_plugin.TBPlugin):
         tensor_events = self._multiplexer.Tensors(run, tag)
         samples = max([self._number_of_samples(event.tensor_proto)
                        for event in tensor_events] + [0])
+        description = plugin_util.summary_description_to_safe_html(
+            summary_metadata.summary_description)
         result[run][tag] = {'displayName': summary_metadata.display_name,
-                            'description': plugin_util.markdown_to_safe_html(
-                                summary_metadata.summary_description),
+                            'description': description,
                             'samples': samples}
 
     return result
@@ -112,10 +118,6 @@ class AudioPlugin(base_plugin.TBPlugin):
     # just to look at their shape.
     return tensor_proto.tensor_shape.dim[0].size
 
-  def _filter_by_sample(self, tensor_events, sample):
-    return [tensor_event for tensor_event in tensor_events
-            if self._number_of_samples(tensor_event.tensor_proto) > sample]
-
   @wrappers.Request.application
   def _serve_audio_metadata(self, request):
     """Given a tag and list of runs, serve a list of metadata for audio.
@@ -135,7 +137,7 @@ class AudioPlugin(base_plugin.TBPlugin):
     run = request.args.get('run')
     sample = int(request.args.get('sample', 0))
 
-    events = self._multiplexer.Tensors(run, tag)
+    events = self._sample_index.Events(run, tag, sample)
     response = self._audio_response_for_run(events, run, tag, sample)
     return http_util.Respond(request, response, 'application/json')
 
@@ -143,7 +145,8 @@ class AudioPlugin(base_plugin.TBPlugin):
     """Builds a JSON-serializable object with information about audio.
 
     Args:
-      tensor_events: A list of image event_accumulator.TensorEvent objects.
+      tensor_events: A list of image event_accumulator.TensorEvent objects,
+        each with at least `sample + 1` audio clips.
       run: The name of the run.
       tag: The name of the tag the audio entries all belong to.
       sample: The zero-indexed sample of the audio sample for which to
@@ -157,10 +160,8 @@ class AudioPlugin(base_plugin.TBPlugin):
       height for each audio entry.
     """
     response = []
-    index = 0
-    filtered_events = self._filter_by_sample(tensor_events, sample)
     content_type = self._get_mime_type(run, tag)
-    for (index, tensor_event) in enumerate(filtered_events):
+    for (index, tensor_event) in enumerate(tensor_events):
       data = tf.make_ndarray(tensor_event.tensor_proto)
       label = data[sample, 1]
       response.append({
@@ -203,13 +204,26 @@ class AudioPlugin(base_plugin.TBPlugin):
 
   @wrappers.Request.application
   def _serve_individual_audio(self, request):
-    """Serve encoded audio data."""
+    """Serve encoded audio data.
+
+    The audio clip is addressed by `index`, as in the queries built by
+    `_query_for_individual_audio`, or by `step` instead.
+    """
     tag = request.args.get('tag')
     run = request.args.get('run')
-    index = int(request.args.get('index'))
     sample = int(request.args.get('sample', 0))
-    events = self._filter_by_sample(self._multiplexer.Tensors(run, tag), sample)
-    data = tf.make_ndarray(events[index].tensor_proto)[sample, 0]
+    index = request.args.get('index', type=int)
+    step = request.args.get('step', type=int)
+    if index is None and step is None:
+      return http_util.Respond(
+          request, 'query parameter `index` or `step` is required',
+          'text/plain', code=400)
+    try:
+      event = self._sample_index.EventAt(run, tag, sample, index=index,
+                                         step=step)
+    except KeyError as e:
+      return http_util.Respond(request, str(e), 'text/plain', code=404)
+    data = tf.make_ndarray(event.tensor_proto)[sample, 0]
     mime_type = self._get_mime_type(run, tag)
     return http_util.Respond(request, data, mime_type)
 
@@ -204,6 +204,30 @@ class AudioPluginTest(tf.test.TestCase):
     self.assertEqual(200, response.status_code)
     self.assertEqual("audio/wav", response.headers.get("content-type"))
 
+  def testIndividualAudioRouteByStep(self):
+    """Tests fetching an individual audio clip by its step."""
+    response = self.server.get(
+        "/data/plugin/audio/individualAudio"
+        "?run=bar&tag=quux/audio_summary&sample=0&step=0")
+    self.assertEqual(200, response.status_code)
+    self.assertEqual("audio/wav", response.headers.get("content-type"))
+    response = self.server.get(
+        "/data/plugin/audio/individualAudio"
+        "?run=bar&tag=quux/audio_summary&sample=0&step=1000")
+    self.assertEqual(404, response.status_code)
+
+  def testIndividualAudioRouteWithRange(self):
+    """Tests that clients can fetch part of an audio clip."""
+    url = ("/data/plugin/audio/individualAudio"
+           "?run=bar&tag=quux/audio_summary&sample=0&index=0")
+    whole = self.server.get(url)
+    self.assertEqual("bytes", whole.headers.get("Accept-Ranges"))
+    response = self.server.get(url, headers={"Range": "bytes=100-199"})
+    self.assertEqual(206, response.status_code)
+    self.assertEqual(whole.get_data()[100:200], response.get_data())
+    self.assertEqual("bytes 100-199/%d" % len(whole.get_data()),
+                     response.headers.get("Content-Range"))
+
   def testTagsRoute(self):
     """Tests that the /tags route offers the correct run to tag mapping."""
     response = self.server.get("/data/plugin/audio/tags")
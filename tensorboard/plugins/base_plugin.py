@@ -38,10 +38,15 @@ class TBPlugin(object):
         will be thrown when the application is constructed. The plugin name must
         only contain characters among [A-Za-z0-9_.-], and must be nonempty,
         or a ValueError will similarly be thrown.
+    cache_responses: Whether the responses of the plugin's routes depend only
+        on the request and on the data in the context's multiplexer. If so,
+        TensorBoard caches them until a run is added, removed or reloaded with
+        new events, and answers conditional requests with 304 Not Modified.
   """
   __metaclass__ = ABCMeta
 
   plugin_name = None
+  cache_responses = False
 
   @abstractmethod
   def get_plugin_apps(self):
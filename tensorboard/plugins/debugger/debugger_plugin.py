@@ -29,10 +29,10 @@ import tensorflow as tf
 from werkzeug import wrappers
 
 from tensorboard.backend import http_util
-from tensorboard.backend.event_processing import event_file_loader
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.debugger import constants
 from tensorboard.plugins.debugger import debugger_server_lib
+from tensorboard.plugins.debugger import step_index
 
 # HTTP routes.
 _HEALTH_PILLS_ROUTE = '/health_pills'
@@ -88,6 +88,11 @@ class DebuggerPlugin(base_plugin.TBPlugin):
     self._logdir = context.logdir
     self._debugger_data_server = None
     self._grpc_port = None
+    # Indexes the debugger events files by step when health pills at a step
+    # are first requested.
+    self._step_index = step_index.StepIndex(
+        self._event_multiplexer.EventIndexDir()
+        if self._event_multiplexer else None)
 
   def listen(self, grpc_port):
     """Start listening on the given gRPC port.
@@ -319,10 +324,10 @@ class DebuggerPlugin(base_plugin.TBPlugin):
   def _obtain_health_pills_at_step(self, events_directory, node_names, step):
     """Reads disk to obtain the health pills for a run at a specific step.
 
-    This could be much slower than the alternative path of just returning all
-    health pills sampled by the event multiplexer. It could take tens of minutes
-    to complete this call for large graphs for big step values (in the
-    thousands).
+    The first call for a run could be much slower than the alternative path of
+    just returning all health pills sampled by the event multiplexer, because
+    it indexes the debugger events files by step. Later calls only read the
+    events at the step, and the events written since.
 
     Args:
       events_directory: The directory containing events for the desired run.
@@ -351,47 +356,33 @@ class DebuggerPlugin(base_plugin.TBPlugin):
     node_name_set = frozenset(node_names)
 
     for file_path in file_paths:
-      should_stop = self._process_health_pill_event(
-          node_name_set, mapping, step, file_path)
-      if should_stop:
+      (events, has_later_steps) = self._step_index.events_at_step(file_path,
+                                                                  step)
+      self._process_health_pill_event(node_name_set, mapping, events)
+      if has_later_steps:
+        # Later files only have events at later steps.
         break
 
     return mapping
 
-  def _process_health_pill_event(self, node_name_set, mapping, target_step,
-                                 file_path):
-    """Creates health pills out of data in an event.
+  def _process_health_pill_event(self, node_name_set, mapping, events):
+    """Creates health pills out of data in events.
 
-    Creates health pills out of the event and adds them to the mapping.
+    Creates health pills out of the events and adds them to the mapping.
 
     Args:
       node_name_set: A set of node names that are relevant.
       mapping: The mapping from node name to HealthPillEvents.
           This object may be destructively modified.
-      target_step: The target step at which to obtain health pills.
-      file_path: The path to the file with health pill events.
-
-    Returns:
-      Whether we should stop reading events because future events are no longer
-      relevant.
+      events: The `tf.Event`s with health pills to process, in file order. All
+          of them are at the step that health pills are requested for.
     """
-    events_loader = event_file_loader.EventFileLoader(file_path)
-    for event in events_loader.Load():
+    for event in events:
       if not event.HasField('summary'):
         tf.logging.warning(
             'An event in a debugger events file lacks a summary.')
         continue
 
-      if event.step < target_step:
-        # This event is not of the relevant step. We perform this check
-        # first because the majority of events will be eliminated from
-        # consideration by this check.
-        continue
-
-      if event.step > target_step:
-        # We have passed the relevant step. No need to read more events.
-        return True
-
       for value in event.summary.value:
         # Obtain the device name from the metadata.
         summary_metadata = value.metadata
@@ -423,7 +414,8 @@ class DebuggerPlugin(base_plugin.TBPlugin):
           tf.logging.warning(
               ('A event with a health pill has an invalid watch, (i.e., an '
                'unexpected debug op): %r'), value.node_name)
-          return None
+          # Skip the other values of this event.
+          break
 
         health_pill = self._process_health_pill_value(
             wall_time=event.wall_time,
@@ -437,9 +429,6 @@ class DebuggerPlugin(base_plugin.TBPlugin):
           continue
         mapping[health_pill.node_name].append(health_pill)
 
-    # Keep reading events.
-    return False
-
   def _process_health_pill_value(self,
                                  wall_time,
                                  step,
@@ -0,0 +1,152 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Locates the events of debugger events files by step."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import event_file_index
+from tensorboard.backend.event_processing import tf_record
+
+
+class StepIndex(object):
+  """Indexes the records of local events files by step.
+
+  Each file is indexed the first time it is queried. Later queries only read
+  the records that were appended since then, unless the file was truncated or
+  replaced, in which case it is indexed again. Events at a step are then read
+  straight from their offsets, and the other events are not parsed.
+
+  If an `index_dir` is given, the indexes are persisted there in the format
+  of `event_file_index.EventFileIndex`, so they survive restarts.
+
+  This class is thread-safe.
+  """
+
+  def __init__(self, index_dir=None):
+    """Creates an empty index.
+
+    Args:
+      index_dir: A directory in which to persist the indexes, or None to keep
+        them in memory only.
+    """
+    self._index_dir = index_dir
+    self._mutex = threading.Lock()
+    # Map from file path to its `_IndexedFile`.
+    self._files = {}
+
+  def events_at_step(self, file_path, step):
+    """Reads the events of a file at a step.
+
+    Args:
+      file_path: The path of a local events file.
+      step: The step to read events for.
+
+    Returns:
+      A pair of the list of `tf.Event`s in the file at `step`, in file order,
+      and whether the file has events at later steps.
+
+    Raises:
+      IOError: If the file could not be read.
+    """
+    with self._mutex:
+      indexed_file = self._update(file_path)
+      offsets = list(indexed_file.offsets_by_step.get(step, ()))
+      has_later_steps = (indexed_file.max_step is not None and
+                         indexed_file.max_step > step)
+    events = []
+    if offsets:
+      records = event_file_index.MappedRecordFile(file_path)
+      try:
+        for offset in offsets:
+          event = tf.Event()
+          event.ParseFromString(records.ReadRecord(offset))
+          events.append(event)
+      finally:
+        records.Close()
+    return (events, has_later_steps)
+
+  def _update(self, file_path):
+    """Indexes the new records of a file and returns its `_IndexedFile`.
+
+    The caller must hold `_mutex`.
+    """
+    indexed_file = self._files.get(file_path)
+    if indexed_file is not None and not indexed_file.index.Matches():
+      tf.logging.info('Indexing %s again, as it changed since it was indexed',
+                      file_path)
+      indexed_file = None
+    if indexed_file is None:
+      indexed_file = _IndexedFile(
+          event_file_index.EventFileIndex(file_path, self._index_dir,
+                                          keep_entries=False))
+      if self._index_dir and indexed_file.index.Restore():
+        for entry in indexed_file.index.entries:
+          indexed_file.add(entry.step, entry.offset)
+        del indexed_file.index.entries[:]
+      self._files[file_path] = indexed_file
+    index = indexed_file.index
+    reader = tf_record.TFRecordReader(file_path, index.end_offset,
+                                      verify_crc=True)
+    try:
+      while True:
+        offset = reader.offset()
+        try:
+          record = reader.read_record()
+        except tf_record.DataLossError as e:
+          tf.logging.warning('Stopped indexing %s: %s', file_path, e)
+          break
+        if record is None:
+          break
+        event = tf.Event()
+        event.ParseFromString(record)
+        index.Add(offset, reader.offset(), event)
+        indexed_file.add(event.step, offset)
+    finally:
+      reader.close()
+    if self._index_dir:
+      try:
+        index.Save()
+      except (IOError, OSError) as e:
+        tf.logging.warning('Unable to save the step index of %s: %s',
+                           file_path, e)
+    return indexed_file
+
+
+class _IndexedFile(object):
+  """The offsets of the records of one events file, by step."""
+
+  def __init__(self, index):
+    """Creates an empty mapping.
+
+    Args:
+      index: The `event_file_index.EventFileIndex` of the file, which records
+        how much of it has been read.
+    """
+    self.index = index
+    # Map from step to the offsets of the records at it, in file order.
+    self.offsets_by_step = {}
+    self.max_step = None
+
+  def add(self, step, offset):
+    """Records that the record at `offset` holds an event at `step`."""
+    self.offsets_by_step.setdefault(step, []).append(offset)
+    if self.max_step is None or step > self.max_step:
+      self.max_step = step
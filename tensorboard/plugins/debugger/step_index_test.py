@@ -0,0 +1,99 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for step_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import struct
+
+import tensorflow as tf
+
+from tensorboard.plugins.debugger import step_index
+
+
+class StepIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(StepIndexTest, self).setUp()
+    self.path = os.path.join(self.get_temp_dir(), 'events.debugger.0')
+
+  def _write(self, steps):
+    with tf.python_io.TFRecordWriter(self.path) as writer:
+      for (i, step) in enumerate(steps):
+        writer.write(tf.Event(step=step, wall_time=i).SerializeToString())
+
+  def _wall_times(self, index, step):
+    (events, has_later_steps) = index.events_at_step(self.path, step)
+    return ([event.wall_time for event in events], has_later_steps)
+
+  def testEventsAtStep(self):
+    self._write([1, 2, 2, 3])
+    index = step_index.StepIndex()
+    self.assertEqual(([1, 2], True), self._wall_times(index, 2))
+    self.assertEqual(([3], False), self._wall_times(index, 3))
+    self.assertEqual(([], False), self._wall_times(index, 4))
+
+  def testNewRecordsAreIndexed(self):
+    self._write([1, 2])
+    index = step_index.StepIndex()
+    self.assertEqual(([], False), self._wall_times(index, 3))
+    self._write([1, 2, 3])
+    self.assertEqual(([2], False), self._wall_times(index, 3))
+
+  def testChangedFilesAreIndexedAgain(self):
+    self._write([1, 2, 2, 3])
+    index = step_index.StepIndex()
+    self.assertEqual(([1, 2], True), self._wall_times(index, 2))
+    # A shorter file.
+    self._write([5])
+    self.assertEqual(([0], False), self._wall_times(index, 5))
+    self.assertEqual(([], True), self._wall_times(index, 2))
+    # A file as long, with other records.
+    self._write([7, 8])
+    self.assertEqual(([1], False), self._wall_times(index, 8))
+
+  def testIndexingStopsAtCorruptedRecord(self):
+    self._write([1, 2, 3])
+    with open(self.path, 'rb') as f:
+      contents = bytearray(f.read())
+    # Flip the last data byte of the second record, leaving its length and
+    # the length's CRC intact.
+    first_size = 12 + struct.unpack_from('<Q', contents)[0] + 4
+    second_length = struct.unpack_from('<Q', contents, first_size)[0]
+    contents[first_size + 12 + second_length - 1] ^= 0xFF
+    with open(self.path, 'wb') as f:
+      f.write(contents)
+    index = step_index.StepIndex()
+    self.assertEqual(([0], False), self._wall_times(index, 1))
+    self.assertEqual(([], False), self._wall_times(index, 3))
+
+  def testIndexIsPersisted(self):
+    self._write([1, 2, 2])
+    index_dir = os.path.join(self.get_temp_dir(), 'index')
+    self.assertEqual(([1, 2], False),
+                     self._wall_times(step_index.StepIndex(index_dir), 2))
+    self.assertTrue(os.listdir(index_dir))
+    restored = step_index.StepIndex(index_dir)
+    with tf.test.mock.patch.object(tf, 'Event', wraps=tf.Event) as event:
+      self.assertEqual(([1, 2], False), self._wall_times(restored, 2))
+      # Only the two events at the step are parsed.
+      self.assertEqual(2, event.call_count)
+
+
+if __name__ == '__main__':
+  tf.test.main()
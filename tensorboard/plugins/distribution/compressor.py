@@ -138,6 +138,56 @@ def compress_histogram(buckets, bps=NORMAL_HISTOGRAM_BPS):
   return result
 
 
+def compress_histograms(buckets, bps=NORMAL_HISTOGRAM_BPS):
+  """Compresses a batch of histograms with the same number of buckets.
+
+  This computes the same values as calling `compress_histogram` on each
+  histogram, but for all histograms and basis points at once.
+
+  Args:
+    buckets: An array-like of shape `[n, k, 3]`, holding `n` histograms of
+      `k` buckets of the form `(min, max, count)`.
+    bps: Compression points represented in basis points, 1/100ths of a percent.
+        Defaults to normal distribution. Must be sorted.
+
+  Returns:
+    A float64 array of shape `[n, len(bps)]` with the value of each histogram
+    at each basis point.
+  """
+  buckets = np.asarray(buckets, dtype=np.float64)
+  (n, k) = buckets.shape[:2]
+  if not k:
+    return np.zeros((n, len(bps)))
+  minmin = buckets[:, :1, 0]
+  maxmax = buckets[:, -1:, 1]
+  right_edges = buckets[:, :, 1]
+  counts = buckets[:, :, 2]
+  totals = counts.sum(axis=1, keepdims=True)
+  totals[totals == 0] = 1.0
+  weights = (counts * bps[-1] / totals).cumsum(axis=1)
+
+  bps_array = np.asarray(bps, dtype=np.float64)
+  # Equivalent to `np.searchsorted(weights[r], bp, side='right')` for each row
+  # `r`, as each row of `weights` is nondecreasing. It follows that
+  # `weights[r, i - 1] <= bp < weights[r, i]`, so the bucket at `i` is never
+  # empty and the search in `compress_histogram` always stops there.
+  i = (weights[:, :, np.newaxis] <= bps_array).sum(axis=1)
+  rows = np.arange(n)[:, np.newaxis]
+  clipped = np.minimum(i, k - 1)
+  cumsum = weights[rows, clipped]
+  cumsum_prev = np.where(i > 0, weights[rows, clipped - 1], 0.0)
+  lhs = np.where((i == 0) | (cumsum_prev == 0), minmin,
+                 np.maximum(right_edges[rows, clipped - 1], minmin))
+  rhs = np.minimum(right_edges[rows, clipped], maxmax)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    values = (lhs + (bps_array - cumsum_prev) * (rhs - lhs) /
+              (cumsum - cumsum_prev))
+  # Once a basis point lies past the last bucket, it and all later ones take
+  # the maximum value.
+  past_end = np.logical_or.accumulate(i >= k, axis=1)
+  return np.where(past_end, maxmax, values)
+
+
 def _lerp(x, x0, x1, y0, y1):
   """Affinely map from [x0, x1] onto [y0, y1]."""
   return y0 + (x - x0) * float(y1 - y0) / (x1 - x0)
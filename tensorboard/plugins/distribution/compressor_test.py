@@ -17,6 +17,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 import tensorflow as tf
 
 from tensorboard.plugins.distribution import compressor
@@ -91,6 +92,36 @@ class CompressorTest(tf.test.TestCase):
     self.assertAlmostEqual(vals[7].value, 0.91697249669848446)
     self.assertAlmostEqual(vals[8].value, 1.7976931348623157e+308)
 
+  def test_batch_matches_single(self):
+    np.random.seed(0)
+    (n, k) = (50, 6)
+    edges = np.sort(np.random.randn(n, k + 1), axis=1)
+    counts = np.random.randint(0, 4, size=(n, k)).astype(np.float64)
+    counts[:5] = 0  # empty histograms
+    counts[5:10, 2] = 0  # empty buckets
+    buckets = np.stack([edges[:, :-1], edges[:, 1:], counts], axis=2)
+    for bps in (compressor.NORMAL_HISTOGRAM_BPS, (0, 2500, 5000, 7500, 10000)):
+      batch = compressor.compress_histograms(buckets, bps)
+      self.assertEqual((n, len(bps)), batch.shape)
+      for i in range(n):
+        expected = [v.value for v in compressor.compress_histogram(buckets[i],
+                                                                   bps)]
+        self.assertEqual(expected, batch[i].tolist())
+
+  def test_batch_ugly(self):
+    bucket_limits = [-1.0, 0.0, 0.917246389039776, 1.0089710279437536,
+                     1.7976931348623157e+308]
+    buckets = list(zip(bucket_limits[:-1], bucket_limits[1:],
+                       [0.0, 896.0, 0.0, 64.0]))
+    expected = [v.value for v in compressor.compress_histogram(buckets)]
+    self.assertEqual(expected,
+                     compressor.compress_histograms([buckets])[0].tolist())
+
+  def test_batch_without_buckets(self):
+    self.assertAllEqual(
+        np.zeros((3, len(compressor.NORMAL_HISTOGRAM_BPS))),
+        compressor.compress_histograms(np.zeros((3, 0, 3))))
+
 
 if __name__ == '__main__':
   tf.test.main()
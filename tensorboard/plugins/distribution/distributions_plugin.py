@@ -40,6 +40,7 @@ class DistributionsPlugin(base_plugin.TBPlugin):
   """
 
   plugin_name = 'distributions'
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates DistributionsPlugin via TensorBoard core.
@@ -65,16 +66,21 @@ class DistributionsPlugin(base_plugin.TBPlugin):
     return self._histograms_plugin.is_active()
 
   def distributions_impl(self, tag, run):
-    """Result of the form `(body, mime_type)`, or `ValueError`."""
-    (histograms, mime_type) = self._histograms_plugin.histograms_impl(
-        tag, run, downsample_to=None)
-    return ([self._compress(histogram) for histogram in histograms],
-            mime_type)
-
-  def _compress(self, histogram):
-    (wall_time, step, buckets) = histogram
-    converted_buckets = compressor.compress_histogram(buckets)
-    return [wall_time, step, converted_buckets]
+    """Result of the form `(body, mime_type)`, or `ValueError`.
+
+    Each distribution is computed the first time it is read and is then
+    memoized, so this mostly only formats them.
+    """
+    try:
+      series = self._multiplexer.Distributions(run, tag)
+    except KeyError:
+      raise ValueError('No histogram tag %r for run %r' % (tag, run))
+    bps = compressor.NORMAL_HISTOGRAM_BPS
+    body = [[wall_time, step, [[bp, value] for (bp, value) in zip(bps, row)]]
+            for (wall_time, step, row) in zip(series.wall_times.tolist(),
+                                              series.steps.tolist(),
+                                              series.values.tolist())]
+    return (body, 'application/json')
 
   def index_impl(self):
     return self._histograms_plugin.index_impl()
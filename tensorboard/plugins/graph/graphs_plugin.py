@@ -18,20 +18,39 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import tensorflow as tf
 from werkzeug import wrappers
 
 from tensorboard.backend import http_util
+from tensorboard.backend import lru_cache
 from tensorboard.backend import process_graph
 from tensorboard.backend.event_processing import plugin_event_accumulator as event_accumulator  # pylint: disable=line-too-long
 from tensorboard.plugins import base_plugin
 
 _PLUGIN_PREFIX_ROUTE = 'graphs'
 
+# The maximum total size of the graphs kept in memory, counting both the
+# serialized graph and the encoded body of each cache entry.
+_GRAPH_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class OutputFormat(object):
+  """An enum used to list the valid output formats for graphs."""
+  PBTXT = 'pbtxt'
+  PROTOBUF = 'pb'
+
+
+_MIME_TYPES = {
+    OutputFormat.PBTXT: 'text/x-protobuf',
+    OutputFormat.PROTOBUF: 'application/x-protobuf',
+}
+
 
 class GraphsPlugin(base_plugin.TBPlugin):
   """Graphs Plugin for TensorBoard."""
 
   plugin_name = _PLUGIN_PREFIX_ROUTE
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates GraphsPlugin via TensorBoard core.
@@ -40,6 +59,13 @@ class GraphsPlugin(base_plugin.TBPlugin):
       context: A base_plugin.TBContext instance.
     """
     self._multiplexer = context.multiplexer
+    # Map from (run, limit_attr_size, large_attrs_key, output_format) to a
+    # (serialized graph, encoded body) pair. The serialized graph identifies
+    # the graph the body was computed from; since the entry keeps it alive
+    # even after the run's graph is replaced, it counts towards the size.
+    self._graph_cache = lru_cache.LRUCache(
+        _GRAPH_CACHE_BYTES,
+        size_fn=lambda value: len(value[0]) + len(value[1]))
 
   def get_plugin_apps(self):
     return {
@@ -67,16 +93,34 @@ class GraphsPlugin(base_plugin.TBPlugin):
         if event_accumulator.RUN_METADATA in run_data
     }
 
-  def graph_impl(self, run, limit_attr_size=None, large_attrs_key=None):
-    """Result of the form `(body, mime_type)`, or `None` if no graph exists."""
+  def graph_impl(self, run, limit_attr_size=None, large_attrs_key=None,
+                 output_format=OutputFormat.PBTXT):
+    """Result of the form `(body, mime_type)`, or `None` if no graph exists.
+
+    The body is the prepared graph as pbtxt, or as a serialized `GraphDef`
+    if `output_format` is `OutputFormat.PROTOBUF`. Bodies are cached until a
+    new graph is loaded for the run.
+    """
+    if output_format not in _MIME_TYPES:
+      raise ValueError('Invalid output format: %r' % output_format)
     try:
-      graph = self._multiplexer.Graph(run)
-    except ValueError:
+      serialized_graph = self._multiplexer.SerializedGraph(run)
+    except (KeyError, ValueError):
       return None
+    key = (run, limit_attr_size, large_attrs_key, output_format)
+    cached = self._graph_cache.get(key)
+    if cached is not None and cached[0] is serialized_graph:
+      return (cached[1], _MIME_TYPES[output_format])
+    graph = tf.GraphDef.FromString(serialized_graph)
     # This next line might raise a ValueError if the limit parameters
     # are invalid (size is negative, size present but key absent, etc.).
     process_graph.prepare_graph_for_ui(graph, limit_attr_size, large_attrs_key)
-    return (str(graph), 'text/x-protobuf')  # pbtxt
+    if output_format == OutputFormat.PROTOBUF:
+      body = graph.SerializeToString()
+    else:
+      body = str(graph)  # pbtxt
+    self._graph_cache.put(key, (serialized_graph, body))
+    return (body, _MIME_TYPES[output_format])
 
   def run_metadata_impl(self, run, tag):
     """Result of the form `(body, mime_type)`, or `None` if no data exists."""
@@ -114,11 +158,13 @@ class GraphsPlugin(base_plugin.TBPlugin):
             'text/plain', 400)
 
     large_attrs_key = request.args.get('large_attrs_key', None)
+    output_format = request.args.get('format', OutputFormat.PBTXT)
 
     try:
-      result = self.graph_impl(run, limit_attr_size, large_attrs_key)
+      result = self.graph_impl(run, limit_attr_size, large_attrs_key,
+                               output_format)
     except ValueError as e:
-      return http_util.Respond(request, e.message, 'text/plain', code=400)
+      return http_util.Respond(request, str(e), 'text/plain', code=400)
     else:
       if result is not None:
         (body, mime_type) = result  # pylint: disable=unpacking-non-sequence
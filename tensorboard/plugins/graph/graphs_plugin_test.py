@@ -134,6 +134,32 @@ class GraphsPluginTest(tf.test.TestCase):
     self.assertEqual({'message_prefix': [b'value']},
                      large_attrs)
 
+  def test_graph_protobuf(self):
+    self.set_up_with_runs()
+    (graph_pb, mime_type) = self.plugin.graph_impl(
+        self._RUN_WITH_GRAPH, output_format=graphs_plugin.OutputFormat.PROTOBUF)
+    self.assertEqual('application/x-protobuf', mime_type)
+    (graph_pbtxt, _) = self.plugin.graph_impl(self._RUN_WITH_GRAPH)
+    self.assertProtoEquals(text_format.Parse(graph_pbtxt, tf.GraphDef()),
+                           tf.GraphDef.FromString(graph_pb))
+
+  def test_graph_is_cached(self):
+    self.set_up_with_runs()
+    (first, _) = self.plugin.graph_impl(self._RUN_WITH_GRAPH)
+    (second, _) = self.plugin.graph_impl(self._RUN_WITH_GRAPH)
+    self.assertIs(first, second)
+    serialized_graph = self.plugin._multiplexer.SerializedGraph(
+        self._RUN_WITH_GRAPH)
+    self.assertEqual(len(serialized_graph) + len(first),
+                     self.plugin._graph_cache.size)
+    with self.assertRaises(ValueError):
+      self.plugin.graph_impl(self._RUN_WITH_GRAPH, output_format='svg')
+
+  def test_graph_of_missing_run(self):
+    self.set_up_with_runs()
+    self.assertIsNone(self.plugin.graph_impl(self._RUN_WITHOUT_GRAPH))
+    self.assertIsNone(self.plugin.graph_impl('nonexistent'))
+
   def test_run_metadata(self):
     self.set_up_with_runs()
     (metadata_pbtxt, mime_type) = self.plugin.run_metadata_impl(
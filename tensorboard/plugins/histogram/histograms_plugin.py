@@ -23,10 +23,9 @@ from __future__ import division
 from __future__ import print_function
 
 import random
-import six
-from werkzeug import wrappers
 
-import tensorflow as tf
+import numpy as np
+from werkzeug import wrappers
 
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
@@ -34,6 +33,12 @@ from tensorboard.plugins import base_plugin
 from tensorboard.plugins.histogram import metadata
 
 
+class DownsampleMethod(object):
+  """An enum of the ways to choose which histograms to return."""
+  RANDOM = 'random'
+  STRIDE = 'stride'
+
+
 class HistogramsPlugin(base_plugin.TBPlugin):
   """Histograms Plugin for TensorBoard.
 
@@ -44,6 +49,7 @@ class HistogramsPlugin(base_plugin.TBPlugin):
   """
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates HistogramsPlugin via TensorBoard core.
@@ -61,40 +67,42 @@ class HistogramsPlugin(base_plugin.TBPlugin):
 
   def is_active(self):
     """This plugin is active iff any run has at least one histograms tag."""
-    return bool(self._multiplexer) and any(self.index_impl().values())
+    if not self._multiplexer:
+      return False
+    return bool(self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME))
 
   def index_impl(self):
     """Return {runName: {tagName: {displayName: ..., description: ...}}}."""
-    runs = self._multiplexer.Runs()
-    result = {run: {} for run in runs}
+    return self._multiplexer.PluginRunToTagToRendered(metadata.PLUGIN_NAME,
+                                                       _tag_listing_entry)
 
-    mapping = self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME)
-    for (run, tag_to_content) in six.iteritems(mapping):
-      for (tag, content) in six.iteritems(tag_to_content):
-        content = metadata.parse_plugin_metadata(content)
-        summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
-        result[run][tag] = {'displayName': summary_metadata.display_name,
-                            'description': plugin_util.markdown_to_safe_html(
-                                summary_metadata.summary_description)}
-
-    return result
-
-  def histograms_impl(self, tag, run, downsample_to=50):
+  def histograms_impl(self, tag, run, downsample_to=50,
+                      method=DownsampleMethod.RANDOM, seed=0):
     """Result of the form `(body, mime_type)`, or `ValueError`.
 
     At most `downsample_to` events will be returned. If this value is
-    `None`, then no downsampling will be performed.
+    `None`, then no downsampling will be performed. The events to return are
+    chosen from their steps alone, so only those histograms are decoded.
+
+    Args:
+      tag: The name of the tag.
+      run: The name of the run.
+      downsample_to: The maximum number of events to return, or `None`.
+      method: A `DownsampleMethod`. `RANDOM` picks a random sample, seeded
+        with `seed`; `STRIDE` picks evenly spaced events, including the first
+        and the last.
+      seed: The seed used by `DownsampleMethod.RANDOM`.
     """
+    def select(steps):
+      return _downsample_indices(len(steps), downsample_to, method, seed)
     try:
-      tensor_events = self._multiplexer.Tensors(run, tag)
+      series = self._multiplexer.Histograms(run, tag, select)
     except KeyError:
       raise ValueError('No histogram tag %r for run %r' % (tag, run))
-    events = [[ev.wall_time, ev.step, tf.make_ndarray(ev.tensor_proto).tolist()]
-              for ev in tensor_events]
-    if downsample_to is not None and len(events) > downsample_to:
-      indices = sorted(random.Random(0).sample(list(range(len(events))),
-                                               downsample_to))
-      events = [events[i] for i in indices]
+    events = [[wall_time, step, buckets.tolist()]
+              for (wall_time, step, buckets) in zip(series.wall_times.tolist(),
+                                                    series.steps.tolist(),
+                                                    series.buckets)]
     return (events, 'application/json')
 
   @wrappers.Request.application
@@ -107,10 +115,44 @@ class HistogramsPlugin(base_plugin.TBPlugin):
     """Given a tag and single run, return array of histogram values."""
     tag = request.args.get('tag')
     run = request.args.get('run')
+    method = request.args.get('method', DownsampleMethod.RANDOM)
+    try:
+      downsample_to = int(request.args.get('max_points', 50))
+      seed = int(request.args.get('seed', 0))
+    except ValueError:
+      return http_util.Respond(
+          request, 'query parameters `max_points` and `seed` must be integers',
+          'text/plain', code=400)
     try:
-      (body, mime_type) = self.histograms_impl(tag, run)
+      (body, mime_type) = self.histograms_impl(
+          tag, run, downsample_to=downsample_to, method=method, seed=seed)
       code = 200
     except ValueError as e:
       (body, mime_type) = (str(e), 'text/plain')
       code = 400
     return http_util.Respond(request, body, mime_type, code=code)
+
+
+def _downsample_indices(n, downsample_to, method, seed):
+  """Returns the sorted indices of the events to keep out of `n`.
+
+  Raises:
+    ValueError: If `downsample_to` is not positive or `method` is unknown.
+  """
+  if method not in (DownsampleMethod.RANDOM, DownsampleMethod.STRIDE):
+    raise ValueError('Unknown downsampling method: %r' % method)
+  if downsample_to is not None and downsample_to < 1:
+    raise ValueError('Must keep a positive number of histograms, got %r'
+                     % downsample_to)
+  if downsample_to is None or n <= downsample_to:
+    return list(range(n))
+  if method == DownsampleMethod.RANDOM:
+    return sorted(random.Random(seed).sample(list(range(n)), downsample_to))
+  return np.round(np.linspace(0, n - 1, downsample_to)).astype(int).tolist()
+
+
+def _tag_listing_entry(summary_metadata):
+  """Returns the display name and description of a tag, for `/tags`."""
+  return {'displayName': summary_metadata.display_name,
+          'description': plugin_util.summary_description_to_safe_html(
+              summary_metadata.summary_description)}
@@ -25,6 +25,8 @@ import os.path
 import six
 from six.moves import xrange  # pylint: disable=redefined-builtin
 import tensorflow as tf
+from werkzeug import test as werkzeug_test
+from werkzeug import wrappers
 
 from tensorboard.backend.event_processing import plugin_event_accumulator as event_accumulator  # pylint: disable=line-too-long
 from tensorboard.backend.event_processing import plugin_event_multiplexer as event_multiplexer  # pylint: disable=line-too-long
@@ -171,6 +173,34 @@ class HistogramsPluginTest(tf.test.TestCase):
     self._test_histograms(self._RUN_WITH_HISTOGRAM,
                           '%s/histogram_summary' % self._HISTOGRAM_TAG)
 
+  def test_histograms_with_stride(self):
+    self.set_up_with_runs([self._RUN_WITH_HISTOGRAM])
+    (data, _) = self.plugin.histograms_impl(
+        '%s/histogram_summary' % self._HISTOGRAM_TAG, self._RUN_WITH_HISTOGRAM,
+        downsample_to=3, method=histograms_plugin.DownsampleMethod.STRIDE)
+    self.assertEqual([0, 49, 98], [step for (_, step, _) in data])
+
+  def test_histograms_with_random_seed(self):
+    self.set_up_with_runs([self._RUN_WITH_HISTOGRAM])
+    tag = '%s/histogram_summary' % self._HISTOGRAM_TAG
+
+    def steps(seed):
+      (data, _) = self.plugin.histograms_impl(
+          tag, self._RUN_WITH_HISTOGRAM, downsample_to=10, seed=seed)
+      return [step for (_, step, _) in data]
+
+    self.assertEqual(steps(0), steps(0))
+    self.assertNotEqual(steps(0), steps(1))
+
+  def test_histograms_route_with_bad_method(self):
+    self.set_up_with_runs([self._RUN_WITH_HISTOGRAM])
+    server = werkzeug_test.Client(self.plugin.histograms_route,
+                                  wrappers.BaseResponse)
+    response = server.get(
+        '/histograms?run=%s&tag=%s/histogram_summary&method=cubic' %
+        (self._RUN_WITH_HISTOGRAM, self._HISTOGRAM_TAG))
+    self.assertEqual(400, response.status_code)
+
   def test_active_with_legacy_histogram(self):
     self.set_up_with_runs([self._RUN_WITH_LEGACY_HISTOGRAM])
     self.assertTrue(self.plugin.is_active())
@@ -26,8 +26,11 @@ from werkzeug import wrappers
 
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
+from tensorboard.backend import lru_cache
 from tensorboard.plugins import base_plugin
+from tensorboard.plugins import sample_index
 from tensorboard.plugins.image import metadata
+from tensorboard.plugins.image import thumbnails
 
 _IMGHDR_TO_MIMETYPE = {
     'bmp': 'image/bmp',
@@ -38,11 +41,18 @@ _IMGHDR_TO_MIMETYPE = {
 
 _DEFAULT_IMAGE_MIMETYPE = 'application/octet-stream'
 
+# Image types that can be downscaled by `thumbnails.thumbnail`.
+_THUMBNAIL_IMAGE_TYPES = frozenset(['bmp', 'jpeg', 'png'])
+
+# The maximum total size of the downscaled images kept in memory.
+_THUMBNAIL_CACHE_BYTES = 32 * 1024 * 1024
+
 
 class ImagesPlugin(base_plugin.TBPlugin):
   """Images Plugin for TensorBoard."""
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates ImagesPlugin via TensorBoard core.
@@ -51,6 +61,9 @@ class ImagesPlugin(base_plugin.TBPlugin):
       context: A base_plugin.TBContext instance.
     """
     self._multiplexer = context.multiplexer
+    self._sample_index = sample_index.SampleIndex(self._multiplexer,
+                                                  _number_of_samples)
+    self._thumbnails = lru_cache.LRUCache(_THUMBNAIL_CACHE_BYTES)
 
   def get_plugin_apps(self):
     return {
@@ -76,9 +89,10 @@ class ImagesPlugin(base_plugin.TBPlugin):
         tensor_events = self._multiplexer.Tensors(run, tag)
         samples = max([len(event.tensor_proto.string_val[2:])  # width, height
                        for event in tensor_events] + [0])
+        description = plugin_util.summary_description_to_safe_html(
+            summary_metadata.summary_description)
         result[run][tag] = {'displayName': summary_metadata.display_name,
-                            'description': plugin_util.markdown_to_safe_html(
-                                summary_metadata.summary_description),
+                            'description': description,
                             'samples': samples}
 
     return result
@@ -102,7 +116,7 @@ class ImagesPlugin(base_plugin.TBPlugin):
     run = request.args.get('run')
     sample = int(request.args.get('sample', 0))
 
-    images = self._multiplexer.Tensors(run, tag)
+    images = self._sample_index.Events(run, tag, sample)
     response = self._image_response_for_run(images, run, tag, sample)
     return http_util.Respond(request, response, 'application/json')
 
@@ -110,7 +124,8 @@ class ImagesPlugin(base_plugin.TBPlugin):
     """Builds a JSON-serializable object with information about images.
 
     Args:
-      tensor_events: A list of image event_accumulator.TensorEvent objects.
+      tensor_events: A list of image event_accumulator.TensorEvent objects,
+        each with at least `sample + 1` images.
       run: The name of the run.
       tag: The name of the tag the images all belong to.
       sample: The zero-indexed sample of the image for which to retrieve
@@ -123,9 +138,7 @@ class ImagesPlugin(base_plugin.TBPlugin):
       height for each image.
     """
     response = []
-    index = 0
-    filtered_events = self._filter_by_sample(tensor_events, sample)
-    for (index, tensor_event) in enumerate(filtered_events):
+    for (index, tensor_event) in enumerate(tensor_events):
       (width, height) = tensor_event.tensor_proto.string_val[:2]
       response.append({
           'wall_time': tensor_event.wall_time,
@@ -138,11 +151,6 @@ class ImagesPlugin(base_plugin.TBPlugin):
       })
     return response
 
-  def _filter_by_sample(self, tensor_events, sample):
-    return [tensor_event for tensor_event in tensor_events
-            if (len(tensor_event.tensor_proto.string_val) - 2  # width, height
-                > sample)]
-
   def _query_for_individual_image(self, run, tag, sample, index):
     """Builds a URL for accessing the specified image.
 
@@ -171,19 +179,66 @@ class ImagesPlugin(base_plugin.TBPlugin):
 
   @wrappers.Request.application
   def _serve_individual_image(self, request):
-    """Serves an individual image."""
+    """Serves an individual image.
+
+    The image is addressed by `index`, as in the queries built by
+    `_query_for_individual_image`, or by `step` instead. If `width` or
+    `height` is given, the image is shrunk to fit within them and served as
+    a PNG.
+    """
     tag = request.args.get('tag')
     run = request.args.get('run')
-    index = int(request.args.get('index'))
     sample = int(request.args.get('sample', 0))
-    events = self._filter_by_sample(self._multiplexer.Tensors(run, tag), sample)
-    images = events[index].tensor_proto.string_val[2:]  # skip width, height
+    index = request.args.get('index', type=int)
+    step = request.args.get('step', type=int)
+    if index is None and step is None:
+      return http_util.Respond(
+          request, 'query parameter `index` or `step` is required',
+          'text/plain', code=400)
+    max_width = request.args.get('width', type=int)
+    max_height = request.args.get('height', type=int)
+    if any(size is not None and size <= 0 for size in (max_width, max_height)):
+      return http_util.Respond(
+          request, 'query parameters `width` and `height` must be positive '
+          'integers', 'text/plain', code=400)
+    try:
+      event = self._sample_index.EventAt(run, tag, sample, index=index,
+                                         step=step)
+    except KeyError as e:
+      return http_util.Respond(request, str(e), 'text/plain', code=404)
+    images = event.tensor_proto.string_val[2:]  # skip width, height
     data = images[sample]
     image_type = imghdr.what(None, data)
+    if ((max_width is not None or max_height is not None) and
+        image_type in _THUMBNAIL_IMAGE_TYPES):
+      (width, height) = event.tensor_proto.string_val[:2]
+      size = thumbnails.thumbnail_size(int(width), int(height),
+                                       max_width, max_height)
+      if size != (int(width), int(height)):
+        data = self._thumbnail(run, tag, sample, event, data, size)
+        image_type = 'png'
     content_type = _IMGHDR_TO_MIMETYPE.get(image_type, _DEFAULT_IMAGE_MIMETYPE)
     return http_util.Respond(request, data, content_type)
 
+  def _thumbnail(self, run, tag, sample, event, data, size):
+    """Returns the PNG-encoded `data` downscaled to `size`, using a cache.
+
+    Thumbnails are keyed by the identity of the event rather than by the
+    generation of the run, so they outlive reloads that add new events.
+    """
+    key = (run, tag, sample, event.wall_time, event.step, size)
+    thumbnail = self._thumbnails.get(key)
+    if thumbnail is None:
+      (width, height) = size
+      thumbnail = self._thumbnails.put(
+          key, thumbnails.thumbnail(data, width, height))
+    return thumbnail
+
   @wrappers.Request.application
   def _serve_tags(self, request):
     index = self._index_impl()
     return http_util.Respond(request, index, 'application/json')
+
+
+def _number_of_samples(tensor_event):
+  return len(tensor_event.tensor_proto.string_val) - 2  # width, height
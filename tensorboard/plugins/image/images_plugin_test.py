@@ -193,6 +193,49 @@ class ImagesPluginTest(tf.test.TestCase):
     self.assertEqual(200, response.status_code)
     self.assertEqual("image/png", response.headers.get("content-type"))
 
+  def testIndividualImageRouteByStep(self):
+    """Tests fetching an individual image by its step."""
+    by_index = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&index=1")
+    by_step = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&step=1")
+    self.assertEqual(200, by_step.status_code)
+    self.assertEqual(by_index.get_data(), by_step.get_data())
+
+  def testIndividualImageRouteWithMissingStep(self):
+    response = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&step=5")
+    self.assertEqual(404, response.status_code)
+
+  def testIndividualImageRouteWithThumbnailSize(self):
+    """Tests that images are shrunk to fit within `width` and `height`."""
+    response = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&index=0&width=4")
+    self.assertEqual(200, response.status_code)
+    self.assertEqual("image/png", response.headers.get("content-type"))
+    with tf.Session():
+      image = tf.image.decode_png(response.get_data()).eval()
+    self.assertEqual((3, 4, 3), image.shape)
+
+  def testIndividualImageRouteDoesNotEnlarge(self):
+    original = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&index=0")
+    response = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&index=0&width=80&height=60")
+    self.assertEqual(original.get_data(), response.get_data())
+
+  def testIndividualImageRouteWithBadThumbnailSize(self):
+    response = self.server.get(
+        "/data/plugin/images/individualImage"
+        "?run=bar&tag=quux/image_summary&sample=0&index=0&width=0")
+    self.assertEqual(400, response.status_code)
+
   def testRunsRoute(self):
     """Tests that the /runs route offers the correct run to tag mapping."""
     response = self.server.get("/data/plugin/images/tags")
@@ -0,0 +1,91 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Downscaling of encoded images for the images plugin."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+
+from tensorboard import util
+
+
+def thumbnail_size(width, height, max_width=None, max_height=None):
+  """Computes the size of an image shrunk to fit within a bounding box.
+
+  The aspect ratio is preserved, and images are never enlarged.
+
+  Args:
+    width: The width of the image, in pixels.
+    height: The height of the image, in pixels.
+    max_width: The maximum width of the result, or None for no limit.
+    max_height: The maximum height of the result, or None for no limit.
+
+  Returns:
+    A `(width, height)` pair of positive ints.
+  """
+  scale = 1.0
+  if max_width is not None and width > max_width:
+    scale = min(scale, max_width / width)
+  if max_height is not None and height > max_height:
+    scale = min(scale, max_height / height)
+  return (max(1, int(round(width * scale))),
+          max(1, int(round(height * scale))))
+
+
+class _TensorFlowThumbnailer(util.PersistentOpEvaluator):
+  """Downscale an encoded image and re-encode it as PNG.
+
+  Images are resampled by area averaging, which avoids the aliasing of
+  nearest-neighbor and bilinear sampling when shrinking by large factors.
+  Animated GIFs are not supported.
+
+  Arguments:
+    data: A bytestring holding a PNG, JPEG or BMP image.
+    width: The width of the result, in pixels.
+    height: The height of the result, in pixels.
+
+  Returns:
+    A bytestring with PNG-encoded data.
+  """
+
+  def __init__(self):
+    super(_TensorFlowThumbnailer, self).__init__()
+    self._data_placeholder = None
+    self._size_placeholder = None
+    self._thumbnail_op = None
+
+  def initialize_graph(self):
+    self._data_placeholder = tf.placeholder(
+        dtype=tf.string, name='image_to_thumbnail')
+    self._size_placeholder = tf.placeholder(
+        dtype=tf.int32, shape=[2], name='thumbnail_size')
+    image = tf.image.decode_image(self._data_placeholder)
+    image.set_shape([None, None, None])
+    resized = tf.image.resize_area(tf.expand_dims(image, 0),
+                                   self._size_placeholder)
+    self._thumbnail_op = tf.image.encode_png(
+        tf.saturate_cast(tf.round(resized[0]), tf.uint8))
+
+  def run(self, data, width, height):  # pylint: disable=arguments-differ
+    feed_dict = {
+        self._data_placeholder: data,
+        self._size_placeholder: [height, width],
+    }
+    return self._thumbnail_op.eval(feed_dict=feed_dict)
+
+
+thumbnail = _TensorFlowThumbnailer()
@@ -0,0 +1,67 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for thumbnails."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard import util
+from tensorboard.plugins.image import thumbnails
+
+
+class ThumbnailSizeTest(tf.test.TestCase):
+
+  def testFitsWithinBox(self):
+    self.assertEqual((100, 50), thumbnails.thumbnail_size(400, 200, 100, 100))
+    self.assertEqual((50, 100), thumbnails.thumbnail_size(200, 400, 100, 100))
+
+  def testSingleBound(self):
+    self.assertEqual((100, 50), thumbnails.thumbnail_size(400, 200, 100))
+    self.assertEqual((200, 100),
+                     thumbnails.thumbnail_size(400, 200, max_height=100))
+
+  def testNeverEnlarges(self):
+    self.assertEqual((40, 20), thumbnails.thumbnail_size(40, 20, 100, 100))
+    self.assertEqual((40, 20), thumbnails.thumbnail_size(40, 20))
+
+  def testNeverCollapses(self):
+    self.assertEqual((1, 1), thumbnails.thumbnail_size(1000, 1, 10))
+
+
+class ThumbnailTest(tf.test.TestCase):
+
+  def testDownscalesByAreaAveraging(self):
+    image = np.zeros([4, 4, 1], dtype=np.uint8)
+    image[:2, :2] = 200
+    data = thumbnails.thumbnail(util.encode_png(image), width=2, height=2)
+    with tf.Session():
+      result = tf.image.decode_png(data).eval()
+    self.assertAllEqual([[[200], [0]], [[0], [0]]], result)
+
+  def testKeepsChannels(self):
+    image = np.full([8, 6, 4], 17, dtype=np.uint8)
+    data = thumbnails.thumbnail(util.encode_png(image), width=3, height=4)
+    with tf.Session():
+      result = tf.image.decode_png(data).eval()
+    self.assertEqual((4, 3, 4), result.shape)
+    self.assertTrue((result == 17).all())
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -16,20 +16,27 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 import tensorflow as tf
 import six
 from werkzeug import wrappers
 
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
+from tensorboard.backend import lru_cache
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.pr_curve import metadata
 
+# The maximum number of points (steps times thresholds) of processed PR curves
+# kept in memory.
+_CACHE_MAX_POINTS = 500000
+
 
 class PrCurvesPlugin(base_plugin.TBPlugin):
   """A plugin that serves PR curves for individual classes."""
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates a PrCurvesPlugin.
@@ -38,6 +45,9 @@ class PrCurvesPlugin(base_plugin.TBPlugin):
         TensorBoard uses to make objects available to the plugin.
     """
     self._multiplexer = context.multiplexer
+    # Map from (run, tag, max_thresholds) to a (generation, entries) pair.
+    self._cache = lru_cache.LRUCache(
+        _CACHE_MAX_POINTS, size_fn=lambda value: _number_of_points(value[1]))
 
   @wrappers.Request.application
   def pr_curves_route(self, request):
@@ -59,44 +69,78 @@ class PrCurvesPlugin(base_plugin.TBPlugin):
       return http_util.Respond(
           request, 'No tag provided when fetching PR curve data', 400)
 
+    max_thresholds = request.args.get('max_thresholds')
+    if max_thresholds is not None:
+      try:
+        max_thresholds = int(max_thresholds)
+        if max_thresholds < 2:
+          raise ValueError()
+      except ValueError:
+        return http_util.Respond(
+            request, 'max_thresholds must be an integer of at least 2',
+            'text/plain', 400)
+
     try:
       response = http_util.Respond(
-          request, self.pr_curves_impl(runs, tag), 'application/json')
+          request, self.pr_curves_impl(runs, tag, max_thresholds),
+          'application/json')
     except ValueError as e:
       return http_util.Respond(request, str(e), 'text/plain', 400)
 
     return response
 
-  def pr_curves_impl(self, runs, tag):
+  def pr_curves_impl(self, runs, tag, max_thresholds=None):
     """Creates the JSON object for the PR curves response for a run-tag combo.
 
+    The entries of each run and tag are cached until the run is reloaded with
+    new data.
+
     Arguments:
       runs: A list of runs to fetch the curves for.
       tag: The tag to fetch the curves for.
+      max_thresholds: If set, curves with more thresholds are resampled to at
+        most this many evenly spaced thresholds, always including the first
+        and last.
 
     Raises:
       ValueError: If no PR curves could be fetched for a run and tag.
 
     Returns:
-      The JSON object for the PR curves route response.
+      The JSON object for the PR curves route response. Its lists must not be
+      modified.
     """
     response_mapping = {}
     for run in runs:
       try:
-        tensor_events = self._multiplexer.Tensors(run, tag)
+        response_mapping[run] = self._pr_curve_entries(run, tag,
+                                                       max_thresholds)
       except KeyError:
         raise ValueError(
             'No PR curves could be fetched for run %r and tag %r' % (run, tag))
+    return response_mapping
 
-      content = self._multiplexer.SummaryMetadata(run, tag).plugin_data.content
-      pr_curve_data = metadata.parse_plugin_metadata(content)
-      thresholds = [
-          float(v) / pr_curve_data.num_thresholds
-          for v in range(1, pr_curve_data.num_thresholds + 1)]
+  def _pr_curve_entries(self, run, tag, max_thresholds):
+    """Returns the processed tensor events of a run and tag, using a cache.
 
-      response_mapping[run] = [
-          self._process_tensor_event(e, thresholds) for e in tensor_events]
-    return response_mapping
+    Raises:
+      KeyError: If the run or tag does not exist.
+    """
+    # Read the generation before the data, so that entries are never cached
+    # under a generation newer than theirs.
+    generation = self._multiplexer.GetAccumulator(run).Generation()
+    key = (run, tag, max_thresholds)
+    cached = self._cache.get(key)
+    if cached is not None and cached[0] == generation:
+      return cached[1]
+    tensor_events = self._multiplexer.Tensors(run, tag)
+    content = self._multiplexer.SummaryMetadata(run, tag).plugin_data.content
+    pr_curve_data = metadata.parse_plugin_metadata(content)
+    num_thresholds = pr_curve_data.num_thresholds
+    thresholds = np.arange(1, num_thresholds + 1) / float(num_thresholds)
+    entries = [self._process_tensor_event(e, thresholds, max_thresholds)
+               for e in tensor_events]
+    self._cache.put(key, (generation, entries))
+    return entries
 
   @wrappers.Request.application
   def tags_route(self, request):
@@ -123,18 +167,8 @@ class PrCurvesPlugin(base_plugin.TBPlugin):
     Returns:
       The JSON object for the tags route response.
     """
-    runs = self._multiplexer.Runs()
-    result = {run: {} for run in runs}
-
-    mapping = self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME)
-    for (run, tag_to_content) in six.iteritems(mapping):
-      for (tag, _) in six.iteritems(tag_to_content):
-        summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
-        result[run][tag] = {'displayName': summary_metadata.display_name,
-                            'description': plugin_util.markdown_to_safe_html(
-                                summary_metadata.summary_description)}
-
-    return result
+    return self._multiplexer.PluginRunToTagToRendered(metadata.PLUGIN_NAME,
+                                                       _tag_listing_entry)
 
   @wrappers.Request.application
   def available_time_entries_route(self, request):
@@ -213,13 +247,15 @@ class PrCurvesPlugin(base_plugin.TBPlugin):
     # The plugin is active if any of the runs has a tag relevant to the plugin.
     return any(six.itervalues(all_runs))
 
-  def _process_tensor_event(self, event, thresholds):
+  def _process_tensor_event(self, event, thresholds, max_thresholds=None):
     """Converts a TensorEvent into a dict that encapsulates information on it.
 
     Args:
       event: The TensorEvent to convert.
       thresholds: An array of floats that ranges from 0 to 1 (in that
         direction and inclusive of 0 and 1).
+      max_thresholds: If set, the maximum number of thresholds to keep. See
+        `pr_curves_impl`.
 
     Returns:
       A JSON-able dictionary of PR curve data for 1 step.
@@ -227,30 +263,44 @@ class PrCurvesPlugin(base_plugin.TBPlugin):
     data_array = tf.make_ndarray(event.tensor_proto)
 
     # Trim entries for which TP + FP = 0 (precision is undefined) at the tail of
-    # the data.
-    true_positives = [int(v) for v in data_array[metadata.TRUE_POSITIVES_INDEX]]
-    false_positives = [
-        int(v) for v in data_array[metadata.FALSE_POSITIVES_INDEX]]
+    # the data, keeping at least the first entry.
     tp_index = metadata.TRUE_POSITIVES_INDEX
     fp_index = metadata.FALSE_POSITIVES_INDEX
     positives = data_array[[tp_index, fp_index], :].astype(int).sum(axis=0)
-    end_index_inclusive = len(positives) - 1
-    while end_index_inclusive > 0 and positives[end_index_inclusive] == 0:
-      end_index_inclusive -= 1
-    end_index = end_index_inclusive + 1
-
+    nonzero = np.flatnonzero(positives)
+    end_index = min(len(positives), nonzero[-1] + 1 if len(nonzero) else 1)
+
+    columns = slice(0, end_index)
+    if max_thresholds is not None and end_index > max_thresholds:
+      columns = np.unique(
+          np.round(np.linspace(0, end_index - 1, max_thresholds)).astype(int))
+
+    counts = data_array[[metadata.TRUE_POSITIVES_INDEX,
+                         metadata.FALSE_POSITIVES_INDEX,
+                         metadata.TRUE_NEGATIVES_INDEX,
+                         metadata.FALSE_NEGATIVES_INDEX]][:, columns]
+    (true_positives, false_positives, true_negatives, false_negatives) = (
+        counts.astype(np.int64).tolist())
     return {
         'wall_time': event.wall_time,
         'step': event.step,
-        'precision': data_array[metadata.PRECISION_INDEX, :end_index].tolist(),
-        'recall': data_array[metadata.RECALL_INDEX, :end_index].tolist(),
-        'true_positives': true_positives[:end_index],
-        'false_positives': false_positives[:end_index],
-        'true_negatives':
-            [int(v) for v in
-             data_array[metadata.TRUE_NEGATIVES_INDEX][:end_index]],
-        'false_negatives':
-            [int(v) for v in
-             data_array[metadata.FALSE_NEGATIVES_INDEX][:end_index]],
-        'thresholds': thresholds[:end_index],
+        'precision': data_array[metadata.PRECISION_INDEX, columns].tolist(),
+        'recall': data_array[metadata.RECALL_INDEX, columns].tolist(),
+        'true_positives': true_positives,
+        'false_positives': false_positives,
+        'true_negatives': true_negatives,
+        'false_negatives': false_negatives,
+        'thresholds': np.asarray(thresholds)[columns].tolist(),
     }
+
+
+def _number_of_points(entries):
+  """Returns the number of (step, threshold) points of processed events."""
+  return sum(len(entry['thresholds']) for entry in entries)
+
+
+def _tag_listing_entry(summary_metadata):
+  """Returns the display name and description of a tag, for `/tags`."""
+  return {'displayName': summary_metadata.display_name,
+          'description': plugin_util.summary_description_to_safe_html(
+              summary_metadata.summary_description)}
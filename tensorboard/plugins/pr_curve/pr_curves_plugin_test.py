@@ -271,6 +271,30 @@ class PrCurvesPluginTest(tf.test.TestCase):
         expected_thresholds=[0.2, 0.4, 0.6, 0.8],
         pr_curve_entry=entries[2])
 
+  def testPrCurvesWithMaxThresholds(self):
+    """Tests that curves are resampled to at most `max_thresholds` points."""
+    entries = self.plugin.pr_curves_impl(
+        ['colors'], 'blue/pr_curves', max_thresholds=2)['colors']
+    self.validatePrCurveEntry(
+        expected_step=0,
+        expected_precision=[0.3333333, 0.75],
+        expected_recall=[1.0, 0.04],
+        expected_true_positives=[150, 6],
+        expected_false_positives=[300, 2],
+        expected_true_negatives=[0, 298],
+        expected_false_negatives=[0, 144],
+        expected_thresholds=[0.2, 0.8],
+        pr_curve_entry=entries[0])
+
+  def testPrCurvesAreCachedUntilNewData(self):
+    first = self.plugin.pr_curves_impl(['colors'], 'blue/pr_curves')
+    second = self.plugin.pr_curves_impl(['colors'], 'blue/pr_curves')
+    self.assertIs(first['colors'], second['colors'])
+    self.assertIsNot(
+        first['colors'],
+        self.plugin.pr_curves_impl(['colors'], 'blue/pr_curves',
+                                   max_thresholds=2)['colors'])
+
   def testPrCurvesRaisesValueErrorWhenNoData(self):
     """Tests that the method for obtaining PR curve data raises a ValueError.
 
@@ -26,10 +26,12 @@ import tensorflow as tf
 from werkzeug import wrappers
 
 from tensorboard.backend import http_util
+from tensorboard.backend import lru_cache
 from tensorboard.backend.event_processing import plugin_asset_util
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.profile import trace_events_json
 from tensorboard.plugins.profile import trace_events_pb2
+from tensorboard.plugins.profile import trace_index
 
 # The prefix of routes provided by this plugin.
 PLUGIN_NAME = 'profile'
@@ -46,6 +48,9 @@ TOOLS = {
     'op_profile': 'op_profile.json',
 }
 
+# The maximum total size of the cached trace indexes, see `TraceIndex.nbytes`.
+_TRACE_CACHE_BYTES = 1024 * 1024 * 1024
+
 
 def process_raw_trace(raw_trace):
   """Processes raw trace data and returns the UI data."""
@@ -54,6 +59,18 @@ def process_raw_trace(raw_trace):
   return ''.join(trace_events_json.TraceEventsJsonStream(trace))
 
 
+def _read_asset(asset_path):
+  """Returns the contents of a file, or None if it can't be read."""
+  try:
+    with tf.gfile.Open(asset_path, "rb") as f:
+      return f.read()
+  except tf.errors.NotFoundError:
+    logging.warning("Asset path %s not found", asset_path)
+  except tf.errors.OpError as e:
+    logging.warning("Couldn't read asset path: %s, OpError %s", asset_path, e)
+  return None
+
+
 class ProfilePlugin(base_plugin.TBPlugin):
   """Profile Plugin for TensorBoard."""
 
@@ -70,6 +87,9 @@ class ProfilePlugin(base_plugin.TBPlugin):
     self.logdir = context.logdir
     self.plugin_logdir = plugin_asset_util.PluginDirectory(
         self.logdir, ProfilePlugin.plugin_name)
+    # Map from trace path to a ((mtime, length), TraceIndex) pair.
+    self._trace_cache = lru_cache.LRUCache(
+        _TRACE_CACHE_BYTES, size_fn=lambda entry: entry[1].nbytes)
 
   @wrappers.Request.application
   def logdir_route(self, request):
@@ -128,48 +148,89 @@ class ProfilePlugin(base_plugin.TBPlugin):
     run_to_tools = self.index_impl()
     return http_util.Respond(request, run_to_tools, 'application/json')
 
-  def data_impl(self, run, tool):
+  def data_impl(self, run, tool, start_ps=None, end_ps=None, resolution=None):
     """Retrieves and processes the tool data for a run.
 
     Args:
       run: Name of the run.
       tool: Name of the tool.
+      start_ps: For the trace viewer, the start of the time window to show in
+        picoseconds, or None for the start of the trace.
+      end_ps: For the trace viewer, the end of the time window to show in
+        picoseconds, or None for the end of the trace.
+      resolution: For the trace viewer, the number of intervals in the window.
+        Events shorter than an interval are merged, see
+        `TraceIndex.events`. None to show all events.
 
     Returns:
-      A string that can be served to the frontend tool or None if tool or
-        run is invalid.
+      A string, or for the trace viewer an iterable of string chunks, that can
+        be served to the frontend tool, or None if tool or run is invalid.
     """
     # Path relative to the path of plugin directory.
     if tool not in TOOLS:
       return None
     rel_data_path = os.path.join(run, TOOLS[tool])
     asset_path = os.path.join(self.plugin_logdir, rel_data_path)
-    raw_data = None
-    try:
-      with tf.gfile.Open(asset_path, "rb") as f:
-        raw_data = f.read()
-    except tf.errors.NotFoundError:
-      logging.warning("Asset path %s not found", asset_path)
-    except tf.errors.OpError as e:
-      logging.warning("Couldn't read asset path: %s, OpError %s", asset_path, e)
-
-    if raw_data is None:
-      return None
     if tool == 'trace_viewer':
-      return process_raw_trace(raw_data)
+      index = self._trace_index(asset_path)
+      if index is None:
+        return None
+      return trace_events_json.TraceEventsJsonStream(
+          index.devices, index.events(start_ps, end_ps, resolution))
     if tool == 'op_profile':
-      return raw_data
+      return _read_asset(asset_path)
     return None
 
+  def _trace_index(self, asset_path):
+    """Returns the `TraceIndex` of a trace file, or None if it can't be read.
+
+    Indexes are cached until the file changes.
+    """
+    try:
+      stat = tf.gfile.Stat(asset_path)
+    except tf.errors.OpError:
+      stat = None
+    if stat is not None:
+      stat = (stat.mtime_nanos, stat.length)
+      entry = self._trace_cache.get(asset_path)
+      if entry is not None and entry[0] == stat:
+        return entry[1]
+    raw_data = _read_asset(asset_path)
+    if raw_data is None:
+      return None
+    trace = trace_events_pb2.Trace()
+    trace.ParseFromString(raw_data)
+    index = trace_index.TraceIndex(trace)
+    if stat is not None:
+      self._trace_cache.put(asset_path, (stat, index))
+    return index
+
   @wrappers.Request.application
   def data_route(self, request):
     # params
     #   run: The run name.
     #   tag: The tool name e.g. trace_viewer. The plugin returns different UI
     #     data for different tools of the same run.
+    #   start_ps, end_ps: Optionally, the time window of the trace to show.
+    #   resolution: Optionally, how many intervals of the trace window to merge
+    #     short events into.
     run = request.args.get('run')
     tool = request.args.get('tag')
-    data = self.data_impl(run, tool)
+    trace_args = {}
+    for (name, minimum) in (('start_ps', 0), ('end_ps', 0), ('resolution', 1)):
+      value = request.args.get(name)
+      if value is None:
+        continue
+      try:
+        value = int(value)
+        if value < minimum:
+          raise ValueError()
+      except ValueError:
+        return http_util.Respond(
+            request, '%s must be an integer of at least %d' % (name, minimum),
+            'text/plain', code=400)
+      trace_args[name] = value
+    data = self.data_impl(run, tool, **trace_args)
     if data is None:
       return http_util.Respond(request, '404 Not Found', 'text/plain', code=404)
     return http_util.Respond(request, data, 'text/plain')
@@ -77,7 +77,7 @@ class ProfilePluginTest(tf.test.TestCase):
     self.assertItemsEqual(runs['empty'], [])
 
   def testData(self):
-    trace = json.loads(self.plugin.data_impl('foo', 'trace_viewer'))
+    trace = json.loads(''.join(self.plugin.data_impl('foo', 'trace_viewer')))
     self.assertEqual(trace,
                      dict(
                          displayTimeUnit='ns',
@@ -100,6 +100,30 @@ class ProfilePluginTest(tf.test.TestCase):
     self.assertEqual(None, self.plugin.data_impl('bar', 'unsupported'))
     self.assertEqual(None, self.plugin.data_impl('empty', 'trace_viewer'))
 
+  def testDataWithTimeWindow(self):
+    trace = trace_events_pb2.Trace()
+    for timestamp_ps in (1000000, 2000000, 3000000):
+      trace.trace_events.add(name='E', timestamp_ps=timestamp_ps,
+                             duration_ps=1000000)
+    run_dir = os.path.join(self.plugin.plugin_logdir, 'qux')
+    os.mkdir(run_dir)
+    with open(os.path.join(run_dir, 'trace'), 'wb') as f:
+      f.write(trace.SerializeToString())
+
+    def event_times(**kwargs):
+      data = json.loads(''.join(
+          self.plugin.data_impl('qux', 'trace_viewer', **kwargs)))
+      return [(e['ts'], e['dur']) for e in data['traceEvents'][:-1]]
+
+    self.assertEqual([(1, 1), (2, 1), (3, 1)], event_times())
+    self.assertEqual([(2, 1)], event_times(start_ps=2500000, end_ps=2900000))
+    self.assertEqual([(1, 3)], event_times(resolution=1))
+
+    # The parsed trace is reused until the file changes.
+    index = self.plugin._trace_index(os.path.join(run_dir, 'trace'))
+    self.assertIs(index, self.plugin._trace_index(os.path.join(run_dir,
+                                                               'trace')))
+
   def testActive(self):
     self.assertTrue(self.plugin.is_active())
 
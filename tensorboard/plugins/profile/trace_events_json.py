@@ -28,6 +28,17 @@ _TYPE_COMPLETE = 'X'
 _TYPE_INSTANT = 'i'
 _SCOPE_THREAD = 't'
 
+# The JSON of complete and instant trace events, followed by a separator. The
+# fields are in a fixed order; the output is JSON-equivalent to encoding each
+# event as a dict with `json.dumps`, as was done before.
+_COMPLETE_EVENT_JSON = ('{"pid": %d, "tid": %d, "name": %s, "ts": %r, '
+                        '"ph": "X", "dur": %r},\n')
+_INSTANT_EVENT_JSON = ('{"pid": %d, "tid": %d, "name": %s, "ts": %r, '
+                       '"ph": "i", "s": "t"},\n')
+
+# Trace events are encoded in batches of this many, one chunk per batch.
+_EVENTS_PER_CHUNK = 1000
+
 
 class TraceEventsJsonStream(object):
   """A streaming trace file in the format expected by catapult trace viewer.
@@ -36,16 +47,19 @@ class TraceEventsJsonStream(object):
   returning in a werkzeug Response.
   """
 
-  def __init__(self, proto):
+  def __init__(self, proto, events=None):
     """Create an iterable JSON stream over the supplied Trace.
 
     Args:
       proto: a tensorboard.profile.Trace protobuf
+      events: an iterable of the TraceEvent protobufs, or of objects with the
+        same fields, to include, by default all of proto.trace_events
     """
     self._proto = proto
+    self._trace_events = proto.trace_events if events is None else events
 
-  def _events(self):
-    """Iterator over all catapult trace events, as python values."""
+  def _metadata_events(self):
+    """Iterator over the catapult metadata events, as python values."""
     for did, device in sorted(six.iteritems(self._proto.devices)):
       if device.name:
         yield dict(
@@ -72,31 +86,40 @@ class TraceEventsJsonStream(object):
             tid=rid,
             name='thread_sort_index',
             args=dict(sort_index=rid))
-    # TODO(sammccall): filtering and downsampling?
-    for event in self._proto.trace_events:
-      yield self._event(event)
 
-  def _event(self, event):
-    """Converts a TraceEvent proto into a catapult trace event python value."""
-    result = dict(
-        pid=event.device_id,
-        tid=event.resource_id,
-        name=event.name,
-        ts=event.timestamp_ps / 1000000.0)
-    if event.duration_ps:
-      result['ph'] = _TYPE_COMPLETE
-      result['dur'] = event.duration_ps / 1000000.0
-    else:
-      result['ph'] = _TYPE_INSTANT
-      result['s'] = _SCOPE_THREAD
-    return result
+  def _trace_event_chunks(self):
+    """Converts the TraceEvent protos to JSON, in chunks of many events."""
+    # Trace events tend to share a small number of names, so their JSON
+    # encodings are memoized.
+    names = {}
+    chunk = []
+    for event in self._trace_events:
+      name = names.get(event.name)
+      if name is None:
+        name = names[event.name] = json.dumps(event.name)
+      timestamp = event.timestamp_ps / 1000000.0
+      if event.duration_ps:
+        chunk.append(_COMPLETE_EVENT_JSON % (
+            event.device_id, event.resource_id, name, timestamp,
+            event.duration_ps / 1000000.0))
+      else:
+        chunk.append(_INSTANT_EVENT_JSON % (
+            event.device_id, event.resource_id, name, timestamp))
+      if len(chunk) == _EVENTS_PER_CHUNK:
+        yield ''.join(chunk)
+        chunk = []
+    if chunk:
+      yield ''.join(chunk)
 
   def __iter__(self):
     """Returns an iterator of string chunks of a complete JSON document."""
     yield '{"displayTimeUnit":"ns","metadata":{"highres-ticks":true},\n'
     yield '"traceEvents":[\n'
-    for event in self._events():
-      yield json.dumps(event)
-      yield ',\n'
+    metadata = ''.join(json.dumps(event) + ',\n'
+                       for event in self._metadata_events())
+    if metadata:
+      yield metadata
+    for chunk in self._trace_event_chunks():
+      yield chunk
     # Add one fake event to avoid dealing with no-trailing-comma rule.
     yield '{}]}\n'
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for the JSON encoding of trace events by the profile plugin.
+
+Compares `trace_events_json.TraceEventsJsonStream` with encoding each event as
+a dict with `json.dumps`, which is how the stream used to work, on a trace of
+random complete and instant events. The throughput is reported in events per
+second, and the outputs of both methods are checked to decode to the same
+JSON. (Their field order may differ, as dicts are unordered before Python
+3.7.)
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import json
+
+from six.moves import xrange  # pylint: disable=redefined-builtin
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard.plugins.profile import trace_events_json
+from tensorboard.plugins.profile import trace_events_pb2
+
+
+def _trace(num_events):
+  """Generate a trace of `num_events` random events."""
+  trace = trace_events_pb2.Trace()
+  names = ['op%d' % i for i in xrange(100)] + [u'Conv2D "☃"']
+  for _ in xrange(num_events):
+    trace.trace_events.add(
+        device_id=int(np.random.randint(8)),
+        resource_id=int(np.random.randint(1 << 30)),
+        name=names[np.random.randint(len(names))],
+        timestamp_ps=int(np.random.randint(1 << 50)),
+        duration_ps=int(np.random.randint(1 << 30) * np.random.randint(2)))
+  return trace
+
+
+def _encode_as_dicts(trace):
+  """Encodes a trace without metadata the way the stream used to."""
+  chunks = ['{"displayTimeUnit":"ns","metadata":{"highres-ticks":true},\n',
+            '"traceEvents":[\n']
+  for event in trace.trace_events:
+    result = dict(
+        pid=event.device_id,
+        tid=event.resource_id,
+        name=event.name,
+        ts=event.timestamp_ps / 1000000.0)
+    if event.duration_ps:
+      result['ph'] = 'X'
+      result['dur'] = event.duration_ps / 1000000.0
+    else:
+      result['ph'] = 'i'
+      result['s'] = 't'
+    chunks.append(json.dumps(result))
+    chunks.append(',\n')
+  chunks.append('{}]}\n')
+  return chunks
+
+
+def _encode_as_stream(trace):
+  return list(trace_events_json.TraceEventsJsonStream(trace))
+
+
+def bench(f, trace):
+  """Apply `f` to `trace`, returning the result and elapsed seconds."""
+  start_time = datetime.datetime.now()
+  result = f(trace)
+  end_time = datetime.datetime.now()
+  return (result, (end_time - start_time).total_seconds())
+
+
+def _format_line(headers, fields):
+  """Format a line of a table. See `encode_png_benchmark._format_line`."""
+  assert len(fields) == len(headers), (fields, headers)
+  fields = ["%2.4f" % field if isinstance(field, float) else str(field)
+            for field in fields]
+  return '  '.join(field + ' ' * max(0, len(header) - len(field))
+                   if i == 0 else
+                   ' ' * max(0, len(header) - len(field)) + field
+                   for (i, (header, field)) in enumerate(zip(headers, fields)))
+
+
+def main(unused_argv):
+  tf.logging.set_verbosity(tf.logging.INFO)
+  np.random.seed(0)
+  num_events = 200000
+  trace = _trace(num_events)
+
+  tf.logging.info("Running...")
+  headers = ('METHOD', 'EVENTS', 'CHUNKS', 'TOTAL_TIME', 'EVENTS_PER_SEC',
+             'SPEEDUP')
+  tf.logging.info(_format_line(headers, headers))
+  methods = (('dicts', _encode_as_dicts),
+             ('stream', _encode_as_stream))
+  results = {}
+  for (name, f) in methods:
+    # best-of-three timing
+    runs = [bench(f, trace) for _ in xrange(3)]
+    results[name] = (runs[0][0], min(seconds for (_, seconds) in runs))
+    speedup = results['dicts'][1] / results[name][1]
+    fields = (name, num_events, len(results[name][0]), results[name][1],
+              int(num_events / results[name][1]), speedup)
+    tf.logging.info(_format_line(headers, fields))
+
+  if (json.loads(''.join(results['dicts'][0])) !=
+      json.loads(''.join(results['stream'][0]))):
+    tf.logging.error("The stream and dict encodings disagree!")
+
+
+if __name__ == '__main__':
+  tf.app.run()
@@ -113,6 +113,28 @@ class TraceEventsJsonStreamTest(tf.test.TestCase):
                 {},
             ]))
 
+  def testEventsAreEncodedLikeJsonDumps(self):
+    proto = trace_events_pb2.Trace()
+    text_format.Merge("""
+        trace_events { device_id: 1 resource_id: 2 name: "a \\"b\\" \\\\"
+                       timestamp_ps: 100000 duration_ps: 10000 }
+        trace_events { name: "\\303\\251" timestamp_ps: 105001 }
+        trace_events { name: "a \\"b\\" \\\\" timestamp_ps: 3 }
+        """, proto)
+    with tf.test.mock.patch.object(trace_events_json, '_EVENTS_PER_CHUNK', 2):
+      chunks = list(trace_events_json.TraceEventsJsonStream(proto))
+    self.assertEqual([
+        '{"displayTimeUnit":"ns","metadata":{"highres-ticks":true},\n',
+        '"traceEvents":[\n',
+        '{"pid": 1, "tid": 2, "name": "a \\"b\\" \\\\", "ts": 0.1, '
+        '"ph": "X", "dur": 0.01},\n'
+        '{"pid": 0, "tid": 0, "name": "\\u00e9", "ts": 0.105001, '
+        '"ph": "i", "s": "t"},\n',
+        '{"pid": 0, "tid": 0, "name": "a \\"b\\" \\\\", "ts": 3e-06, '
+        '"ph": "i", "s": "t"},\n',
+        '{}]}\n',
+    ], chunks)
+
 
 if __name__ == '__main__':
   tf.test.main()
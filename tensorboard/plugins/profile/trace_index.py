@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Indexes trace events by time for windowed and downsampled views."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import itertools
+
+import numpy as np
+
+from tensorboard.plugins.profile import trace_events_pb2
+
+# A trace event, with the fields of a `TraceEvent` proto.
+Event = collections.namedtuple(
+    'Event',
+    ['device_id', 'resource_id', 'name', 'timestamp_ps', 'duration_ps'])
+
+
+class TraceIndex(object):
+  """The events of a `Trace` proto, sorted by timestamp.
+
+  Building the index takes one pass over the events. After that, `events`
+  finds the events that overlap a time window with a binary search, and can
+  merge events that are too short to see at a given resolution.
+
+  The index keeps the fields of the events in arrays rather than the trace
+  itself, which takes several times less memory.
+
+  Attributes:
+    devices: A `Trace` proto holding the devices of the trace, but no events.
+  """
+
+  def __init__(self, trace):
+    """Indexes a trace.
+
+    Args:
+      trace: A `tensorboard.profile.Trace` proto.
+    """
+    self.devices = trace_events_pb2.Trace()
+    self.devices.devices.MergeFrom(trace.devices)
+    events = trace.trace_events
+    name_ids = {}
+    columns = np.fromiter(
+        itertools.chain.from_iterable(
+            (e.timestamp_ps, e.duration_ps, e.device_id, e.resource_id,
+             name_ids.setdefault(e.name, len(name_ids)))
+            for e in events),
+        dtype=np.int64, count=5 * len(events)).reshape((-1, 5))
+    self._names = [None] * len(name_ids)
+    for (name, name_id) in name_ids.items():
+      self._names[name_id] = name
+    # A stable sort keeps the trace order of events with equal timestamps.
+    columns = columns[np.argsort(columns[:, 0], kind='mergesort')]
+    self._timestamps = columns[:, 0].copy()
+    self._durations = columns[:, 1].copy()
+    self._device_ids = columns[:, 2].copy()
+    self._resource_ids = columns[:, 3].copy()
+    self._name_ids = columns[:, 4].astype(np.int32)
+    # Each (device, resource) pair is a lane of the trace viewer.
+    if len(columns):
+      (_, lanes) = np.unique(columns[:, 2:4], axis=0, return_inverse=True)
+      self._lanes = lanes.reshape(-1).astype(np.int32)
+      self._max_duration = int(self._durations.max())
+      self._max_end = int((self._timestamps + self._durations).max())
+    else:
+      self._lanes = np.zeros(0, dtype=np.int32)
+      self._max_duration = 0
+      self._max_end = 0
+
+  @property
+  def num_events(self):
+    return len(self._timestamps)
+
+  @property
+  def nbytes(self):
+    """The approximate number of bytes of memory held by the index."""
+    arrays = (self._timestamps, self._durations, self._device_ids,
+              self._resource_ids, self._name_ids, self._lanes)
+    return (sum(array.nbytes for array in arrays) +
+            sum(len(name) for name in self._names) +
+            self.devices.ByteSize())
+
+  def events(self, start_ps=None, end_ps=None, resolution=None):
+    """Yields the events that overlap a time window, sorted by timestamp.
+
+    Args:
+      start_ps: The start of the window in picoseconds, or None for the start
+        of the trace.
+      end_ps: The end of the window in picoseconds, or None for the end of the
+        trace.
+      resolution: If given, the window is divided into this many intervals.
+        Events that are shorter than an interval, on the same device and
+        resource and starting in the same interval, are merged into one event.
+        It keeps their name if they all share it.
+
+    Returns:
+      An iterator of `Event`s, which are built as they are consumed.
+    """
+    lo = 0
+    hi = self.num_events
+    if start_ps is not None:
+      lo = np.searchsorted(self._timestamps, start_ps - self._max_duration)
+    if end_ps is not None:
+      hi = np.searchsorted(self._timestamps, end_ps, side='right')
+    selected = np.arange(lo, max(lo, hi))
+    if start_ps is not None:
+      selected = selected[self._timestamps[selected] +
+                          self._durations[selected] >= start_ps]
+    if not resolution or not len(selected):
+      return (self._event(i) for i in selected)
+
+    if start_ps is None:
+      start_ps = int(self._timestamps[0])
+    if end_ps is None:
+      end_ps = self._max_end
+    interval_ps = max(1, (end_ps - start_ps) // resolution)
+    short = self._durations[selected] < interval_ps
+    kept = selected[~short]
+    short = selected[short]
+
+    # Group the short events by lane and interval. The sort is stable, so each
+    # group is in timestamp order.
+    intervals = (self._timestamps[short] - start_ps) // interval_ps
+    grouping = np.lexsort((intervals, self._lanes[short]))
+    short = short[grouping]
+    intervals = intervals[grouping]
+    lanes = self._lanes[short]
+    starts = np.flatnonzero(
+        (np.diff(lanes) != 0) | (np.diff(intervals) != 0)) + 1
+    if len(short):
+      starts = np.insert(starts, 0, 0)
+      ends = np.maximum.reduceat(
+          self._timestamps[short] + self._durations[short], starts)
+      min_names = np.minimum.reduceat(self._name_ids[short], starts)
+      max_names = np.maximum.reduceat(self._name_ids[short], starts)
+    sizes = np.diff(np.append(starts, len(short)))
+    firsts = short[starts]
+
+    timestamps = np.concatenate((self._timestamps[kept],
+                                 self._timestamps[firsts]))
+    results = []
+    for i in np.argsort(timestamps, kind='mergesort'):
+      if i < len(kept):
+        results.append(self._event(kept[i]))
+        continue
+      group = i - len(kept)
+      first = self._event(firsts[group])
+      if sizes[group] == 1:
+        results.append(first)
+        continue
+      if min_names[group] == max_names[group]:
+        name = first.name
+      else:
+        name = '%d events' % sizes[group]
+      results.append(first._replace(
+          name=name, duration_ps=int(ends[group]) - first.timestamp_ps))
+    return iter(results)
+
+  def _event(self, position):
+    return Event(device_id=int(self._device_ids[position]),
+                 resource_id=int(self._resource_ids[position]),
+                 name=self._names[self._name_ids[position]],
+                 timestamp_ps=int(self._timestamps[position]),
+                 duration_ps=int(self._durations[position]))
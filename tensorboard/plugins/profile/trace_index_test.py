@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for trace_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import tensorflow as tf
+
+from google.protobuf import text_format
+from tensorboard.plugins.profile import trace_events_pb2
+from tensorboard.plugins.profile import trace_index
+
+
+class TraceIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(TraceIndexTest, self).setUp()
+    trace = trace_events_pb2.Trace()
+    text_format.Merge("""
+        trace_events { device_id: 1 resource_id: 1 name: "a"
+                       timestamp_ps: 100 duration_ps: 10 }
+        trace_events { device_id: 1 resource_id: 1 name: "a"
+                       timestamp_ps: 50 duration_ps: 5 }
+        trace_events { device_id: 1 resource_id: 2 name: "b"
+                       timestamp_ps: 55 }
+        trace_events { device_id: 1 resource_id: 1 name: "b"
+                       timestamp_ps: 58 duration_ps: 1 }
+        trace_events { device_id: 1 resource_id: 1 name: "long"
+                       timestamp_ps: 0 duration_ps: 1000 }
+        trace_events { device_id: 2 resource_id: 1 name: "x"
+                       timestamp_ps: 900 }
+        """, trace)
+    self.index = trace_index.TraceIndex(trace)
+
+  def summarize(self, events):
+    return [(e.name, e.timestamp_ps, e.duration_ps) for e in events]
+
+  def testEventsAreSortedByTimestamp(self):
+    self.assertEqual(6, self.index.num_events)
+    self.assertEqual(['long', 'a', 'b', 'b', 'a', 'x'],
+                     [e.name for e in self.index.events()])
+
+  def testEventsOverlappingAWindow(self):
+    self.assertEqual([('long', 0, 1000), ('a', 100, 10)],
+                     self.summarize(self.index.events(90, 120)))
+    self.assertEqual([('long', 0, 1000)],
+                     self.summarize(self.index.events(start_ps=1000)))
+    self.assertEqual([], list(self.index.events(start_ps=2000)))
+
+  def testShortEventsAreMerged(self):
+    self.assertEqual(
+        [('long', 0, 1000), ('2 events', 50, 9), ('b', 55, 0), ('a', 100, 10),
+         ('x', 900, 0)],
+        self.summarize(self.index.events(resolution=10)))
+    self.assertEqual(
+        [('long', 0, 1000), ('2 events', 50, 9), ('b', 55, 0),
+         ('a', 100, 10)],
+        self.summarize(self.index.events(40, 140, resolution=2)))
+
+  def testMergedEventsWithOneNameKeepIt(self):
+    trace = trace_events_pb2.Trace()
+    text_format.Merge("""
+        trace_events { name: "c" timestamp_ps: 0 duration_ps: 1 }
+        trace_events { name: "c" timestamp_ps: 5 duration_ps: 1 }
+        """, trace)
+    index = trace_index.TraceIndex(trace)
+    self.assertEqual([('c', 0, 6)],
+                     self.summarize(index.events(resolution=1)))
+
+  def testEventsKeepTheirFields(self):
+    self.assertEqual(
+        trace_index.Event(device_id=2, resource_id=1, name='x',
+                          timestamp_ps=900, duration_ps=0),
+        list(self.index.events(start_ps=900))[-1])
+
+  def testIndexDoesNotKeepTheTrace(self):
+    trace = trace_events_pb2.Trace()
+    text_format.Merge("""
+        devices { key: 3 value { name: "gpu" device_id: 3 } }
+        trace_events { device_id: 3 name: "c" timestamp_ps: 0 }
+        """, trace)
+    index = trace_index.TraceIndex(trace)
+    trace.Clear()
+    self.assertEqual('gpu', index.devices.devices[3].name)
+    self.assertEqual(0, len(index.devices.trace_events))
+    self.assertEqual(['c'], [e.name for e in index.events()])
+    self.assertGreater(index.nbytes, 0)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -30,6 +30,7 @@ from werkzeug import wrappers
 
 from google.protobuf import json_format
 from google.protobuf import text_format
+from tensorboard.backend import lru_cache
 from tensorboard.backend.http_util import Respond
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.projector.projector_config_pb2 import ProjectorConfig
@@ -45,8 +46,26 @@ PROJECTOR_FILENAME = 'projector_config.pbtxt'
 _PLUGIN_NAME = 'org_tensorflow_tensorboard_projector'
 _PLUGINS_DIR = 'plugins'
 
-# Number of tensors in the LRU cache.
-_TENSOR_CACHE_CAPACITY = 1
+# The maximum total number of bytes of tensors kept in memory.
+_TENSOR_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+
+# The default number of seconds between refreshes of the projector configs.
+_CONFIG_REFRESH_INTERVAL_SECS = 5
+
+# Tensors are streamed to clients in chunks of whole rows of about this size.
+_TENSOR_CHUNK_BYTES = 1024 * 1024
+
+# The maximum total number of bytes of cached metadata file line offsets, which
+# take 8 bytes per line.
+_METADATA_INDEX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Metadata files are scanned for line breaks in blocks of this many bytes.
+_METADATA_INDEX_BLOCK_BYTES = 16 * 1024 * 1024
+
+# The suffix of the NumPy files that cache parsed tensor TSV files. They are
+# written next to the TSV files, and are only used while their modification
+# time matches that of the TSV file.
+_TENSOR_NPY_CACHE_SUFFIX = '.npy'
 
 # HTTP routes.
 CONFIG_ROUTE = '/info'
@@ -65,34 +84,6 @@ _IMGHDR_TO_MIMETYPE = {
 _DEFAULT_IMAGE_MIMETYPE = 'application/octet-stream'
 
 
-class LRUCache(object):
-  """LRU cache. Used for storing the last used tensor."""
-
-  def __init__(self, size):
-    if size < 1:
-      raise ValueError('The cache size must be >=1')
-    self._size = size
-    self._dict = collections.OrderedDict()
-
-  def get(self, key):
-    try:
-      value = self._dict.pop(key)
-      self._dict[key] = value
-      return value
-    except KeyError:
-      return None
-
-  def set(self, key, value):
-    if value is None:
-      raise ValueError('value must be != None')
-    try:
-      self._dict.pop(key)
-    except KeyError:
-      if len(self._dict) >= self._size:
-        self._dict.popitem(last=False)
-    self._dict[key] = value
-
-
 class EmbeddingMetadata(object):
   """Metadata container for an embedding.
 
@@ -140,14 +131,163 @@ class EmbeddingMetadata(object):
     self.name_to_values[column_name] = column_values
 
 
+def _parse_tensor_tsv(text):
+  """Parses the contents of a tensor TSV file into a 2D float32 array.
+
+  Raises:
+    ValueError: If a value is not a number, or the rows differ in length.
+  """
+  rows = [line for line in text.splitlines() if line]
+  if not rows:
+    return np.array([], dtype='float32')
+  num_columns = rows[0].count('\t') + 1
+  # Parse as float64 and round once, like `float` followed by a cast does.
+  values = np.fromstring(text, dtype=np.float64, sep=' ')
+  if (values.size != len(rows) * num_columns or
+      any(row.count('\t') + 1 != num_columns for row in rows)):
+    raise ValueError('Expected %d rows of %d numbers separated by tabs' %
+                     (len(rows), num_columns))
+  return values.astype('float32').reshape((len(rows), num_columns))
+
+
+def _load_npy_cache(cache_path, mtime):
+  """Memory-maps a cached tensor, or returns None if it is not from `mtime`."""
+  try:
+    if os.stat(cache_path).st_mtime != mtime:
+      return None
+    return np.load(cache_path, mmap_mode='r', allow_pickle=False)
+  except (IOError, OSError, ValueError):
+    return None
+
+
+def _save_npy_cache(fpath, cache_path, tensor, mtime):
+  """Caches the tensor of `fpath` at `cache_path`, if the directory allows.
+
+  `mtime` must be the modification time of `fpath` from before it was read,
+  so that a cache of a file rewritten since is never considered fresh.
+  """
+  tmp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+  try:
+    with open(tmp_path, 'wb') as f:
+      np.save(f, tensor, allow_pickle=False)
+    os.utime(tmp_path, (mtime, mtime))
+    os.rename(tmp_path, cache_path)
+  except (IOError, OSError) as e:
+    tf.logging.info('Not caching tensor "%s": %s', fpath, e)
+    try:
+      os.remove(tmp_path)
+    except OSError:
+      pass
+
+
 def _read_tensor_tsv_file(fpath):
+  """Reads a TSV file of numbers into a 2D float32 array.
+
+  Local files are cached in NumPy format next to the TSV file, so that after
+  the first read they are memory-mapped instead of parsed. The cache is
+  rewritten whenever the TSV file's modification time changes.
+  """
+  mtime = None
+  if '://' not in fpath:
+    try:
+      mtime = os.stat(fpath).st_mtime
+    except OSError:
+      pass
+  cache_path = fpath + _TENSOR_NPY_CACHE_SUFFIX
+  if mtime is not None:
+    tensor = _load_npy_cache(cache_path, mtime)
+    if tensor is not None:
+      return tensor
   with tf.gfile.GFile(fpath, 'r') as f:
-    tensor = []
-    for line in f:
-      line = line.rstrip('\n')
-      if line:
-        tensor.append(list(map(float, line.split('\t'))))
-  return np.array(tensor, dtype='float32')
+    tensor = _parse_tensor_tsv(f.read())
+  if mtime is not None:
+    _save_npy_cache(fpath, cache_path, tensor, mtime)
+  return tensor
+
+
+def _tensor_chunks(tensor):
+  """Yields the bytes of a C-contiguous tensor in chunks of whole rows.
+
+  Only one chunk is copied out of the tensor at a time, so serving a large
+  (or memory-mapped) tensor does not need a second copy of it in memory.
+  """
+  tensor = np.atleast_1d(tensor)
+  if not tensor.size:
+    return
+  rows_per_chunk = max(1, _TENSOR_CHUNK_BYTES // tensor[0:1].nbytes)
+  for start in range(0, len(tensor), rows_per_chunk):
+    yield tensor[start:start + rows_per_chunk].tobytes()
+
+
+# The state derived from the projector config files and checkpoints of all runs:
+# maps from run names to `ProjectorConfig` protos, to the paths of their config
+# files, and to their checkpoint readers (or None). Snapshots are published by
+# `ProjectorPlugin._refresh_configs` and never modified afterwards. Each has a
+# new `generation`, which is part of the keys of the tensors read through it.
+_ConfigSnapshot = collections.namedtuple(
+    '_ConfigSnapshot', ['generation', 'configs', 'config_fpaths', 'readers'])
+
+
+# The byte offsets of the lines of a metadata file: `offsets[i]` is where line
+# `i` starts, and `offsets[-1]` is the length of the file. `stat` is the
+# `(mtime_nanos, length)` of the indexed file, and `num_header_rows` is 1 if
+# its first line holds column names.
+_MetadataIndex = collections.namedtuple(
+    '_MetadataIndex', ['stat', 'offsets', 'num_header_rows'])
+
+
+def _index_metadata_file(fpath, stat):
+  """Scans a metadata file for line breaks and returns its `_MetadataIndex`."""
+  offsets = [np.zeros(1, dtype=np.int64)]
+  length = 0
+  first_line = None
+  with tf.gfile.GFile(fpath, 'rb') as f:
+    while True:
+      block = f.read(_METADATA_INDEX_BLOCK_BYTES)
+      if not block:
+        break
+      newlines = np.flatnonzero(
+          np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+      if first_line is None:
+        first_line = block[:newlines[0]] if newlines.size else block
+      offsets.append(newlines + (length + 1))
+      length += len(block)
+  offsets = np.concatenate(offsets)
+  if offsets[-1] != length:
+    # The last line has no line break.
+    offsets = np.append(offsets, length)
+  # A metadata file with more than one column has a header row.
+  num_header_rows = 1 if first_line and b'\t' in first_line else 0
+  return _MetadataIndex(stat, offsets, num_header_rows)
+
+
+def _read_metadata_rows(fpath, index, start_row, num_rows):
+  """Reads the header and a range of rows of an indexed metadata file.
+
+  Args:
+    fpath: The path of the metadata file.
+    index: The `_MetadataIndex` of the file.
+    start_row: The index of the first row to read, not counting the header.
+    num_rows: The maximum number of rows to read, or None to read all of them.
+
+  Returns:
+    A bytestring with the header row, if any, followed by the rows.
+  """
+  offsets = index.offsets
+  num_lines = len(offsets) - 1
+  start = min(num_lines, index.num_header_rows + start_row)
+  stop = num_lines if num_rows is None else min(num_lines, start + num_rows)
+  chunks = []
+  with tf.gfile.GFile(fpath, 'rb') as f:
+    if start == index.num_header_rows:
+      # The header and the rows are contiguous.
+      start = 0
+    elif index.num_header_rows:
+      chunks.append(f.read(int(offsets[index.num_header_rows])))
+    if stop > start:
+      f.seek(int(offsets[start]))
+      chunks.append(f.read(int(offsets[stop] - offsets[start])))
+  return b''.join(chunks)
 
 
 def _assets_dir_to_logdir(assets_dir):
@@ -181,6 +321,36 @@ def _latest_checkpoints_changed(configs, run_path_pairs):
   return False
 
 
+def _parse_non_negative_int_param(request, param_name):
+  """Parses and asserts a non-negative (>=0) integer query parameter.
+
+  Returns:
+    Param, or None, or -1 if parameter is not a non-negative integer.
+  """
+  param = request.args.get(param_name)
+  if not param:
+    return None
+  try:
+    param = int(param)
+    if param < 0:
+      raise ValueError()
+    return param
+  except ValueError:
+    return -1
+
+
+def _open_checkpoint_reader(config):
+  """Returns a reader for the checkpoint of a config, or None."""
+  if not config.model_checkpoint_path:
+    return None
+  try:
+    return tf.pywrap_tensorflow.NewCheckpointReader(
+        config.model_checkpoint_path)
+  except Exception:  # pylint: disable=broad-except
+    tf.logging.warning('Failed reading "%s"', config.model_checkpoint_path)
+    return None
+
+
 def _parse_positive_int_param(request, param_name):
   """Parses and asserts a positive (>0) integer query parameter.
 
@@ -215,21 +385,32 @@ class ProjectorPlugin(base_plugin.TBPlugin):
 
   plugin_name = _PLUGIN_PREFIX_ROUTE
 
-  def __init__(self, context):
+  def __init__(self, context,
+               config_refresh_interval=_CONFIG_REFRESH_INTERVAL_SECS):
     """Instantiates ProjectorPlugin via TensorBoard core.
 
     Args:
       context: A base_plugin.TBContext instance.
+      config_refresh_interval: How many seconds a background thread, started
+        by the first projector request, waits between checks for new config
+        files and checkpoints. If zero, they are checked on every request
+        instead.
     """
     self.multiplexer = context.multiplexer
     self.logdir = context.logdir
     self._handlers = None
-    self.readers = {}
     self.run_paths = None
-    self._configs = None
     self.old_num_run_paths = None
-    self.config_fpaths = None
-    self.tensor_cache = LRUCache(_TENSOR_CACHE_CAPACITY)
+    self._config_snapshot = None
+    self._config_refresh_interval = config_refresh_interval
+    self._config_refresh_lock = threading.Lock()
+    self._config_refresh_thread = None
+    self._config_refresh_stop = None
+    # Map from (snapshot generation, run, tensor name) to a tensor.
+    self.tensor_cache = lru_cache.LRUCache(
+        _TENSOR_CACHE_BYTES, size_fn=lambda tensor: tensor.nbytes)
+    self.metadata_index_cache = lru_cache.LRUCache(
+        _METADATA_INDEX_CACHE_BYTES, size_fn=lambda index: index.offsets.nbytes)
 
     # Whether the plugin is active (has meaningful data to process and serve).
     # Once the plugin is deemed active, we no longer re-compute the value
@@ -298,19 +479,87 @@ class ProjectorPlugin(base_plugin.TBPlugin):
   @property
   def configs(self):
     """Returns a map of run paths to `ProjectorConfig` protos."""
+    return self._get_config_snapshot(start_refreshing=False).configs
+
+  def _get_config_snapshot(self, start_refreshing=True):
+    """Returns the latest `_ConfigSnapshot`.
+
+    Once the background thread refreshing the configs is running, this only
+    returns the snapshot it last published. Otherwise, the configs are
+    checked first, and the thread is started if `start_refreshing` is set.
+    """
+    snapshot = self._config_snapshot
+    if snapshot is not None and self._config_refresh_thread:
+      return snapshot
+    with self._config_refresh_lock:
+      if self._config_snapshot is None or not self._config_refresh_thread:
+        self._refresh_configs()
+      if (start_refreshing and self._config_refresh_interval and
+          self.multiplexer and not self._config_refresh_thread):
+        self._start_refreshing_configs()
+      return self._config_snapshot
+
+  def _start_refreshing_configs(self):
+    """Starts a daemon thread that calls `_refresh_configs` periodically.
+
+    The caller must hold `_config_refresh_lock`.
+    """
+    stop = threading.Event()
+    def _refresh_until_stopped():
+      while not stop.wait(self._config_refresh_interval):
+        try:
+          with self._config_refresh_lock:
+            self._refresh_configs()
+        except Exception as e:  # pylint: disable=broad-except
+          tf.logging.error('Failed to refresh projector configs: %s', e)
+
+    thread = threading.Thread(target=_refresh_until_stopped,
+                              name='ProjectorConfigRefresher')
+    thread.daemon = True
+    self._config_refresh_thread = thread
+    self._config_refresh_stop = stop
+    thread.start()
+
+  def stop_refreshing_configs(self):
+    """Stops the thread refreshing the configs and waits for it to exit.
+
+    Later requests check the configs themselves, and start a new thread.
+    """
+    with self._config_refresh_lock:
+      thread = self._config_refresh_thread
+      if thread is None:
+        return
+      self._config_refresh_stop.set()
+      self._config_refresh_thread = None
+      self._config_refresh_stop = None
+    thread.join()
+
+  def _refresh_configs(self):
+    """Publishes a new `_ConfigSnapshot` if the configs or checkpoints changed.
+
+    The caller must hold `_config_refresh_lock`.
+    """
     run_path_pairs = list(self.run_paths.items())
     self._append_plugin_asset_directories(run_path_pairs)
     # If there are no summary event files, the projector should still work,
     # treating the `logdir` as the model checkpoint directory.
     if not run_path_pairs:
       run_path_pairs.append(('.', self.logdir))
-    if (self._run_paths_changed() or
-        _latest_checkpoints_changed(self._configs, run_path_pairs)):
-      self.readers = {}
-      self._configs, self.config_fpaths = self._read_latest_config_files(
-          run_path_pairs)
-      self._augment_configs_with_checkpoint_info()
-    return self._configs
+    run_paths_changed = self._run_paths_changed()
+    snapshot = self._config_snapshot
+    if (snapshot is not None and not run_paths_changed and
+        not _latest_checkpoints_changed(snapshot.configs, run_path_pairs)):
+      return
+    # Cached tensors may come from checkpoints that are no longer the latest.
+    # Requests still using the old snapshot may cache tensors after this, but
+    # under its generation, so they are never served for the new one.
+    self.tensor_cache.clear()
+    generation = 0 if snapshot is None else snapshot.generation + 1
+    configs, config_fpaths = self._read_latest_config_files(run_path_pairs)
+    readers = self._augment_configs_with_checkpoint_info(
+        generation, configs, config_fpaths)
+    self._config_snapshot = _ConfigSnapshot(generation, configs, config_fpaths,
+                                            readers)
 
   def _run_paths_changed(self):
     num_run_paths = len(list(self.run_paths.keys()))
@@ -319,8 +568,20 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       return True
     return False
 
-  def _augment_configs_with_checkpoint_info(self):
-    for run, config in self._configs.items():
+  def _augment_configs_with_checkpoint_info(self, generation, configs,
+                                            config_fpaths):
+    """Adds the embeddings in the checkpoint of each run to its config.
+
+    Runs without any embeddings are removed from `configs` and
+    `config_fpaths`. Tensors read from tensor files are cached under
+    `generation`.
+
+    Returns:
+      A map from run names to checkpoint readers, or None for runs whose
+      checkpoint could not be opened.
+    """
+    readers = {}
+    for run, config in configs.items():
       for embedding in config.embeddings:
         # Normalize the name of the embeddings.
         if embedding.tensor_name.endswith(':0'):
@@ -328,14 +589,14 @@ class ProjectorPlugin(base_plugin.TBPlugin):
         # Find the size of embeddings associated with a tensors file.
         if embedding.tensor_path and not embedding.tensor_shape:
           fpath = _rel_to_abs_asset_path(embedding.tensor_path,
-                                         self.config_fpaths[run])
-          tensor = self.tensor_cache.get((run, embedding.tensor_name))
+                                         config_fpaths[run])
+          key = (generation, run, embedding.tensor_name)
+          tensor = self.tensor_cache.get(key)
           if tensor is None:
-            tensor = _read_tensor_tsv_file(fpath)
-            self.tensor_cache.set((run, embedding.tensor_name), tensor)
+            tensor = self.tensor_cache.put(key, _read_tensor_tsv_file(fpath))
           embedding.tensor_shape.extend([len(tensor), len(tensor[0])])
 
-      reader = self._get_reader_for_run(run)
+      reader = readers[run] = _open_checkpoint_reader(config)
       if not reader:
         continue
       # Augment the configuration with the tensors in the checkpoint file.
@@ -359,12 +620,14 @@ class ProjectorPlugin(base_plugin.TBPlugin):
 
     # Remove configs that do not have any valid (2D) tensors.
     runs_to_remove = []
-    for run, config in self._configs.items():
+    for run, config in configs.items():
       if not config.embeddings:
         runs_to_remove.append(run)
     for run in runs_to_remove:
-      del self._configs[run]
-      del self.config_fpaths[run]
+      del configs[run]
+      del config_fpaths[run]
+      del readers[run]
+    return readers
 
   def _read_latest_config_files(self, run_path_pairs):
     """Reads and returns the projector config files in every run directory."""
@@ -404,20 +667,15 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       config_fpaths[run_name] = config_fpath
     return configs, config_fpaths
 
-  def _get_reader_for_run(self, run):
-    if run in self.readers:
-      return self.readers[run]
-
-    config = self._configs[run]
-    reader = None
-    if config.model_checkpoint_path:
-      try:
-        reader = tf.pywrap_tensorflow.NewCheckpointReader(
-            config.model_checkpoint_path)
-      except Exception:  # pylint: disable=broad-except
-        tf.logging.warning('Failed reading "%s"', config.model_checkpoint_path)
-    self.readers[run] = reader
-    return reader
+  def _get_metadata_index(self, fpath):
+    """Returns the `_MetadataIndex` of a file, indexing it if it changed."""
+    stat = tf.gfile.Stat(fpath)
+    stat = (stat.mtime_nanos, stat.length)
+    index = self.metadata_index_cache.get(fpath)
+    if index is None or index.stat != stat:
+      index = self.metadata_index_cache.put(
+          fpath, _index_metadata_file(fpath, stat))
+    return index
 
   def _get_metadata_file_for_tensor(self, tensor_name, config):
     embedding_info = self._get_embedding(tensor_name, config)
@@ -465,10 +723,11 @@ class ProjectorPlugin(base_plugin.TBPlugin):
     if run is None:
       return Respond(request, 'query parameter "run" is required', 'text/plain',
                      400)
-    if run not in self.configs:
+    snapshot = self._get_config_snapshot()
+    if run not in snapshot.configs:
       return Respond(request, 'Unknown run: "%s"' % run, 'text/plain', 400)
 
-    config = self.configs[run]
+    config = snapshot.configs[run]
     return Respond(request,
                    json_format.MessageToJson(config), 'application/json')
 
@@ -489,33 +748,31 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       return Respond(request, 'query parameter num_rows must be integer > 0',
                      'text/plain', 400)
 
-    if run not in self.configs:
+    start_row = _parse_non_negative_int_param(request, 'start_row')
+    if start_row == -1:
+      return Respond(request, 'query parameter start_row must be integer >= 0',
+                     'text/plain', 400)
+
+    snapshot = self._get_config_snapshot()
+    if run not in snapshot.configs:
       return Respond(request, 'Unknown run: "%s"' % run, 'text/plain', 400)
 
-    config = self.configs[run]
+    config = snapshot.configs[run]
     fpath = self._get_metadata_file_for_tensor(name, config)
     if not fpath:
       return Respond(
           request,
           'No metadata file found for tensor "%s" in the config file "%s"' %
-          (name, self.config_fpaths[run]), 'text/plain', 400)
-    fpath = _rel_to_abs_asset_path(fpath, self.config_fpaths[run])
+          (name, snapshot.config_fpaths[run]), 'text/plain', 400)
+    fpath = _rel_to_abs_asset_path(fpath, snapshot.config_fpaths[run])
     if not tf.gfile.Exists(fpath) or tf.gfile.IsDirectory(fpath):
       return Respond(request, '"%s" not found, or is not a file' % fpath,
                      'text/plain', 400)
 
-    num_header_rows = 0
-    with tf.gfile.GFile(fpath, 'r') as f:
-      lines = []
-      # Stream reading the file with early break in case the file doesn't fit in
-      # memory.
-      for line in f:
-        lines.append(line)
-        if len(lines) == 1 and '\t' in lines[0]:
-          num_header_rows = 1
-        if num_rows and len(lines) >= num_rows + num_header_rows:
-          break
-    return Respond(request, ''.join(lines), 'text/plain')
+    index = self._get_metadata_index(fpath)
+    return Respond(request,
+                   _read_metadata_rows(fpath, index, start_row or 0, num_rows),
+                   'text/plain')
 
   @wrappers.Request.application
   def _serve_tensor(self, request):
@@ -534,26 +791,28 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       return Respond(request, 'query parameter num_rows must be integer > 0',
                      'text/plain', 400)
 
-    if run not in self.configs:
+    snapshot = self._get_config_snapshot()
+    if run not in snapshot.configs:
       return Respond(request, 'Unknown run: "%s"' % run, 'text/plain', 400)
 
-    config = self.configs[run]
+    config = snapshot.configs[run]
 
-    tensor = self.tensor_cache.get((run, name))
+    key = (snapshot.generation, run, name)
+    tensor = self.tensor_cache.get(key)
     if tensor is None:
       # See if there is a tensor file in the config.
       embedding = self._get_embedding(name, config)
 
       if embedding and embedding.tensor_path:
         fpath = _rel_to_abs_asset_path(embedding.tensor_path,
-                                       self.config_fpaths[run])
+                                       snapshot.config_fpaths[run])
         if not tf.gfile.Exists(fpath):
           return Respond(request,
                          'Tensor file "%s" does not exist' % fpath,
                          'text/plain', 400)
         tensor = _read_tensor_tsv_file(fpath)
       else:
-        reader = self._get_reader_for_run(run)
+        reader = snapshot.readers[run]
         if not reader or not reader.has_tensor(name):
           return Respond(request,
                          'Tensor "%s" not found in checkpoint dir "%s"' %
@@ -564,14 +823,15 @@ class ProjectorPlugin(base_plugin.TBPlugin):
         except tf.errors.InvalidArgumentError as e:
           return Respond(request, str(e), 'text/plain', 400)
 
-      self.tensor_cache.set((run, name), tensor)
+      # Convert once here rather than on every request. This copies nothing
+      # for float32 tensors, including memory-mapped ones.
+      tensor = self.tensor_cache.put(
+          key, np.ascontiguousarray(tensor, dtype='float32'))
 
     if num_rows:
       tensor = tensor[:num_rows]
-    if tensor.dtype != 'float32':
-      tensor = tensor.astype(dtype='float32', copy=False)
-    data_bytes = tensor.tobytes()
-    return Respond(request, data_bytes, 'application/octet-stream')
+    return Respond(request, _tensor_chunks(tensor), 'application/octet-stream',
+                   content_length=tensor.nbytes)
 
   @wrappers.Request.application
   def _serve_bookmarks(self, request):
@@ -585,17 +845,18 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       return Respond(request, 'query parameter "name" is required',
                      'text/plain', 400)
 
-    if run not in self.configs:
+    snapshot = self._get_config_snapshot()
+    if run not in snapshot.configs:
       return Respond(request, 'Unknown run: "%s"' % run, 'text/plain', 400)
 
-    config = self.configs[run]
+    config = snapshot.configs[run]
     fpath = self._get_bookmarks_file_for_tensor(name, config)
     if not fpath:
       return Respond(
           request,
           'No bookmarks file found for tensor "%s" in the config file "%s"' %
-          (name, self.config_fpaths[run]), 'text/plain', 400)
-    fpath = _rel_to_abs_asset_path(fpath, self.config_fpaths[run])
+          (name, snapshot.config_fpaths[run]), 'text/plain', 400)
+    fpath = _rel_to_abs_asset_path(fpath, snapshot.config_fpaths[run])
     if not tf.gfile.Exists(fpath) or tf.gfile.IsDirectory(fpath):
       return Respond(request, '"%s" not found, or is not a file' % fpath,
                      'text/plain', 400)
@@ -617,20 +878,21 @@ class ProjectorPlugin(base_plugin.TBPlugin):
       return Respond(request, 'query parameter "name" is required',
                      'text/plain', 400)
 
-    if run not in self.configs:
+    snapshot = self._get_config_snapshot()
+    if run not in snapshot.configs:
       return Respond(request, 'Unknown run: "%s"' % run, 'text/plain', 400)
 
-    config = self.configs[run]
+    config = snapshot.configs[run]
     embedding_info = self._get_embedding(name, config)
 
     if not embedding_info or not embedding_info.sprite.image_path:
       return Respond(
           request,
           'No sprite image file found for tensor "%s" in the config file "%s"' %
-          (name, self.config_fpaths[run]), 'text/plain', 400)
+          (name, snapshot.config_fpaths[run]), 'text/plain', 400)
 
     fpath = os.path.expanduser(embedding_info.sprite.image_path)
-    fpath = _rel_to_abs_asset_path(fpath, self.config_fpaths[run])
+    fpath = _rel_to_abs_asset_path(fpath, snapshot.config_fpaths[run])
     if not tf.gfile.Exists(fpath) or tf.gfile.IsDirectory(fpath):
       return Respond(request, '"%s" does not exist or is directory' % fpath,
                      'text/plain', 400)
@@ -131,6 +131,16 @@ class ProjectorAppTest(tf.test.TestCase):
     expected_tensor = np.array([[6, 6]], dtype=np.float32)
     self._AssertTensorResponse(tensor_bytes, expected_tensor)
 
+  def testTensorWithNumRows(self):
+    self._GenerateProjectorTestData()
+    self._SetupWSGIApp()
+
+    url = '/data/plugin/projector/tensor?run=.&name=var3&num_rows=5'
+    response = self._Get(url)
+    self.assertEqual(5 * 100 * 4, len(response.data))
+    self.assertEqual(str(5 * 100 * 4), response.headers.get('Content-Length'))
+    self.assertEqual('bytes', response.headers.get('Accept-Ranges'))
+
   def testBookmarksRequestMissingRunAndName(self):
     self._GenerateProjectorTestData()
     self._SetupWSGIApp()
@@ -242,13 +252,55 @@ class ProjectorAppTest(tf.test.TestCase):
     # beforehand), so the mock should now be called twice.
     self.assertEqual(2, mock.call_count)
 
-  def _SetupWSGIApp(self):
+  def testConfigsAreRefreshedInTheBackground(self):
+    self._GenerateProjectorTestData()
+    self._SetupWSGIApp(config_refresh_interval=60)
+    self.assertIsNone(self.plugin._config_refresh_thread)
+
+    # The first request publishes a snapshot and starts the thread, and later
+    # ones reuse the snapshot without looking for new checkpoints.
+    run_json = self._GetJson('/data/plugin/projector/runs')
+    thread = self.plugin._config_refresh_thread
+    self.assertTrue(thread.is_alive())
+    snapshot = self.plugin._config_snapshot
+    with tf.test.mock.patch.object(
+        projector_plugin, '_latest_checkpoints_changed') as changed:
+      self.assertEqual(run_json, self._GetJson('/data/plugin/projector/runs'))
+      self.assertFalse(changed.called)
+    self.assertIs(snapshot, self.plugin._config_snapshot)
+
+    # Refreshing without changes on disk keeps the snapshot.
+    self.plugin._refresh_configs()
+    self.assertIs(snapshot, self.plugin._config_snapshot)
+
+    self.plugin.stop_refreshing_configs()
+    self.assertFalse(thread.is_alive())
+    self.assertIsNone(self.plugin._config_refresh_thread)
+
+  def testTensorsOfOldSnapshotsAreNotServed(self):
+    self._GenerateProjectorTestData()
+    self._SetupWSGIApp()
+    url = '/data/plugin/projector/tensor?run=.&name=var1'
+    expected = self._Get(url).data
+    old = self.plugin._config_snapshot
+    self.plugin.old_num_run_paths = None
+    self.plugin._get_config_snapshot()
+    self.assertEqual(old.generation + 1,
+                     self.plugin._config_snapshot.generation)
+    # A request that read the old snapshot caches a tensor after the swap.
+    self.plugin.tensor_cache.put((old.generation, '.', 'var1'),
+                                 np.zeros((1, 2), dtype='float32'))
+    self.assertEqual(expected, self._Get(url).data)
+
+  def _SetupWSGIApp(self, config_refresh_interval=0):
     multiplexer = event_multiplexer.EventMultiplexer(
         size_guidance=application.DEFAULT_SIZE_GUIDANCE,
         purge_orphaned_data=True)
     context = base_plugin.TBContext(
         logdir=self.log_dir, multiplexer=multiplexer)
-    self.plugin = projector_plugin.ProjectorPlugin(context)
+    self.plugin = projector_plugin.ProjectorPlugin(
+        context, config_refresh_interval=config_refresh_interval)
+    self.addCleanup(self.plugin.stop_refreshing_configs)
     wsgi_app = application.TensorBoardWSGIApp(
         self.log_dir, [self.plugin], multiplexer, reload_interval=0,
         path_prefix='')
@@ -357,41 +409,115 @@ class MetadataColumnsTest(tf.test.TestCase):
       metadata.add_column('Labels', np.array(['a', 'b']))
 
 
-class LRUCacheTest(tf.test.TestCase):
+class TensorTsvFileTest(tf.test.TestCase):
 
-  def testInvalidSize(self):
-    with self.assertRaises(ValueError):
-      projector_plugin.LRUCache(0)
+  def setUp(self):
+    super(TensorTsvFileTest, self).setUp()
+    self.fpath = os.path.join(self.get_temp_dir(), 'tensor.tsv')
+
+  def _write(self, text):
+    with open(self.fpath, 'w') as f:
+      f.write(text)
 
-  def testSimpleGetAndSet(self):
-    cache = projector_plugin.LRUCache(1)
-    value = cache.get('a')
-    self.assertIsNone(value)
-    cache.set('a', 10)
-    self.assertEqual(cache.get('a'), 10)
+  def testParsesRowsOfTabSeparatedNumbers(self):
+    self._write('1\t2.5\n\n-3\t4e2\n')
+    tensor = projector_plugin._read_tensor_tsv_file(self.fpath)
+    self.assertEqual(np.float32, tensor.dtype)
+    self.assertAllEqual([[1, 2.5], [-3, 400]], tensor)
 
-  def testErrorsWhenSettingNoneAsValue(self):
-    cache = projector_plugin.LRUCache(1)
+  def testRaggedRowsAreRejected(self):
+    self._write('1\t2\n3\n')
     with self.assertRaises(ValueError):
-      cache.set('a', None)
-
-  def testLRUReplacementPolicy(self):
-    cache = projector_plugin.LRUCache(2)
-    cache.set('a', 1)
-    cache.set('b', 2)
-    cache.set('c', 3)
-    self.assertIsNone(cache.get('a'))
-    self.assertEqual(cache.get('b'), 2)
-    self.assertEqual(cache.get('c'), 3)
-
-    # Make 'b' the most recently used.
-    cache.get('b')
-    cache.set('d', 4)
-
-    # Make sure 'c' got replaced with 'd'.
-    self.assertIsNone(cache.get('c'))
-    self.assertEqual(cache.get('b'), 2)
-    self.assertEqual(cache.get('d'), 4)
+      projector_plugin._read_tensor_tsv_file(self.fpath)
+
+  def testNpyCacheIsReusedUntilTheFileChanges(self):
+    self._write('1\t2\n')
+    projector_plugin._read_tensor_tsv_file(self.fpath)
+    cache_path = self.fpath + '.npy'
+    self.assertAllEqual([[1, 2]], np.load(cache_path))
+
+    # A cache with the same modification time is used instead of the TSV.
+    mtime = os.stat(self.fpath).st_mtime
+    np.save(cache_path, np.array([[5, 6]], dtype='float32'))
+    os.utime(cache_path, (mtime, mtime))
+    self.assertAllEqual([[5, 6]],
+                        projector_plugin._read_tensor_tsv_file(self.fpath))
+
+    self._write('3\t4\n')
+    os.utime(self.fpath, (mtime + 10, mtime + 10))
+    self.assertAllEqual([[3, 4]],
+                        projector_plugin._read_tensor_tsv_file(self.fpath))
+    self.assertAllEqual([[3, 4]], np.load(cache_path))
+
+  def testNpyCacheOfAFileRewrittenWhileReadIsStale(self):
+    self._write('1\t2\n')
+    mtime = os.stat(self.fpath).st_mtime
+    parse = projector_plugin._parse_tensor_tsv
+
+    def parse_and_rewrite(text):
+      self._write('3\t4\n')
+      os.utime(self.fpath, (mtime + 10, mtime + 10))
+      return parse(text)
+
+    with tf.test.mock.patch.object(projector_plugin, '_parse_tensor_tsv',
+                                   parse_and_rewrite):
+      self.assertAllEqual([[1, 2]],
+                          projector_plugin._read_tensor_tsv_file(self.fpath))
+    self.assertAllEqual([[3, 4]],
+                        projector_plugin._read_tensor_tsv_file(self.fpath))
+
+
+class MetadataIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(MetadataIndexTest, self).setUp()
+    self.fpath = os.path.join(self.get_temp_dir(), 'metadata.tsv')
+    context = base_plugin.TBContext(logdir=self.get_temp_dir())
+    self.plugin = projector_plugin.ProjectorPlugin(context)
+
+  def _write(self, text):
+    with open(self.fpath, 'wb') as f:
+      f.write(text)
+
+  def _read(self, start_row=0, num_rows=None):
+    index = self.plugin._get_metadata_index(self.fpath)
+    return projector_plugin._read_metadata_rows(self.fpath, index, start_row,
+                                                num_rows)
+
+  def testRowsWithHeader(self):
+    self._write(b'label\tcolor\na\tred\nb\tgreen\nc\tblue')
+    self.assertEqual(b'label\tcolor\na\tred\nb\tgreen\nc\tblue',
+                     self._read())
+    self.assertEqual(b'label\tcolor\na\tred\n', self._read(num_rows=1))
+    self.assertEqual(b'label\tcolor\nb\tgreen\nc\tblue',
+                     self._read(start_row=1, num_rows=5))
+    self.assertEqual(b'label\tcolor\n', self._read(start_row=3))
+
+  def testRowsWithoutHeader(self):
+    self._write(b'a\nb\nc\n')
+    self.assertEqual(b'b\nc\n', self._read(start_row=1))
+    self.assertEqual(b'a\nb\n', self._read(num_rows=2))
+
+  def testIndexIsRebuiltWhenTheFileChanges(self):
+    self._write(b'a\nb\n')
+    index = self.plugin._get_metadata_index(self.fpath)
+    self.assertIs(index, self.plugin._get_metadata_index(self.fpath))
+    self._write(b'a\nb\nc\n')
+    self.assertEqual(b'c\n', self._read(start_row=2))
+
+
+class TensorChunksTest(tf.test.TestCase):
+
+  def testChunksHoldWholeRows(self):
+    tensor = np.arange(12, dtype=np.float32).reshape((4, 3))
+    with tf.test.mock.patch.object(projector_plugin, '_TENSOR_CHUNK_BYTES', 30):
+      chunks = list(projector_plugin._tensor_chunks(tensor))
+    self.assertEqual([24, 24], [len(chunk) for chunk in chunks])
+    self.assertEqual(tensor.tobytes(), b''.join(chunks))
+
+  def testEmptyTensorHasNoChunks(self):
+    tensor = np.zeros((0, 3), dtype=np.float32)
+    self.assertEqual([], list(projector_plugin._tensor_chunks(tensor)))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,117 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Cached lookup of batched tensor events by sample, index and step.
+
+Plugins like images and audio store a batch of blobs in each tensor event,
+and serve one blob at a time by run, tag, sample (position in the batch) and
+index (position among the events that have that sample). A `SampleIndex`
+builds the list of events for each (run, tag, sample) once, and keeps it
+until the run's accumulator is reloaded with new events or the run is
+removed.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import threading
+
+_Entry = collections.namedtuple('_Entry', ['events', 'positions_by_step'])
+
+
+class SampleIndex(object):
+  """Indexes the tensor events of a multiplexer by sample, index and step."""
+
+  def __init__(self, multiplexer, num_samples_fn):
+    """Creates an empty index.
+
+    Args:
+      multiplexer: The `EventMultiplexer` holding the tensor events.
+      num_samples_fn: A function from a `TensorEvent` to the number of samples
+        it holds.
+    """
+    self._multiplexer = multiplexer
+    self._num_samples_fn = num_samples_fn
+    self._mutex = threading.Lock()
+    # Map from run to a (generation, {(tag, sample): _Entry}) pair.
+    self._runs = {}
+
+  def Events(self, run, tag, sample):
+    """Returns the events of a tag that hold at least `sample + 1` samples.
+
+    The returned list must not be modified.
+
+    Raises:
+      KeyError: If the run or tag does not exist.
+    """
+    return self._Entry(run, tag, sample).events
+
+  def EventAt(self, run, tag, sample, index=None, step=None):
+    """Returns one of the events of `Events(run, tag, sample)`.
+
+    Args:
+      run: The name of the run.
+      tag: The name of the tag.
+      sample: The zero-indexed sample that the event must hold.
+      index: The position of the event among those holding `sample`. Negative
+        values count from the end.
+      step: If set, the step of the event, used instead of `index`. If
+        several events have this step, the last one is returned.
+
+    Raises:
+      KeyError: If the run or tag does not exist, or no event has the given
+        index or step.
+    """
+    entry = self._Entry(run, tag, sample)
+    if step is not None:
+      index = entry.positions_by_step.get(step)
+      if index is None:
+        raise KeyError('No event with step %d for run %r and tag %r'
+                       % (step, run, tag))
+    try:
+      return entry.events[index]
+    except IndexError:
+      raise KeyError('No event at index %d for run %r and tag %r'
+                     % (index, run, tag))
+
+  def _Entry(self, run, tag, sample):
+    # Read the generation before the events, so that an entry is never
+    # newer than the generation it is stored under.
+    generations = self._multiplexer.RunGenerations()
+    if run not in generations:
+      raise KeyError('No run %r' % run)
+    generation = generations[run]
+    key = (tag, sample)
+    with self._mutex:
+      for removed_run in set(self._runs) - set(generations):
+        del self._runs[removed_run]
+      (cached_generation, entries) = self._runs.get(run, (None, {}))
+      if cached_generation == generation and key in entries:
+        return entries[key]
+    events = [event for event in self._multiplexer.Tensors(run, tag)
+              if self._num_samples_fn(event) > sample]
+    entry = _Entry(events, {event.step: i for (i, event) in enumerate(events)})
+    with self._mutex:
+      (cached_generation, entries) = self._runs.get(run, (None, {}))
+      if cached_generation is not None and cached_generation > generation:
+        # Another request already saw newer data; generations only grow.
+        return entry
+      if cached_generation != generation:
+        # Drop the entries of older generations, and the events they hold.
+        entries = {}
+        self._runs[run] = (generation, entries)
+      entries[key] = entry
+    return entry
@@ -0,0 +1,115 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for sample_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import tensorflow as tf
+
+from tensorboard.plugins import sample_index
+
+_Event = collections.namedtuple('_Event', ['step', 'samples'])
+
+
+class _FakeAccumulator(object):
+
+  def __init__(self):
+    self.generation = 1
+    self.events = {}
+
+  def Generation(self):
+    return self.generation
+
+
+class _FakeMultiplexer(object):
+
+  def __init__(self):
+    self.accumulator = _FakeAccumulator()
+    self.accumulators = {'run': self.accumulator}
+    self.tensors_calls = 0
+
+  def GetAccumulator(self, run):
+    return self.accumulators[run]
+
+  def RunGenerations(self):
+    return {run: accumulator.Generation()
+            for (run, accumulator) in self.accumulators.items()}
+
+  def Tensors(self, run, tag):
+    self.tensors_calls += 1
+    return list(self.GetAccumulator(run).events[tag])
+
+
+class SampleIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(SampleIndexTest, self).setUp()
+    self.multiplexer = _FakeMultiplexer()
+    self.multiplexer.accumulator.events['tag'] = [
+        _Event(step=0, samples=1),
+        _Event(step=1, samples=3),
+        _Event(step=2, samples=2),
+    ]
+    self.index = sample_index.SampleIndex(self.multiplexer,
+                                          lambda event: event.samples)
+
+  def testEventsAreFilteredBySample(self):
+    self.assertEqual([0, 1, 2],
+                     [e.step for e in self.index.Events('run', 'tag', 0)])
+    self.assertEqual([1, 2],
+                     [e.step for e in self.index.Events('run', 'tag', 1)])
+    self.assertEqual([1], [e.step for e in self.index.Events('run', 'tag', 2)])
+
+  def testEventAtIndexOrStep(self):
+    self.assertEqual(2, self.index.EventAt('run', 'tag', 1, index=1).step)
+    self.assertEqual(2, self.index.EventAt('run', 'tag', 1, index=-1).step)
+    self.assertEqual(1, self.index.EventAt('run', 'tag', 1, step=1).step)
+    with self.assertRaises(KeyError):
+      self.index.EventAt('run', 'tag', 1, step=0)
+    with self.assertRaises(KeyError):
+      self.index.EventAt('run', 'tag', 1, index=2)
+    with self.assertRaises(KeyError):
+      self.index.EventAt('nope', 'tag', 0, index=0)
+
+  def testEntriesAreCachedUntilGenerationChanges(self):
+    for index in range(3):
+      self.index.EventAt('run', 'tag', 0, index=index)
+    self.assertEqual(1, self.multiplexer.tensors_calls)
+    self.multiplexer.accumulator.events['tag'].append(_Event(step=3, samples=1))
+    self.assertEqual(3, len(self.index.Events('run', 'tag', 0)))
+    self.multiplexer.accumulator.generation = 2
+    self.assertEqual(4, len(self.index.Events('run', 'tag', 0)))
+    self.assertEqual(2, self.multiplexer.tensors_calls)
+
+  def testRemovedRunsArePruned(self):
+    other = _FakeAccumulator()
+    other.events['tag'] = [_Event(step=0, samples=1)]
+    self.multiplexer.accumulators['other'] = other
+    self.index.Events('other', 'tag', 0)
+    self.index.Events('run', 'tag', 0)
+    self.assertEqual(set(['run', 'other']), set(self.index._runs))
+    del self.multiplexer.accumulators['other']
+    self.index.Events('run', 'tag', 0)
+    self.assertEqual(set(['run']), set(self.index._runs))
+    with self.assertRaises(KeyError):
+      self.index.Events('other', 'tag', 0)
+
+
+if __name__ == '__main__':
+  tf.test.main()
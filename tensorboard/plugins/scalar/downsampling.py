@@ -0,0 +1,177 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Shape-preserving downsampling of scalar series.
+
+Each function takes parallel arrays of x and y coordinates, sorted by x, and
+returns a sorted array of the indices of the points to keep. The first and
+last points are always kept.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+LTTB = 'lttb'
+MIN_MAX = 'minmax'
+
+
+def downsample_indices(x, y, max_points, method=LTTB):
+  """Returns the indices of at most `max_points` points to keep.
+
+  Args:
+    x: A 1-D array of x coordinates, sorted in nondecreasing order.
+    y: A 1-D array of y coordinates, of the same length as `x`.
+    max_points: The maximum number of points to keep. Must be positive.
+    method: Either `LTTB` or `MIN_MAX`.
+
+  Raises:
+    ValueError: If `max_points` is not positive or `method` is unknown.
+
+  Returns:
+    A sorted 1-D int64 array of indices into `x` and `y`.
+  """
+  check_arguments(max_points, method)
+  if method == LTTB:
+    return lttb_indices(x, y, max_points)
+  else:
+    return min_max_indices(x, y, max_points)
+
+
+def check_arguments(max_points, method):
+  """Raises ValueError unless `downsample_indices` accepts these arguments."""
+  if max_points < 1:
+    raise ValueError('max_points must be positive, got %r' % max_points)
+  if method not in (LTTB, MIN_MAX):
+    raise ValueError('Unknown downsampling method: %r' % method)
+
+
+def _evenly_spaced_indices(n, max_points):
+  return np.unique(np.round(np.linspace(0, n - 1, max_points)).astype(np.int64))
+
+
+def lttb_indices(x, y, max_points):
+  """Largest-triangle-three-buckets downsampling.
+
+  The interior points are split into `max_points - 2` buckets. From each
+  bucket, the point forming the largest triangle with the previously selected
+  point and the mean of the next bucket is kept. Bucket means are computed for
+  all buckets at once; only the selection itself walks the buckets in order.
+
+  Non-finite values, as logged by diverged runs, are kept where they start
+  and end: the first and last point of each run of consecutive NaNs (or of
+  infinities of one sign) are selected, and the finite points are
+  downsampled with the rest of the budget. If the ends of all runs do not
+  fit in the budget, only those of the runs at either end of the series and
+  of the longest other runs are kept, leaving room for the first and last
+  finite points.
+
+  See: Sveinn Steinarsson, "Downsampling Time Series for Visual
+  Representation", 2013.
+  """
+  x = np.asarray(x, dtype=np.float64)
+  y = np.asarray(y, dtype=np.float64)
+  n = len(x)
+  if max_points >= n:
+    return np.arange(n, dtype=np.int64)
+  finite = np.isfinite(y)
+  if finite.all():
+    return _lttb_finite_indices(x, y, max_points)
+
+  # Number the runs of non-finite values of the same kind, and keep the
+  # ends of each run.
+  kinds = np.where(finite, 0, np.where(np.isnan(y), 2, np.sign(y)))
+  changes = np.flatnonzero(np.diff(kinds)) + 1
+  starts = np.concatenate([[0], changes])
+  ends = np.concatenate([changes - 1, [n - 1]])
+  in_run = ~finite[starts]
+  (run_starts, run_ends) = (starts[in_run], ends[in_run])
+  finite_indices = np.flatnonzero(finite)
+  run_budget = max_points - min(2, len(finite_indices), max_points)
+  sizes = np.where(run_starts == run_ends, 1, 2)
+  if sizes.sum() > run_budget:
+    at_ends = (run_starts == 0) | (run_ends == n - 1)
+    order = np.lexsort((run_starts - run_ends, ~at_ends))
+    chosen = order[np.cumsum(sizes[order]) <= run_budget]
+    (run_starts, run_ends) = (run_starts[chosen], run_ends[chosen])
+  kept = np.union1d(run_starts, run_ends)
+
+  budget = max_points - len(kept)
+  selected = finite_indices[
+      _lttb_finite_indices(x[finite_indices], y[finite_indices], budget)]
+  return np.union1d(selected, kept).astype(np.int64)
+
+
+def _lttb_finite_indices(x, y, max_points):
+  """`lttb_indices` for float64 arrays of finite values."""
+  n = len(x)
+  if max_points >= n:
+    return np.arange(n, dtype=np.int64)
+  if max_points < 3:
+    return _evenly_spaced_indices(n, max_points)
+
+  num_buckets = max_points - 2
+  # Bucket b covers interior points [edges[b], edges[b + 1]).
+  edges = (1 + np.floor(np.arange(num_buckets + 1) *
+                        ((n - 2) / num_buckets))).astype(np.int64)
+  edges[-1] = n - 1
+  # The "next bucket" of the last bucket is the final point. The next
+  # buckets are nonempty and contiguous, so each ends where the following
+  # one starts and the last one ends at n.
+  next_starts = np.append(edges[1:-1], n - 1)
+  counts = np.diff(np.append(next_starts, n))
+  next_x = np.add.reduceat(x, next_starts) / counts
+  next_y = np.add.reduceat(y, next_starts) / counts
+
+  selected = np.empty(max_points, dtype=np.int64)
+  selected[0] = 0
+  selected[-1] = n - 1
+  a = 0
+  for b in range(num_buckets):
+    start, end = edges[b], edges[b + 1]
+    xs = x[start:end]
+    ys = y[start:end]
+    areas = np.abs((x[a] - next_x[b]) * (ys - y[a]) -
+                   (x[a] - xs) * (next_y[b] - y[a]))
+    a = start + int(np.argmax(areas))
+    selected[b + 1] = a
+  return selected
+
+
+def min_max_indices(x, y, max_points):
+  """Per-bucket min/max downsampling.
+
+  The points are split into `(max_points - 2) // 2` buckets of consecutive
+  points, and the minimum and maximum of each bucket are kept, along with the
+  first and last points. This preserves the envelope of noisy series.
+  """
+  del x  # Unused; buckets are formed by position.
+  y = np.asarray(y, dtype=np.float64)
+  n = len(y)
+  if max_points >= n:
+    return np.arange(n, dtype=np.int64)
+  if max_points < 4:
+    return _evenly_spaced_indices(n, max_points)
+
+  num_buckets = (max_points - 2) // 2
+  bucket_ids = (np.arange(n) * num_buckets) // n
+  # Sort by bucket, then by value: the first and last entry of each bucket
+  # are the positions of its minimum and maximum.
+  order = np.lexsort((y, bucket_ids))
+  boundaries = np.flatnonzero(np.diff(bucket_ids[order])) + 1
+  firsts = np.concatenate([[0], boundaries])
+  lasts = np.concatenate([boundaries - 1, [n - 1]])
+  return np.unique(np.concatenate([[0, n - 1], order[firsts], order[lasts]]))
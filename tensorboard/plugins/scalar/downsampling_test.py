@@ -0,0 +1,126 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for scalar downsampling."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard.plugins.scalar import downsampling
+
+
+def _ReferenceLttb(x, y, threshold):
+  """A straightforward scalar implementation of LTTB."""
+  n = len(x)
+  every = (n - 2) / (threshold - 2)
+  a = 0
+  selected = [0]
+  for i in range(threshold - 2):
+    avg_start = int(np.floor((i + 1) * every)) + 1
+    avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+    avg_x = np.mean(x[avg_start:avg_end])
+    avg_y = np.mean(y[avg_start:avg_end])
+    range_start = int(np.floor(i * every)) + 1
+    range_end = int(np.floor((i + 1) * every)) + 1
+    best_area = -1
+    best_index = None
+    for j in range(range_start, range_end):
+      area = abs((x[a] - avg_x) * (y[j] - y[a]) -
+                 (x[a] - x[j]) * (avg_y - y[a]))
+      if area > best_area:
+        best_area = area
+        best_index = j
+    selected.append(best_index)
+    a = best_index
+  selected.append(n - 1)
+  return selected
+
+
+class DownsamplingTest(tf.test.TestCase):
+
+  def setUp(self):
+    super(DownsamplingTest, self).setUp()
+    random = np.random.RandomState(0)
+    self.x = np.arange(1000, dtype=np.float64)
+    self.y = np.cumsum(random.randn(1000))
+
+  def testLttbMatchesReference(self):
+    for max_points in (3, 7, 50, 999):
+      self.assertEqual(
+          _ReferenceLttb(self.x, self.y, max_points),
+          downsampling.lttb_indices(self.x, self.y, max_points).tolist())
+
+  def testLttbKeepsNonFiniteValues(self):
+    y = np.sin(self.x / 50)
+    y[10] = np.nan
+    y[500:510] = np.inf
+    y[990:] = np.nan
+    indices = downsampling.lttb_indices(self.x, y, 50)
+    finite = np.flatnonzero(np.isfinite(y))
+    expected = finite[downsampling.lttb_indices(self.x[finite], y[finite], 45)]
+    self.assertEqual(sorted(expected.tolist() + [10, 500, 509, 990, 999]),
+                     indices.tolist())
+
+  def testLttbKeepsTheLongestNonFiniteRunsThatFit(self):
+    y = np.sin(self.x / 50)
+    y[1:998:2] = np.nan
+    y[100:120] = np.inf
+    y[300:305] = -np.inf
+    y[999] = np.nan
+    for max_points in (1, 2, 3, 10, 50):
+      indices = downsampling.lttb_indices(self.x, y, max_points)
+      self.assertLessEqual(len(indices), max_points)
+      self.assertEqual(sorted(set(indices.tolist())), indices.tolist())
+    indices = downsampling.lttb_indices(self.x, y, 10).tolist()
+    self.assertEqual(10, len(indices))
+    self.assertEqual(0, indices[0])
+    for expected in (999, 100, 119, 300, 304):
+      self.assertIn(expected, indices)
+
+  def testSmallSeriesAreUnchanged(self):
+    for method in (downsampling.LTTB, downsampling.MIN_MAX):
+      self.assertEqual(
+          list(range(10)),
+          downsampling.downsample_indices(
+              self.x[:10], self.y[:10], 10, method).tolist())
+
+  def testMinMaxKeepsExtremaAndEndpoints(self):
+    indices = downsampling.min_max_indices(self.x, self.y, 20)
+    self.assertLessEqual(len(indices), 20)
+    self.assertEqual(sorted(indices.tolist()), indices.tolist())
+    for expected in (0, 999, np.argmin(self.y), np.argmax(self.y)):
+      self.assertIn(expected, indices)
+
+  def testTinyMaxPoints(self):
+    for method in (downsampling.LTTB, downsampling.MIN_MAX):
+      self.assertEqual(
+          [0, 999],
+          downsampling.downsample_indices(
+              self.x, self.y, 2, method).tolist())
+      self.assertEqual(
+          1, len(downsampling.downsample_indices(self.x, self.y, 1, method)))
+
+  def testInvalidArguments(self):
+    with self.assertRaises(ValueError):
+      downsampling.downsample_indices(self.x, self.y, 0)
+    with self.assertRaises(ValueError):
+      downsampling.downsample_indices(self.x, self.y, 10, 'bogus')
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -23,15 +23,16 @@ from __future__ import division
 from __future__ import print_function
 
 import csv
+import json
 
-import six
 from six import StringIO
 from werkzeug import wrappers
 
-import tensorflow as tf
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
+from tensorboard.backend import json_util
 from tensorboard.plugins import base_plugin
+from tensorboard.plugins.scalar import downsampling
 from tensorboard.plugins.scalar import metadata
 
 
@@ -45,6 +46,7 @@ class ScalarsPlugin(base_plugin.TBPlugin):
   """Scalars Plugin for TensorBoard."""
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates ScalarsPlugin via TensorBoard core.
@@ -57,36 +59,40 @@ class ScalarsPlugin(base_plugin.TBPlugin):
   def get_plugin_apps(self):
     return {
         '/scalars': self.scalars_route,
+        '/scalars_multirun': self.scalars_multirun_route,
         '/tags': self.tags_route,
     }
 
   def is_active(self):
     """The scalars plugin is active iff any run has at least one scalar tag."""
-    return bool(self._multiplexer) and any(self.index_impl().values())
+    if not self._multiplexer:
+      return False
+    return bool(self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME))
 
   def index_impl(self):
     """Return {runName: {tagName: {displayName: ..., description: ...}}}."""
-    runs = self._multiplexer.Runs()
-    result = {run: {} for run in runs}
-
-    mapping = self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME)
-    for (run, tag_to_content) in six.iteritems(mapping):
-      for (tag, content) in six.iteritems(tag_to_content):
-        content = metadata.parse_plugin_metadata(content)
-        summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
-        result[run][tag] = {'displayName': summary_metadata.display_name,
-                            'description': plugin_util.markdown_to_safe_html(
-                                summary_metadata.summary_description)}
-
-    return result
-
-  def scalars_impl(self, tag, run, output_format):
-    """Result of the form `(body, mime_type)`."""
-    tensor_events = self._multiplexer.Tensors(run, tag)
-    values = [[tensor_event.wall_time,
-               tensor_event.step,
-               tf.make_ndarray(tensor_event.tensor_proto).item()]
-              for tensor_event in tensor_events]
+    return self._multiplexer.PluginRunToTagToRendered(metadata.PLUGIN_NAME,
+                                                       _tag_listing_entry)
+
+  def scalars_impl(self, tag, run, output_format, max_points=None,
+                   method=downsampling.LTTB):
+    """Result of the form `(body, mime_type)`.
+
+    Args:
+      tag: The name of the tag.
+      run: The name of the run.
+      output_format: An `OutputFormat` value.
+      max_points: If set, the series is downsampled to at most this many
+        points before encoding.
+      method: The downsampling method, either `downsampling.LTTB` or
+        `downsampling.MIN_MAX`.
+
+    Raises:
+      KeyError: If the run or tag does not exist.
+      ValueError: If `max_points` is not positive or `method` is unknown.
+    """
+    series = self._multiplexer.ScalarSeries(run, tag)
+    values = _series_to_points(series, max_points, method)
     if output_format == OutputFormat.CSV:
       string_io = StringIO()
       writer = csv.writer(string_io)
@@ -96,6 +102,56 @@ class ScalarsPlugin(base_plugin.TBPlugin):
     else:
       return (values, 'application/json')
 
+  def scalars_multirun_impl(self, runs, tags, max_points=None,
+                            method=downsampling.LTTB):
+    """Returns the scalars of several runs and tags as streamed JSON.
+
+    The result is an iterable of JSON text chunks encoding an object of the
+    form `{run: {tag: [[wall_time, step, value], ...]}}`. Each run's
+    accumulator is looked up once, and runs or tags without scalar data are
+    omitted. Series are read and encoded lazily, as the chunks are consumed.
+
+    Args:
+      runs: A list of run names.
+      tags: A list of tag names, looked up in each run.
+      max_points: If set, each series is downsampled to at most this many
+        points before encoding.
+      method: The downsampling method, either `downsampling.LTTB` or
+        `downsampling.MIN_MAX`.
+
+    Raises:
+      ValueError: If `max_points` is not positive or `method` is unknown.
+    """
+    if max_points is not None:
+      downsampling.check_arguments(max_points, method)
+    return self._scalars_multirun_chunks(runs, tags, max_points, method)
+
+  def _scalars_multirun_chunks(self, runs, tags, max_points, method):
+    yield '{'
+    run_separator = ''
+    for run in _unique(runs):
+      try:
+        accumulator = self._multiplexer.GetAccumulator(run)
+      except KeyError:
+        continue
+      yield '%s%s: {' % (run_separator, json.dumps(run))
+      run_separator = ', '
+      tag_separator = ''
+      for tag in _unique(tags):
+        try:
+          plugin_name = accumulator.SummaryMetadata(tag).plugin_data.plugin_name
+          if plugin_name != metadata.PLUGIN_NAME:
+            continue
+          series = accumulator.ScalarSeries(tag)
+        except KeyError:
+          continue
+        points = json_util.Cleanse(
+            _series_to_points(series, max_points, method))
+        yield '%s%s: %s' % (tag_separator, json.dumps(tag), json.dumps(points))
+        tag_separator = ', '
+      yield '}'
+    yield '}'
+
   @wrappers.Request.application
   def tags_route(self, request):
     index = self.index_impl()
@@ -108,5 +164,67 @@ class ScalarsPlugin(base_plugin.TBPlugin):
     tag = request.args.get('tag')
     run = request.args.get('run')
     output_format = request.args.get('format')
-    (body, mime_type) = self.scalars_impl(tag, run, output_format)
+    try:
+      (max_points, method) = _downsampling_args(request)
+      (body, mime_type) = self.scalars_impl(
+          tag, run, output_format, max_points=max_points, method=method)
+    except ValueError as e:
+      return http_util.Respond(request, str(e), 'text/plain', 400)
     return http_util.Respond(request, body, mime_type)
+
+  @wrappers.Request.application
+  def scalars_multirun_route(self, request):
+    """Given repeated `run` and `tag` args, return all their ScalarEvents."""
+    runs = request.args.getlist('run')
+    tags = request.args.getlist('tag')
+    try:
+      (max_points, method) = _downsampling_args(request)
+      body = self.scalars_multirun_impl(
+          runs, tags, max_points=max_points, method=method)
+    except ValueError as e:
+      return http_util.Respond(request, str(e), 'text/plain', 400)
+    return http_util.Respond(request, body, 'application/json')
+
+
+def _downsampling_args(request):
+  """Returns the `(max_points, method)` query parameters of a request.
+
+  Raises:
+    ValueError: If `max_points` is present but not an integer.
+  """
+  max_points = request.args.get('max_points')
+  if max_points is not None:
+    try:
+      max_points = int(max_points)
+    except ValueError:
+      raise ValueError('query parameter `max_points` must be an integer')
+  return (max_points, request.args.get('method', downsampling.LTTB))
+
+
+def _series_to_points(series, max_points, method):
+  """Returns `[wall_time, step, value]` lists, downsampled if requested."""
+  if max_points is not None:
+    indices = downsampling.downsample_indices(
+        series.steps, series.values, max_points, method)
+    series = type(series)(*(column[indices] for column in series))
+  return [list(point) for point in zip(series.wall_times.tolist(),
+                                       series.steps.tolist(),
+                                       series.values.tolist())]
+
+
+def _unique(names):
+  """Returns `names` without duplicates, keeping the first occurrences."""
+  seen = set()
+  result = []
+  for name in names:
+    if name not in seen:
+      seen.add(name)
+      result.append(name)
+  return result
+
+
+def _tag_listing_entry(summary_metadata):
+  """Returns the display name and description of a tag, for `/tags`."""
+  return {'displayName': summary_metadata.display_name,
+          'description': plugin_util.summary_description_to_safe_html(
+              summary_metadata.summary_description)}
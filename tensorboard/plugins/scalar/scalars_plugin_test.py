@@ -21,11 +21,14 @@ from __future__ import print_function
 
 import collections
 import csv
+import json
 import os.path
 
 from six import StringIO
 from six.moves import xrange  # pylint: disable=redefined-builtin
 import tensorflow as tf
+from werkzeug import test as werkzeug_test
+from werkzeug import wrappers
 
 from tensorboard.backend.event_processing import plugin_event_accumulator as event_accumulator  # pylint: disable=line-too-long
 from tensorboard.backend.event_processing import plugin_event_multiplexer as event_multiplexer  # pylint: disable=line-too-long
@@ -74,6 +77,7 @@ class ScalarsPluginTest(tf.test.TestCase):
     routes = self.plugin.get_plugin_apps()
     self.assertIsInstance(routes['/scalars'], collections.Callable)
     self.assertIsInstance(routes['/tags'], collections.Callable)
+    self.assertIsInstance(routes['/scalars_multirun'], collections.Callable)
 
   def generate_run(self, run_name):
     tf.reset_default_graph()
@@ -176,6 +180,62 @@ class ScalarsPluginTest(tf.test.TestCase):
     self._test_scalars_csv(self._RUN_WITH_HISTOGRAM, self._HISTOGRAM_TAG,
                            should_work=False)
 
+  def test_scalars_json_with_max_points(self):
+    self.set_up_with_runs([self._RUN_WITH_SCALARS])
+    tag_name = '%s/scalar_summary' % self._SCALAR_TAG
+    for method in ('lttb', 'minmax'):
+      (data, _) = self.plugin.scalars_impl(
+          tag_name, self._RUN_WITH_SCALARS, scalars_plugin.OutputFormat.JSON,
+          max_points=10, method=method)
+      self.assertLessEqual(len(data), 10)
+      self.assertEqual(0, data[0][1])
+      self.assertEqual(self._STEPS - 1, data[-1][1])
+
+  def test_scalars_route_with_bad_max_points(self):
+    self.set_up_with_runs([self._RUN_WITH_SCALARS])
+    server = werkzeug_test.Client(self.plugin.scalars_route,
+                                  wrappers.BaseResponse)
+    response = server.get(
+        '/scalars?run=%s&tag=%s/scalar_summary&max_points=lots' %
+        (self._RUN_WITH_SCALARS, self._SCALAR_TAG))
+    self.assertEqual(400, response.status_code)
+
+  def test_scalars_multirun(self):
+    self.set_up_with_runs([self._RUN_WITH_LEGACY_SCALARS,
+                           self._RUN_WITH_SCALARS,
+                           self._RUN_WITH_HISTOGRAM])
+    scalar_tag = '%s/scalar_summary' % self._SCALAR_TAG
+    server = werkzeug_test.Client(self.plugin.scalars_multirun_route,
+                                  wrappers.BaseResponse)
+    response = server.get(
+        '/scalars_multirun?run=%s&run=%s&run=%s&run=nope'
+        '&tag=%s&tag=%s&tag=%s&max_points=5' %
+        (self._RUN_WITH_LEGACY_SCALARS, self._RUN_WITH_SCALARS,
+         self._RUN_WITH_HISTOGRAM, self._LEGACY_SCALAR_TAG, scalar_tag,
+         self._HISTOGRAM_TAG))
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.get_data().decode('utf-8'))
+    self.assertItemsEqual([self._RUN_WITH_LEGACY_SCALARS,
+                           self._RUN_WITH_SCALARS,
+                           self._RUN_WITH_HISTOGRAM], data.keys())
+    self.assertEqual([self._LEGACY_SCALAR_TAG],
+                     list(data[self._RUN_WITH_LEGACY_SCALARS].keys()))
+    self.assertEqual([scalar_tag], list(data[self._RUN_WITH_SCALARS].keys()))
+    self.assertEqual({}, data[self._RUN_WITH_HISTOGRAM])
+    (expected, _) = self.plugin.scalars_impl(
+        scalar_tag, self._RUN_WITH_SCALARS, scalars_plugin.OutputFormat.JSON,
+        max_points=5)
+    self.assertEqual(expected, data[self._RUN_WITH_SCALARS][scalar_tag])
+
+  def test_scalars_multirun_with_bad_method(self):
+    self.set_up_with_runs([self._RUN_WITH_SCALARS])
+    server = werkzeug_test.Client(self.plugin.scalars_multirun_route,
+                                  wrappers.BaseResponse)
+    response = server.get(
+        '/scalars_multirun?run=%s&tag=%s/scalar_summary&max_points=5'
+        '&method=cubic' % (self._RUN_WITH_SCALARS, self._SCALAR_TAG))
+    self.assertEqual(400, response.status_code)
+
   def test_active_with_legacy_scalars(self):
     self.set_up_with_runs([self._RUN_WITH_LEGACY_SCALARS])
     self.assertTrue(self.plugin.is_active())
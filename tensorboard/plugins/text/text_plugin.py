@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import hashlib
 import json
 import textwrap
 
@@ -32,6 +33,7 @@ from werkzeug import wrappers
 
 from tensorboard import plugin_util
 from tensorboard.backend import http_util
+from tensorboard.backend import lru_cache
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.text import metadata
 
@@ -39,6 +41,9 @@ from tensorboard.plugins.text import metadata
 TAGS_ROUTE = '/tags'
 TEXT_ROUTE = '/text'
 
+# The maximum total length, in characters, of the rendered HTML kept in memory.
+_HTML_CACHE_CHARS = 16 * 1024 * 1024
+
 
 WARNING_TEMPLATE = textwrap.dedent("""\
   **Warning:** This text summary contained data of dimensionality %d, but only \
@@ -179,10 +184,26 @@ def text_array_to_html(text_arr):
   return warning + make_table(html_arr)
 
 
-def process_string_tensor_event(event):
-  """Convert a TensorEvent into a JSON-compatible response."""
-  string_arr = tf.make_ndarray(event.tensor_proto)
-  html = text_array_to_html(string_arr)
+def process_string_tensor_event(event, html_cache=None):
+  """Convert a TensorEvent into a JSON-compatible response.
+
+  Args:
+    event: A TensorEvent holding a string tensor.
+    html_cache: An optional `lru_cache.LRUCache` of rendered HTML. Entries are
+      keyed by a digest of the serialized tensor, so events with the same
+      text share an entry, and entries never go stale.
+
+  Returns:
+    A dict with the wall time, step and rendered HTML of the event.
+  """
+  if html_cache is None:
+    html = text_array_to_html(tf.make_ndarray(event.tensor_proto))
+  else:
+    key = hashlib.sha1(event.tensor_proto.SerializeToString()).digest()
+    html = html_cache.get(key)
+    if html is None:
+      html = html_cache.put(
+          key, text_array_to_html(tf.make_ndarray(event.tensor_proto)))
   return {
       'wall_time': event.wall_time,
       'step': event.step,
@@ -194,6 +215,7 @@ class TextPlugin(base_plugin.TBPlugin):
   """Text Plugin for TensorBoard."""
 
   plugin_name = metadata.PLUGIN_NAME
+  cache_responses = True
 
   def __init__(self, context):
     """Instantiates TextPlugin via TensorBoard core.
@@ -202,6 +224,7 @@ class TextPlugin(base_plugin.TBPlugin):
       context: A base_plugin.TBContext instance.
     """
     self._multiplexer = context.multiplexer
+    self._html_cache = lru_cache.LRUCache(_HTML_CACHE_CHARS)
 
   def index_impl(self):
     # A previous system of collecting and serving text summaries involved
@@ -245,7 +268,8 @@ class TextPlugin(base_plugin.TBPlugin):
       text_events = self._multiplexer.Tensors(run, tag)
     except KeyError:
       text_events = []
-    responses = [process_string_tensor_event(ev) for ev in text_events]
+    responses = [process_string_tensor_event(ev, self._html_cache)
+                 for ev in text_events]
     return responses
 
   @wrappers.Request.application
@@ -269,4 +293,9 @@ class TextPlugin(base_plugin.TBPlugin):
     Returns:
       Whether this plugin is active.
     """
-    return bool(self._multiplexer and any(self.index_impl().values()))
+    if not self._multiplexer:
+      return False
+    if self._multiplexer.PluginRunToTagToContent(metadata.PLUGIN_NAME):
+      return True
+    # Fall back to the plugin assets of the deprecated text summaries.
+    return any(self.index_impl().values())
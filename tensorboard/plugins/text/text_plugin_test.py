@@ -27,6 +27,7 @@ import numpy as np
 import tensorflow as tf
 
 from tensorboard import plugin_util
+from tensorboard.backend import lru_cache
 from tensorboard.backend.event_processing import plugin_event_multiplexer as event_multiplexer  # pylint: disable=line-too-long
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.text import text_plugin
@@ -322,6 +323,21 @@ class TextPluginTest(tf.test.TestCase):
       </table>""")
     self.assertEqual(convert(d3), d3_expected)
 
+  def testProcessStringTensorEventCachesHtml(self):
+    event_type = collections.namedtuple(
+        'TensorEvent', ['wall_time', 'step', 'tensor_proto'])
+    cache = lru_cache.LRUCache(1024)
+    events = [event_type(wall_time=1.0 + step, step=step,
+                         tensor_proto=tf.make_tensor_proto(text))
+              for (step, text) in enumerate(['*foo*', '*foo*', 'bar'])]
+    results = [text_plugin.process_string_tensor_event(event, cache)
+               for event in events]
+    self.assertEqual([text_plugin.process_string_tensor_event(event)
+                      for event in events], results)
+    self.assertEqual('<p><em>foo</em></p>', results[1]['text'])
+    self.assertEqual(1, results[1]['step'])
+    self.assertEqual(2, len(cache))
+
   def testPluginIsActiveWhenNoRuns(self):
     """The plugin should be inactive when there are no runs."""
     multiplexer = event_multiplexer.EventMultiplexer()